@@ -12,6 +12,11 @@ from flask import Flask, jsonify
 from flask_cors import CORS
 from config import Config
 from utils import init_db
+from utils.stats import StatsCache
+from utils.json_provider import init_json
+from utils.query_profiler import init_query_profiler
+from utils.metrics import init_metrics
+from middleware import admin_token_required
 import os
 
 def create_app(config_class=Config):
@@ -27,6 +32,9 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
+    # Encodage JSON des documents MongoDB (ObjectId, datetime)
+    init_json(app)
+    
     # Activer CORS pour permettre les requêtes cross-origin
     CORS(app, resources={
         r"/api/*": {
@@ -39,6 +47,12 @@ def create_app(config_class=Config):
     # Initialiser la base de données MongoDB
     init_db(app)
     
+    # Profilage des requêtes MongoDB par route (si QUERY_PROFILER_ENABLED)
+    init_query_profiler(app)
+    
+    # Métriques HTTP au format Prometheus (/api/metrics)
+    init_metrics(app)
+    
     # Créer le dossier d'upload s'il n'existe pas
     if not os.path.exists(app.config['UPLOAD_FOLDER']):
         os.makedirs(app.config['UPLOAD_FOLDER'])
@@ -216,26 +230,45 @@ def create_app(config_class=Config):
                 "error": str(e)
             }), 503
     
+    @app.route('/api/health/db-pool')
+    @admin_token_required
+    def db_pool():
+        """Configuration et jauges du pool de connexions MongoDB de ce worker (X-Admin-Token)"""
+        from utils.database import client_options
+        from utils.pool_monitor import pool_monitor
+        
+        options = client_options(app.config)
+        options.pop('event_listeners')
+        
+        return jsonify({
+            "options": options,
+            "pool": pool_monitor.stats()
+        }), 200
+    
+    @app.route('/api/health/password-hashing')
+    @admin_token_required
+    def password_hashing():
+        """Pool de hachage des mots de passe de ce worker: taille, file d'attente, refus (X-Admin-Token)"""
+        from utils.passwords import password_hasher
+        
+        return jsonify(password_hasher.metrics()), 200
+    
+    # Statistiques mises en cache (compteurs estimés, rafraîchis périodiquement)
+    stats_cache = StatsCache(app.config['STATS_REFRESH_INTERVAL'])
+    
     @app.route('/api/stats')
     def stats():
         """Statistiques générales de l'API (route publique)"""
         try:
             from utils import get_db
-            db = get_db()
+            statistics, computed_at = stats_cache.get(get_db())
             
-            return jsonify({
-                "statistics": {
-                    "users": db.users.count_documents({}),
-                    "events": db.events.count_documents({}),
-                    "groups": db.groups.count_documents({}),
-                    "albums": db.albums.count_documents({}),
-                    "photos": db.photos.count_documents({}),
-                    "polls": db.polls.count_documents({}),
-                    "tickets_sold": db.tickets.count_documents({}),
-                    "shopping_items": db.shopping_items.count_documents({}),
-                    "carpooling_offers": db.carpooling.count_documents({})
-                }
-            }), 200
+            response = jsonify({
+                "statistics": statistics,
+                "computed_at": computed_at.isoformat()
+            })
+            response.headers['Cache-Control'] = f"public, max-age={app.config['STATS_REFRESH_INTERVAL']}"
+            return response, 200
         except Exception as e:
             return jsonify({
                 "error": "Could not fetch statistics",
@@ -0,0 +1,107 @@
+"""
+Coût de la sérialisation JSON des réponses
+
+Compare, sur des listes de photos avec commentaires embarqués (1k et 10k
+documents par défaut):
+  - l'ancien chemin: serialize_doc puis l'encodeur JSON par défaut de Flask
+  - MongoJSONProvider avec l'encodeur standard
+  - MongoJSONProvider avec orjson (si installé)
+
+Usage:
+    python -m benchmarks.json_serialization
+    python -m benchmarks.json_serialization --sizes 1000 10000 50000 --comments 10
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from utils.json_provider import MongoJSONProvider, orjson
+from utils.response import serialize_doc
+
+
+def make_photos(count, comments):
+    """Génère des documents photo semblables à ceux de la collection photos"""
+    now = datetime.utcnow()
+    album_id, event_id = ObjectId(), ObjectId()
+    return [
+        {
+            "_id": ObjectId(),
+            "url": f"https://example.com/photos/{i}.jpg",
+            "caption": f"Photo {i} de la soirée",
+            "album_id": album_id,
+            "event_id": event_id,
+            "posted_by": ObjectId(),
+            "posted_by_name": "John Doe",
+            "comments": [
+                {
+                    "_id": ObjectId(),
+                    "author_id": ObjectId(),
+                    "author_name": "Jane Smith",
+                    "content": "Superbe photo ! 📸",
+                    "created_at": now - timedelta(minutes=j)
+                }
+                for j in range(comments)
+            ],
+            "created_at": now - timedelta(seconds=i)
+        }
+        for i in range(count)
+    ]
+
+
+def best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la sérialisation JSON")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help="Nombre de documents")
+    parser.add_argument('--comments', type=int, default=5, help="Commentaires par photo")
+    parser.add_argument('--repeat', type=int, default=5, help="Nombre de mesures (le meilleur temps est retenu)")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    legacy = DefaultJSONProvider(app)
+    stdlib = MongoJSONProvider(app)
+    stdlib.use_orjson = False
+    fast = MongoJSONProvider(app)
+
+    candidates = [
+        ("serialize_doc + json", lambda payload: legacy.dumps(serialize_doc(payload))),
+        ("MongoJSONProvider (json)", stdlib.dumps),
+    ]
+    if orjson is not None:
+        candidates.append(("MongoJSONProvider (orjson)", fast.dumps))
+    else:
+        print("orjson n'est pas installé: mesure orjson ignorée\n")
+
+    for size in args.sizes:
+        payload = {"success": True, "message": "Photos récupérées", "data": make_photos(size, args.comments)}
+
+        # Les trois chemins doivent produire le même JSON
+        reference = json.loads(candidates[0][1](payload))
+        for name, dumps in candidates[1:]:
+            assert json.loads(dumps(payload)) == reference, name
+
+        print(f"{size} documents ({args.comments} commentaires chacun)")
+        baseline = None
+        for name, dumps in candidates:
+            elapsed = best_time(lambda: dumps(payload), args.repeat)
+            baseline = baseline or elapsed
+            print(f"  {name:<28} {elapsed * 1000:>9.1f} ms  {baseline / elapsed:>5.1f}x")
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""
+Test de charge de l'achat de billets
+
+Lance des milliers d'achats concurrents sur `POST /api/tickets/purchase`
+(et `/purchase/bulk` avec --bulk) contre une API démarrée, puis vérifie
+dans MongoDB qu'aucun billet n'a été vendu au-delà du stock.
+
+Avec --edits, un organisateur modifie la quantité du type de billet
+(`PUT /api/tickets/types/<id>`, hausses et baisses) pendant les achats: le
+stock final doit rester égal à la quantité finale moins les billets vendus.
+
+Usage:
+    python app.py &
+    python -m benchmarks.ticket_purchase_load --requests 5000 --stock 1000 --workers 100
+    python -m benchmarks.ticket_purchase_load --requests 5000 --stock 1000 --edits 200
+"""
+
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import jwt
+import requests
+from pymongo import MongoClient
+
+from config import Config
+
+
+def setup(db, stock):
+    """Crée un organisateur, un événement public et un type de billet dédiés au test"""
+    now = datetime.utcnow()
+    organizer_id = db.users.insert_one({
+        "email": f"load.test.organizer.{int(time.time() * 1000)}@example.com",
+        "password": "",
+        "first_name": "Load",
+        "last_name": "Organizer",
+        "created_at": now
+    }).inserted_id
+    event_id = db.events.insert_one({
+        "name": "Load test billetterie",
+        "description": "Événement créé par benchmarks.ticket_purchase_load",
+        "start_date": now + timedelta(days=30),
+        "end_date": now + timedelta(days=31),
+        "location": "Load test",
+        "is_private": False,
+        "organizers": [organizer_id],
+        "participants": [],
+        "has_ticketing": True,
+        "created_at": now,
+        "updated_at": now
+    }).inserted_id
+    ticket_type_id = db.ticket_types.insert_one({
+        "name": "Load test",
+        "price": 10.0,
+        "quantity": stock,
+        "remaining": stock,
+        "event_id": event_id,
+        "created_at": now
+    }).inserted_id
+    return organizer_id, event_id, ticket_type_id
+
+
+def organizer_token(organizer_id):
+    """JWT de l'organisateur (même secret que l'API testée)"""
+    return jwt.encode({
+        'user_id': str(organizer_id),
+        'exp': datetime.utcnow() + timedelta(hours=1)
+    }, Config.JWT_SECRET_KEY, algorithm="HS256")
+
+
+def edit_quantity(session, base_url, ticket_type_id, token, quantity):
+    """Modifie la quantité du type de billet et retourne le code HTTP"""
+    response = session.put(
+        f"{base_url}/api/tickets/types/{ticket_type_id}",
+        json={"quantity": quantity},
+        headers={"Authorization": f"Bearer {token}"},
+        timeout=30
+    )
+    return response.status_code
+
+
+def purchase(session, base_url, ticket_type_id, index, quantity):
+    """Effectue un achat et retourne (code HTTP, nombre de billets demandés, durée)"""
+    payload = {
+        "ticket_type_id": str(ticket_type_id),
+        "buyer_first_name": "Load",
+        "buyer_last_name": f"Test {index}",
+        "buyer_email": f"load.test.{index}@example.com",
+        "buyer_address": {
+            "street": "1 rue du Test",
+            "city": "Paris",
+            "postal_code": "75001",
+            "country": "France"
+        }
+    }
+    url = f"{base_url}/api/tickets/purchase"
+    if quantity > 1:
+        payload["quantity"] = quantity
+        url += "/bulk"
+
+    start = time.perf_counter()
+    response = session.post(url, json=payload, timeout=30)
+    return response.status_code, quantity, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge anti-survente de la billetterie")
+    parser.add_argument('--base-url', default="http://localhost:5000")
+    parser.add_argument('--uri', default=Config.MONGO_URI, help="URI MongoDB de l'API testée")
+    parser.add_argument('--requests', type=int, default=2000, help="Nombre d'achats envoyés")
+    parser.add_argument('--stock', type=int, default=500, help="Nombre de billets disponibles")
+    parser.add_argument('--workers', type=int, default=64, help="Nombre de requêtes simultanées")
+    parser.add_argument('--bulk', action='store_true', help="Acheter 1 à 4 billets par requête")
+    parser.add_argument('--edits', type=int, default=0, help="Modifications de quantité pendant les achats")
+    parser.add_argument('--keep', action='store_true', help="Conserver les données de test")
+    args = parser.parse_args()
+
+    client = MongoClient(args.uri)
+    db = client.get_default_database()
+    organizer_id, event_id, ticket_type_id = setup(db, args.stock)
+    token = organizer_token(organizer_id)
+
+    quantities = [random.randint(1, 4) if args.bulk else 1 for _ in range(args.requests)]
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=args.workers, pool_maxsize=args.workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    # Quantités cibles autour du stock initial; une baisse sous les billets vendus est refusée (400)
+    edits = [max(1, args.stock + random.randint(-args.stock // 4, args.stock // 4)) for _ in range(args.edits)]
+
+    # Modifications réparties parmi les achats pour s'exécuter pendant ceux-ci
+    step = max(1, len(quantities) // max(1, len(edits)))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        purchase_futures, edit_futures = [], []
+        for index, quantity in enumerate(quantities):
+            if index % step == 0 and len(edit_futures) < len(edits):
+                edit_futures.append(executor.submit(
+                    edit_quantity, session, args.base_url, ticket_type_id, token, edits[len(edit_futures)]
+                ))
+            purchase_futures.append(executor.submit(purchase, session, args.base_url, ticket_type_id, index, quantity))
+        results = [future.result() for future in purchase_futures]
+        edit_statuses = [future.result() for future in edit_futures]
+    elapsed = time.perf_counter() - start
+
+    accepted = sum(quantity for status, quantity, _ in results if status == 201)
+    rejected = sum(1 for status, _, _ in results if status == 400)
+    failed = [status for status, _, _ in results if status not in (201, 400)]
+    latencies = sorted(duration for _, _, duration in results)
+
+    sold = db.tickets.count_documents({"ticket_type_id": ticket_type_id})
+    ticket_type = db.ticket_types.find_one({"_id": ticket_type_id})
+    remaining, stock = ticket_type['remaining'], ticket_type['quantity']
+
+    print(f"Requêtes: {args.requests} en {elapsed:.2f}s ({args.requests / elapsed:.0f} req/s, {args.workers} simultanées)")
+    print(f"Latence: p50={latencies[len(latencies) // 2] * 1000:.1f}ms p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}ms")
+    print(f"Billets acceptés: {accepted} | Refus (stock épuisé): {rejected} | Erreurs: {len(failed)}")
+    if edits:
+        print(f"Modifications de quantité: {edit_statuses.count(200)} appliquées | "
+              f"{edit_statuses.count(400)} refusées (sous les ventes) | "
+              f"{sum(1 for status in edit_statuses if status not in (200, 400))} autres")
+    print(f"Stock: {args.stock} -> {stock} | Billets en base: {sold} | Restants: {remaining}")
+
+    ok = sold <= stock and sold == accepted and remaining == stock - sold and remaining >= 0
+    print("✓ Aucune survente" if ok else "✗ Incohérence détectée")
+
+    if not args.keep:
+        db.tickets.delete_many({"ticket_type_id": ticket_type_id})
+        db.ticket_types.delete_one({"_id": ticket_type_id})
+        db.events.delete_one({"_id": event_id})
+        db.users.delete_one({"_id": organizer_id})
+    client.close()
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+Recherche d'utilisateurs sur une grande collection
+
+Remplit une base dédiée avec N utilisateurs synthétiques (1 million par
+défaut, tokens de recherche inclus), puis compare pour des saisies
+d'autocomplétion de 2 à 6 caractères:
+  - l'ancien chemin: trois regex non ancrées insensibles à la casse en $or,
+    page de 20 triée par _id et comptage du total
+  - search_users: regex ancrées sur l'index multikey `search_tokens`,
+    classement par pertinence
+
+Le plan d'exécution (documents et clés d'index examinés) est affiché pour
+une requête de chaque chemin. Nécessite un serveur MongoDB.
+
+Usage:
+    python -m benchmarks.user_search
+    python -m benchmarks.user_search --users 200000 --queries 50 --keep
+    python -m benchmarks.user_search --skip-seed --db benchmark_user_search
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+
+from pymongo import MongoClient
+
+from config import Config
+from utils.user_search import PRIVATE_USER_FIELDS, parse_search, search_query, search_tokens, search_users
+
+FIRST_NAMES = ["Jean", "Jeanne", "Éloïse", "Marie", "Léa", "Hugo", "Chloé", "Louis", "Zoé", "Gabriel",
+               "Noémie", "Raphaël", "Inès", "Arthur", "Jules", "Camille", "Adèle", "Théo", "Maël", "Anaïs"]
+LAST_NAMES = ["Dupont", "Martin", "Bernard", "Lefèvre", "Moreau", "Girard", "Rousseau", "Müller", "Faure",
+              "Bonnet", "Mercier", "Lambert", "Fontaine", "Chevalier", "Robin", "Gauthier", "Perrin", "Roussel"]
+DOMAINS = ["example.com", "mail.fr", "exemple.org"]
+
+
+def make_user(index):
+    first_name = random.choice(FIRST_NAMES)
+    last_name = f"{random.choice(LAST_NAMES)}{random.choice(['', '-' + random.choice(LAST_NAMES)])}"
+    user = {
+        "email": f"{first_name.lower()}.{last_name.lower()}.{index}@{random.choice(DOMAINS)}",
+        "password": "",
+        "first_name": first_name,
+        "last_name": last_name,
+        "created_at": datetime.utcnow()
+    }
+    user["search_tokens"] = search_tokens(user)
+    return user
+
+
+def seed(db, count, batch_size=10000):
+    db.users.drop()
+    for start in range(0, count, batch_size):
+        db.users.insert_many([make_user(i) for i in range(start, min(start + batch_size, count))], ordered=False)
+    db.users.create_index("email", unique=True)
+    db.users.create_index("search_tokens")
+
+
+def make_queries(count):
+    """Saisies d'autocomplétion: début d'un prénom ou d'un nom, 2 à 6 caractères"""
+    queries = []
+    for _ in range(count):
+        name = random.choice(FIRST_NAMES + LAST_NAMES)
+        queries.append(name[:random.randint(2, min(6, len(name)))].lower())
+    return queries
+
+
+def regex_query(search):
+    """Filtre de l'ancien chemin de GET /api/users?search="""
+    return {
+        "$or": [
+            {"first_name": {"$regex": search, "$options": "i"}},
+            {"last_name": {"$regex": search, "$options": "i"}},
+            {"email": {"$regex": search, "$options": "i"}}
+        ]
+    }
+
+
+def regex_search(db, search, per_page=20):
+    """Ancien chemin: première page triée par _id et comptage du total"""
+    query = regex_query(search)
+    users = list(db.users.find(query, {"password": 0}).sort("_id", 1).limit(per_page))
+    total = db.users.count_documents(query)
+    return users, total
+
+
+def timed(func, queries):
+    durations = []
+    for query in queries:
+        start = time.perf_counter()
+        func(query)
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    return {
+        "p50": durations[len(durations) // 2] * 1000,
+        "p95": durations[max(0, int(len(durations) * 0.95) - 1)] * 1000,
+        "max": durations[-1] * 1000
+    }
+
+
+def explain_stats(db, query, **kwargs):
+    cursor = db.users.find(query, PRIVATE_USER_FIELDS, **kwargs)
+    stats = cursor.explain().get('executionStats', {})
+    return stats.get('totalKeysExamined'), stats.get('totalDocsExamined'), stats.get('executionTimeMillis')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la recherche d'utilisateurs")
+    parser.add_argument('--uri', default=Config.MONGO_URI, help="URI MongoDB (défaut: Config.MONGO_URI)")
+    parser.add_argument('--db', default="benchmark_user_search", help="Base dédiée (vidée au remplissage)")
+    parser.add_argument('--users', type=int, default=1000000, help="Nombre d'utilisateurs générés")
+    parser.add_argument('--queries', type=int, default=20, help="Nombre de recherches mesurées par chemin")
+    parser.add_argument('--skip-seed', action='store_true', help="Réutiliser les données déjà générées")
+    parser.add_argument('--skip-regex', action='store_true', help="Ne pas mesurer l'ancien chemin")
+    parser.add_argument('--keep', action='store_true', help="Conserver la base de test")
+    args = parser.parse_args()
+
+    client = MongoClient(args.uri)
+    db = client[args.db]
+
+    if not args.skip_seed:
+        start = time.perf_counter()
+        seed(db, args.users)
+        print(f"✓ {args.users} utilisateurs générés en {time.perf_counter() - start:.1f}s")
+
+    random.seed(42)
+    queries = make_queries(args.queries)
+    pagination = {"page": 1, "per_page": 20, "cursor": None, "include_total": True}
+
+    results = {"search_tokens": timed(lambda q: search_users(db, q, pagination), queries)}
+    if not args.skip_regex:
+        results["regex $or"] = timed(lambda q: regex_search(db, q), queries)
+
+    print(f"\n{args.queries} recherches sur {db.users.estimated_document_count()} utilisateurs")
+    print(f"{'chemin':<15} {'p50':>10} {'p95':>10} {'max':>10}")
+    for label, stats in results.items():
+        print(f"{label:<15} {stats['p50']:>8.1f}ms {stats['p95']:>8.1f}ms {stats['max']:>8.1f}ms")
+
+    sample = queries[0]
+    print(f"\nPlan pour \"{sample}\" (clés examinées, documents examinés, ms):")
+    print(f"  search_tokens: {explain_stats(db, search_query(parse_search(sample)), limit=Config.USER_SEARCH_CANDIDATES)}")
+    if not args.skip_regex:
+        print(f"  regex $or:     {explain_stats(db, regex_query(sample), sort=[('_id', 1)], limit=20)}")
+
+    if not args.keep:
+        client.drop_database(args.db)
+    client.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Coût de la validation par requête
+
+Compare, pour chaque fonction `validate_*` des modules de `validators/`,
+la validation avec un schéma instancié à chaque appel (ancien comportement)
+et avec l'instance partagée créée au chargement du module. Un payload valide
+et un payload invalide sont mesurés pour chaque validateur.
+
+Usage:
+    python -m benchmarks.validation
+    python -m benchmarks.validation --number 2000 --module user
+"""
+
+import argparse
+import timeit
+
+from validators import (
+    album_validator, carpooling_validator, discussion_validator, event_validator,
+    group_validator, poll_validator, shopping_validator, ticket_validator, user_validator
+)
+
+OBJECT_ID = "507f1f77bcf86cd799439011"
+ADDRESS = {"street": "1 rue de la Paix", "city": "Paris", "postal_code": "75002", "country": "France"}
+BUYER = {
+    "ticket_type_id": OBJECT_ID,
+    "buyer_first_name": "John",
+    "buyer_last_name": "Doe",
+    "buyer_email": "john.doe@example.com",
+    "buyer_address": ADDRESS
+}
+
+# (module, fonction de validation, classe du schéma, payload valide, payload invalide)
+CASES = [
+    ("user", user_validator.validate_user_registration, user_validator.UserRegistrationSchema,
+     {"email": "john.doe@example.com", "password": "secret12", "first_name": "John", "last_name": "Doe",
+      "address": ADDRESS},
+     {"email": "john.doe", "password": "123"}),
+    ("user", user_validator.validate_user_login, user_validator.UserLoginSchema,
+     {"email": "john.doe@example.com", "password": "secret12"},
+     {"email": "john.doe"}),
+    ("user", user_validator.validate_user_update, user_validator.UserUpdateSchema,
+     {"first_name": "Johnny", "bio": "Développeur"},
+     {"first_name": ""}),
+    ("event", event_validator.validate_event_create, event_validator.EventCreateSchema,
+     {"name": "Anniversaire", "description": "Fête", "start_date": "2030-06-01T18:00:00",
+      "end_date": "2030-06-01T23:00:00", "location": "Paris", "has_shopping_list": True},
+     {"name": "Anniversaire", "start_date": "2030-06-02T18:00:00", "end_date": "2030-06-01T18:00:00"}),
+    ("event", event_validator.validate_event_update, event_validator.EventUpdateSchema,
+     {"name": "Anniversaire (reporté)", "location": "Lyon"},
+     {"name": ""}),
+    ("group", group_validator.validate_group_create, group_validator.GroupCreateSchema,
+     {"name": "Randonneurs", "description": "Sorties du dimanche", "group_type": "public"},
+     {"name": "Randonneurs", "group_type": "ouvert"}),
+    ("group", group_validator.validate_group_update, group_validator.GroupUpdateSchema,
+     {"description": "Sorties du samedi"},
+     {"group_type": "ouvert"}),
+    ("discussion", discussion_validator.validate_message_create, discussion_validator.MessageCreateSchema,
+     {"content": "Bonjour à tous !"},
+     {"content": ""}),
+    ("discussion", discussion_validator.validate_discussion_create, discussion_validator.DiscussionCreateSchema,
+     {"event_id": OBJECT_ID},
+     {"event_id": OBJECT_ID, "group_id": OBJECT_ID}),
+    ("album", album_validator.validate_album_create, album_validator.AlbumCreateSchema,
+     {"name": "Photos de la soirée", "event_id": OBJECT_ID},
+     {"name": ""}),
+    ("album", album_validator.validate_photo_create, album_validator.PhotoCreateSchema,
+     {"url": "https://example.com/photo.jpg", "album_id": OBJECT_ID, "caption": "Le gâteau"},
+     {"caption": "x" * 600}),
+    ("album", album_validator.validate_comment_create, album_validator.CommentCreateSchema,
+     {"content": "Superbe !"},
+     {"content": ""}),
+    ("poll", poll_validator.validate_poll_create, poll_validator.PollCreateSchema,
+     {"title": "Menu", "event_id": OBJECT_ID,
+      "questions": [{"question": "Entrée ?", "options": ["Salade", "Soupe"]},
+                    {"question": "Dessert ?", "options": ["Gâteau", "Fruits", "Glace"]}]},
+     {"title": "Menu", "questions": [{"question": "Entrée ?", "options": ["Salade"]}]}),
+    ("poll", poll_validator.validate_poll_response, poll_validator.PollResponseSchema,
+     {"responses": [{"question_index": 0, "option_index": 1}, {"question_index": 1, "option_index": 2}]},
+     {"responses": [{"question_index": "a"}]}),
+    ("ticket", ticket_validator.validate_ticket_type_create, ticket_validator.TicketTypeCreateSchema,
+     {"name": "Standard", "price": 25.0, "quantity": 100},
+     {"name": "Standard", "price": -1}),
+    ("ticket", ticket_validator.validate_ticket_purchase, ticket_validator.TicketPurchaseSchema,
+     BUYER,
+     {"ticket_type_id": OBJECT_ID, "buyer_email": "john.doe", "buyer_address": {"city": "Paris"}}),
+    ("ticket", ticket_validator.validate_ticket_bulk_purchase, ticket_validator.TicketBulkPurchaseSchema,
+     dict(BUYER, quantity=4),
+     dict(BUYER, quantity=0)),
+    ("shopping", shopping_validator.validate_shopping_item_create, shopping_validator.ShoppingItemCreateSchema,
+     {"name": "Chips", "quantity": 3, "arrival_time": "2030-06-01T18:00:00", "event_id": OBJECT_ID},
+     {"name": "Chips", "quantity": 0}),
+    ("shopping", shopping_validator.validate_shopping_item_update, shopping_validator.ShoppingItemUpdateSchema,
+     {"quantity": 5},
+     {"quantity": 0}),
+    ("carpooling", carpooling_validator.validate_carpooling_create, carpooling_validator.CarpoolingCreateSchema,
+     {"departure_location": "Gare de Lyon", "departure_time": "2030-06-01T16:00:00", "price": 8.5,
+      "available_seats": 3, "max_time_difference": 15, "event_id": OBJECT_ID},
+     {"departure_location": "Gare de Lyon", "available_seats": 12}),
+    ("carpooling", carpooling_validator.validate_carpooling_update, carpooling_validator.CarpoolingUpdateSchema,
+     {"price": 7.0},
+     {"available_seats": 12}),
+    ("carpooling", carpooling_validator.validate_carpooling_booking, carpooling_validator.CarpoolingBookingSchema,
+     {"seats_requested": 2},
+     {"seats_requested": 0}),
+]
+
+
+def per_call_us(func, number, repeat):
+    """Meilleur temps par appel, en microsecondes"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def run(number, repeat, module=None):
+    rows = []
+    for name, validate_func, schema_class, valid, invalid in CASES:
+        if module and name != module:
+            continue
+
+        # Les deux chemins doivent produire le même résultat
+        for payload in (valid, invalid):
+            errors = schema_class().validate(payload)
+            assert validate_func(payload) == ((False, errors) if errors else (True, None)), validate_func.__name__
+        assert validate_func(valid)[0] and not validate_func(invalid)[0], validate_func.__name__
+
+        for label, payload in (("valide", valid), ("invalide", invalid)):
+            fresh = per_call_us(lambda: schema_class().validate(payload), number, repeat)
+            shared = per_call_us(lambda: validate_func(payload), number, repeat)
+            rows.append((name, validate_func.__name__, label, fresh, shared))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des validateurs marshmallow")
+    parser.add_argument('--number', type=int, default=1000, help="Appels par mesure")
+    parser.add_argument('--repeat', type=int, default=5, help="Nombre de mesures (le meilleur temps est retenu)")
+    parser.add_argument('--module', help="Limiter à un module (user, event, group, ...)")
+    args = parser.parse_args()
+
+    rows = run(args.number, args.repeat, args.module)
+
+    print(f"{'module':<11} {'validateur':<32} {'payload':<9} {'par appel':>10} {'partagé':>10} {'gain':>6}")
+    for name, func_name, label, fresh, shared in rows:
+        print(f"{name:<11} {func_name:<32} {label:<9} {fresh:>8.1f}µs {shared:>8.1f}µs {fresh / shared:>5.1f}x")
+
+    total_fresh = sum(row[3] for row in rows)
+    total_shared = sum(row[4] for row in rows)
+    print(f"\nTotal: {total_fresh:.1f}µs -> {total_shared:.1f}µs ({total_fresh / total_shared:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,17 +11,93 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'votre_secret_key_super_securisee_a_changer')
     DEBUG = os.getenv('DEBUG', 'True') == 'True'
     
+    # Sérialisation JSON: utiliser orjson s'il est installé
+    JSON_USE_ORJSON = os.getenv('JSON_USE_ORJSON', 'True') == 'True'
+    STREAM_RESPONSES = os.getenv('STREAM_RESPONSES', 'True') == 'True'  # Listes encodées au fil du curseur
+    
     # Configuration MongoDB
     MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/my_social_networks')
+    AUTO_CREATE_INDEXES = os.getenv('AUTO_CREATE_INDEXES', 'True') == 'True'  # Index des modèles créés au démarrage
+    
+    # Pool de connexions MongoDB (par processus worker)
+    MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', 100))
+    MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', 0))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', 0))  # 0 = pas de limite
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', 0))  # Attente max d'une connexion, 0 = illimitée
+    MONGO_COMPRESSORS = os.getenv('MONGO_COMPRESSORS', '')  # Ex: "zstd,snappy,zlib"
+    MONGO_READ_PREFERENCE = os.getenv('MONGO_READ_PREFERENCE', 'primary')  # primary, primaryPreferred, secondaryPreferred...
+    
+    # Jeton des routes de diagnostic et de métriques (header X-Admin-Token), routes désactivées si vide
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+    
+    # Métriques HTTP au format Prometheus (GET /api/metrics)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+    
+    # Profilage des commandes MongoDB par route (GET /api/debug/queries)
+    QUERY_PROFILER_ENABLED = os.getenv('QUERY_PROFILER_ENABLED', 'False') == 'True'
+    QUERY_PROFILER_SLOW_MS = float(os.getenv('QUERY_PROFILER_SLOW_MS', 100))  # Seuil du log des requêtes lentes
     
     # Configuration JWT
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt_secret_key_super_securisee_a_changer')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    # Routes GET sans lookup utilisateur: un compte supprimé y reste accepté jusqu'à l'expiration du token
+    TRUST_JWT_CLAIMS = os.getenv('TRUST_JWT_CLAIMS', 'False') == 'True'
+    
+    # Hachage des mots de passe (bcrypt sur un pool de threads dédié)
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))  # Les anciens hashs sont re-hachés à la connexion
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', 64))  # Au-delà: réponse 503
+    PASSWORD_HASH_TIMEOUT = int(os.getenv('PASSWORD_HASH_TIMEOUT', 10))  # En secondes
+    
+    # Limitation des tentatives de connexion (token buckets)
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'True') == 'True'
+    RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'memory')  # memory | mongodb (partagé entre processus)
+    LOGIN_RATE_IP_BURST = int(os.getenv('LOGIN_RATE_IP_BURST', 20))
+    LOGIN_RATE_IP_PER_MINUTE = float(os.getenv('LOGIN_RATE_IP_PER_MINUTE', 10))
+    LOGIN_RATE_EMAIL_BURST = int(os.getenv('LOGIN_RATE_EMAIL_BURST', 5))
+    LOGIN_RATE_EMAIL_PER_MINUTE = float(os.getenv('LOGIN_RATE_EMAIL_PER_MINUTE', 1))
+    
+    # Cache des utilisateurs authentifiés (par processus): un compte modifié ou supprimé
+    # reste accepté par les autres workers jusqu'à USER_CACHE_TTL (péremption acceptée)
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', 10000))
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 60))  # En secondes, 0 = désactivé
+    
+    # Cache des droits d'accès aux événements (par processus, accès accordés uniquement)
+    EVENT_ACCESS_CACHE_SIZE = int(os.getenv('EVENT_ACCESS_CACHE_SIZE', 50000))
+    EVENT_ACCESS_CACHE_TTL = int(os.getenv('EVENT_ACCESS_CACHE_TTL', 30))  # En secondes, 0 = désactivé
+    
+    # Endpoints batch (GET .../batch?ids=): nombre maximum d'IDs par requête
+    BATCH_MAX_IDS = int(os.getenv('BATCH_MAX_IDS', 100))
+    
+    # Tableau de bord d'un événement: lecture parallèle des sections
+    DASHBOARD_WORKERS = int(os.getenv('DASHBOARD_WORKERS', 8))  # Threads par requête
+    DASHBOARD_TIMEOUT = float(os.getenv('DASHBOARD_TIMEOUT', 5))  # En secondes, aussi maxTimeMS des lectures
+    
+    # Recherche d'utilisateurs: nombre maximum de candidats classés par pertinence
+    USER_SEARCH_CANDIDATES = int(os.getenv('USER_SEARCH_CANDIDATES', 500))
+    
+    # Adhésions (collection memberships): alimenter et consulter aussi les tableaux
+    # events.participants / groups.members, uniquement pendant la migration d'une
+    # base existante (activer, lancer `python -m utils.memberships`, puis désactiver)
+    MEMBERSHIP_EMBEDDED_ARRAYS = os.getenv('MEMBERSHIP_EMBEDDED_ARRAYS', 'False') == 'True'
     
     # Configuration de l'upload de fichiers
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
     
+    # Discussions: nombre de messages par bucket
+    MESSAGE_BUCKET_SIZE = int(os.getenv('MESSAGE_BUCKET_SIZE', 100))
+    
+    # Billetterie: nombre maximum de billets par achat groupé
+    MAX_TICKETS_PER_PURCHASE = int(os.getenv('MAX_TICKETS_PER_PURCHASE', 20))
+    
+    # Cache des réponses publiques (événement, types de billets), par processus
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 10000))
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 30))  # En secondes, 0 = désactivé
+    
+    # Statistiques publiques (/api/stats): durée du cache en secondes
+    STATS_REFRESH_INTERVAL = int(os.getenv('STATS_REFRESH_INTERVAL', 60))
+    
     # Configuration CORS
     CORS_HEADERS = 'Content-Type'
\ No newline at end of file
@@ -1,3 +1,8 @@
-from .auth_middleware import token_required, optional_token
+from .auth_middleware import token_required, fresh_token_required, token_claims_required, optional_token, admin_token_required, load_user
+from .user_cache import user_cache, invalidate_user
+from .rate_limiter import rate_limit, login_rate_limited, RateLimit
 
-__all__ = ['token_required', 'optional_token']
\ No newline at end of file
+__all__ = [
+    'token_required', 'fresh_token_required', 'token_claims_required', 'optional_token', 'admin_token_required', 'load_user', 'user_cache', 'invalidate_user',
+    'rate_limit', 'login_rate_limited', 'RateLimit'
+]
\ No newline at end of file
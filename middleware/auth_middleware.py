@@ -1,48 +1,118 @@
+import hmac
 from functools import wraps
 from flask import request
 import jwt
 from bson import ObjectId
 from config import Config
-from utils import get_db, unauthorized_response, error_response
+from utils import get_db, unauthorized_response, error_response, not_found_response
+from utils.user_search import PRIVATE_USER_FIELDS
+from .user_cache import user_cache
+
+def load_user(user_id, use_cache=True):
+    """Récupère un utilisateur par son ID en passant par le cache (sauf use_cache=False)"""
+    current_user = user_cache.get(str(user_id)) if use_cache else None
+    if current_user is None:
+        db = get_db()
+        current_user = db.users.find_one({"_id": ObjectId(user_id)}, PRIVATE_USER_FIELDS)
+        if current_user:
+            user_cache.set(str(user_id), current_user)
+    return current_user
+
+def user_from_claims(data):
+    """Construit l'utilisateur courant à partir des claims du token, sans accès à la base"""
+    return {
+        "_id": ObjectId(data['user_id']),
+        "email": data.get('email'),
+        "first_name": data.get('first_name'),
+        "last_name": data.get('last_name')
+    }
+
+def _authenticate(trust_claims=False, use_cache=True):
+    """
+    Décode le token du header Authorization et retourne (current_user, error)
+
+    Si trust_claims est vrai, l'utilisateur est construit depuis le token
+    (routes en lecture seule uniquement). Si use_cache est faux, l'utilisateur
+    est toujours relu en base.
+    """
+    token = None
+
+    # Récupérer le token depuis le header Authorization
+    if 'Authorization' in request.headers:
+        auth_header = request.headers['Authorization']
+        try:
+            token = auth_header.split(" ")[1]  # Format: "Bearer TOKEN"
+        except IndexError:
+            return None, unauthorized_response("Format de token invalide. Utilisez: Bearer <token>")
+
+    if not token:
+        return None, unauthorized_response("Token d'authentification manquant")
+
+    try:
+        # Décoder le token
+        data = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
+
+        if trust_claims:
+            return user_from_claims(data), None
+
+        # Récupérer l'utilisateur (cache puis base de données)
+        current_user = load_user(data['user_id'], use_cache=use_cache)
+
+        if not current_user:
+            return None, unauthorized_response("Utilisateur non trouvé")
+
+    except jwt.ExpiredSignatureError:
+        return None, unauthorized_response("Token expiré")
+    except jwt.InvalidTokenError:
+        return None, unauthorized_response("Token invalide")
+    except Exception as e:
+        return None, error_response(f"Erreur d'authentification: {str(e)}", 401)
+
+    return current_user, None
 
 def token_required(f):
     """Décorateur pour protéger les routes avec JWT"""
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-        
-        # Récupérer le token depuis le header Authorization
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            try:
-                token = auth_header.split(" ")[1]  # Format: "Bearer TOKEN"
-            except IndexError:
-                return unauthorized_response("Format de token invalide. Utilisez: Bearer <token>")
-        
-        if not token:
-            return unauthorized_response("Token d'authentification manquant")
-        
-        try:
-            # Décoder le token
-            data = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
-            
-            # Récupérer l'utilisateur depuis la base de données
-            db = get_db()
-            current_user = db.users.find_one({"_id": ObjectId(data['user_id'])})
-            
-            if not current_user:
-                return unauthorized_response("Utilisateur non trouvé")
-            
-        except jwt.ExpiredSignatureError:
-            return unauthorized_response("Token expiré")
-        except jwt.InvalidTokenError:
-            return unauthorized_response("Token invalide")
-        except Exception as e:
-            return error_response(f"Erreur d'authentification: {str(e)}", 401)
-        
+        current_user, error = _authenticate()
+        if error:
+            return error
+
         # Passer l'utilisateur à la fonction décorée
         return f(current_user=current_user, *args, **kwargs)
-    
+
+    return decorated
+
+def fresh_token_required(f):
+    """
+    Décorateur pour les routes destructives (modification, suppression de compte):
+    comme token_required, mais l'utilisateur est relu en base et non dans le cache
+    local, qui peut encore contenir un compte supprimé depuis un autre worker
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        current_user, error = _authenticate(use_cache=False)
+        if error:
+            return error
+
+        return f(current_user=current_user, *args, **kwargs)
+
+    return decorated
+
+def token_claims_required(f):
+    """
+    Décorateur pour les routes en lecture seule (GET uniquement): l'utilisateur est
+    construit depuis les claims du token sans requête MongoDB si TRUST_JWT_CLAIMS
+    est activé. Un compte supprimé reste alors accepté jusqu'à l'expiration du token.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        current_user, error = _authenticate(trust_claims=Config.TRUST_JWT_CLAIMS)
+        if error:
+            return error
+
+        return f(current_user=current_user, *args, **kwargs)
+
     return decorated
 
 def optional_token(f):
@@ -50,17 +120,35 @@ def optional_token(f):
     @wraps(f)
     def decorated(*args, **kwargs):
         current_user = None
-        
+
         if 'Authorization' in request.headers:
             auth_header = request.headers['Authorization']
             try:
                 token = auth_header.split(" ")[1]
                 data = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=["HS256"])
-                db = get_db()
-                current_user = db.users.find_one({"_id": ObjectId(data['user_id'])})
+                current_user = load_user(data['user_id'])
             except:
                 pass
-        
+
         return f(current_user=current_user, *args, **kwargs)
-    
-    return decorated
\ No newline at end of file
+
+    return decorated
+
+def admin_token_required(f):
+    """
+    Décorateur pour les routes de diagnostic: header X-Admin-Token égal à ADMIN_TOKEN
+
+    Sans ADMIN_TOKEN configuré, la route répond 404.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if not Config.ADMIN_TOKEN:
+            return not_found_response("Route non trouvée")
+
+        token = request.headers.get('X-Admin-Token', '')
+        if not hmac.compare_digest(token.encode('utf-8'), Config.ADMIN_TOKEN.encode('utf-8')):
+            return unauthorized_response("Jeton d'administration manquant ou invalide")
+
+        return f(*args, **kwargs)
+
+    return decorated
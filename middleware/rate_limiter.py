@@ -0,0 +1,197 @@
+"""
+Limitation de débit par token bucket
+
+Chaque clé (IP, email...) dispose d'un seau de `capacity` jetons qui se
+remplit de `refill_rate` jetons par seconde; une requête consomme un jeton
+et est refusée (429) si le seau est vide. Appliqué avant le corps de la
+route, le refus intervient avant toute lecture en base ou calcul bcrypt.
+
+Deux stockages (Config.RATE_LIMIT_BACKEND):
+  - "memory": propre à chaque processus
+  - "mongodb": partagé entre processus et serveurs (collection rate_limits)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import request
+from pymongo import ReturnDocument
+from config import Config
+from utils import get_db, error_response
+
+
+class MemoryBackend:
+    """Seaux en mémoire, bornés à max_keys (les plus anciens sont évincés)"""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate, cost=1):
+        """
+        Consomme `cost` jetons
+
+        Returns:
+            tuple: (autorisé, secondes avant le prochain jeton disponible)
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        return allowed, 0 if allowed else (cost - tokens) / refill_rate
+
+    def reset(self, key=None):
+        with self._lock:
+            if key is None:
+                self._buckets.clear()
+            else:
+                self._buckets.pop(key, None)
+
+
+class MongoBackend:
+    """Seaux partagés dans MongoDB, mis à jour atomiquement par un pipeline"""
+
+    collection = "rate_limits"
+
+    def __init__(self):
+        self._index_ready = False
+
+    def _get_collection(self):
+        collection = get_db()[self.collection]
+        if not self._index_ready:
+            # Les seaux pleins depuis longtemps sont supprimés par MongoDB
+            collection.create_index("expires_at", expireAfterSeconds=0)
+            self._index_ready = True
+        return collection
+
+    def consume(self, key, capacity, refill_rate, cost=1):
+        now = datetime.utcnow()
+        elapsed = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, 1000]}
+
+        bucket = self._get_collection().find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {
+                    "tokens": {"$min": [capacity, {"$add": [
+                        {"$ifNull": ["$tokens", capacity]},
+                        {"$multiply": [elapsed, refill_rate]}
+                    ]}]},
+                    "updated_at": now
+                }},
+                {"$set": {"allowed": {"$gte": ["$tokens", cost]}}},
+                {"$set": {
+                    "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", cost]}, "$tokens"]},
+                    "expires_at": now + timedelta(seconds=capacity / refill_rate)
+                }}
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+
+        if bucket['allowed']:
+            return True, 0
+        return False, (cost - bucket['tokens']) / refill_rate
+
+    def reset(self, key=None):
+        self._get_collection().delete_many({} if key is None else {"_id": key})
+
+
+BACKENDS = {
+    "memory": MemoryBackend,
+    "mongodb": MongoBackend
+}
+
+_backend = None
+
+
+def get_backend():
+    """Stockage configuré (Config.RATE_LIMIT_BACKEND)"""
+    global _backend
+    if _backend is None:
+        if Config.RATE_LIMIT_BACKEND not in BACKENDS:
+            raise ValueError(f"RATE_LIMIT_BACKEND inconnu: {Config.RATE_LIMIT_BACKEND}")
+        _backend = BACKENDS[Config.RATE_LIMIT_BACKEND]()
+    return _backend
+
+
+def set_backend(backend):
+    """Remplace le stockage (ex: implémentation partagée personnalisée)"""
+    global _backend
+    _backend = backend
+
+
+class RateLimit:
+    """
+    Limite appliquée à une clé extraite de la requête
+
+    Args:
+        name: Préfixe de la clé ("login:ip", ...)
+        key_func: Fonction retournant la clé pour la requête courante (None = pas de limite)
+        capacity: Nombre de requêtes autorisées en rafale
+        per_minute: Jetons regagnés par minute
+    """
+
+    def __init__(self, name, key_func, capacity, per_minute):
+        self.name = name
+        self.key_func = key_func
+        self.capacity = capacity
+        self.refill_rate = per_minute / 60.0
+
+    def consume(self, backend):
+        key = self.key_func()
+        if key is None:
+            return True, 0
+        return backend.consume(f"{self.name}:{key}", self.capacity, self.refill_rate)
+
+
+def client_ip():
+    """Adresse IP du client"""
+    return request.remote_addr or "unknown"
+
+
+def request_email():
+    """Email du corps JSON, normalisé"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('email'), str):
+        return None
+    return data['email'].strip().lower() or None
+
+
+def rate_limit(*limits):
+    """Décorateur: refuse la requête (429) dès qu'une des limites est atteinte"""
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if Config.RATE_LIMIT_ENABLED:
+                backend = get_backend()
+                for limit in limits:
+                    allowed, retry_after = limit.consume(backend)
+                    if not allowed:
+                        response, status = error_response("Trop de tentatives, réessayez plus tard", 429)
+                        response.headers['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+                        return response, status
+
+            return f(*args, **kwargs)
+
+        return decorated
+    return decorator
+
+
+# Limites de POST /api/auth/login
+login_ip_limit = RateLimit("login:ip", client_ip, Config.LOGIN_RATE_IP_BURST, Config.LOGIN_RATE_IP_PER_MINUTE)
+login_email_limit = RateLimit("login:email", request_email, Config.LOGIN_RATE_EMAIL_BURST, Config.LOGIN_RATE_EMAIL_PER_MINUTE)
+
+login_rate_limited = rate_limit(login_ip_limit, login_email_limit)
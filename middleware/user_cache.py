@@ -0,0 +1,19 @@
+"""
+Cache des utilisateurs authentifiés
+
+Évite un `db.users.find_one` à chaque requête authentifiée. Le cache est
+propre à chaque processus et borné; `invalidate_user` ne vide que le cache
+du processus courant. Fenêtre de péremption acceptée: sur les autres workers,
+un profil modifié ou un compte supprimé reste servi jusqu'à USER_CACHE_TTL.
+Les routes destructives (`fresh_token_required`) relisent toujours la base.
+"""
+
+from config import Config
+from utils.cache import TTLCache
+
+user_cache = TTLCache(Config.USER_CACHE_SIZE, Config.USER_CACHE_TTL)
+
+
+def invalidate_user(user_id):
+    """Invalide l'utilisateur en cache (à appeler après update/delete)"""
+    user_cache.invalidate(str(user_id))
@@ -8,8 +8,10 @@ La validation réelle est effectuée par les validators avec Marshmallow.
 from .user import UserModel
 from .event import EventModel
 from .group import GroupModel
+from .membership import MembershipModel
 from .discussion import DiscussionModel
 from .message import MessageModel
+from .message_bucket import MessageBucketModel
 from .album import AlbumModel
 from .photo import PhotoModel
 from .poll import PollModel
@@ -21,8 +23,10 @@ __all__ = [
     'UserModel',
     'EventModel',
     'GroupModel',
+    'MembershipModel',
     'DiscussionModel',
     'MessageModel',
+    'MessageBucketModel',
     'AlbumModel',
     'PhotoModel',
     'PollModel',
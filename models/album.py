@@ -12,6 +12,8 @@ class AlbumModel:
     Représente un album photo associé à un événement
     """
     
+    collection = "albums"
+    
     @staticmethod
     def schema():
         """
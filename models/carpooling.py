@@ -12,6 +12,8 @@ class CarpoolingModel:
     Représente une offre de covoiturage pour un événement (BONUS)
     """
     
+    collection = "carpooling"
+    
     @staticmethod
     def schema():
         """
@@ -20,6 +22,7 @@ class CarpoolingModel:
         return {
             "_id": ObjectId(),
             "departure_location": str,  # Requis
+            "departure_point": {"type": "Point", "coordinates": [float]},  # GeoJSON [lng, lat], optionnel
             "departure_time": datetime,  # Requis
             "price": float,  # Requis, >= 0
             "available_seats": int,  # Places disponibles actuelles
@@ -49,6 +52,7 @@ class CarpoolingModel:
         return {
             "_id": ObjectId("507f1f77bcf86cd799439080"),
             "departure_location": "Gare de Lyon, Paris",
+            "departure_point": {"type": "Point", "coordinates": [2.3735, 48.8443]},
             "departure_time": datetime(2026, 3, 15, 17, 0),
             "price": 10.00,
             "available_seats": 1,
@@ -83,6 +87,8 @@ class CarpoolingModel:
         """
         return [
             {"key": "event_id"},
+            # Départs proches (near / within) d'un événement
+            {"key": [("event_id", 1), ("departure_point", "2dsphere")]},
             {"key": "driver_id"},
             {"key": "departure_time"},
             {"key": "available_seats"}
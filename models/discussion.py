@@ -12,6 +12,8 @@ class DiscussionModel:
     Représente un fil de discussion (pour un événement OU un groupe)
     """
     
+    collection = "discussions"
+    
     @staticmethod
     def schema():
         """
@@ -21,7 +23,7 @@ class DiscussionModel:
             "_id": ObjectId(),
             "event_id": ObjectId(),  # Soit event_id, soit group_id (pas les deux)
             "group_id": ObjectId(),  # Soit event_id, soit group_id (pas les deux)
-            "messages": [
+            "messages": [  # Obsolète: vide depuis la migration vers message_buckets
                 {
                     "_id": ObjectId(),
                     "author_id": ObjectId(),
@@ -31,6 +33,7 @@ class DiscussionModel:
                     "created_at": datetime
                 }
             ],
+            "migrated_at": datetime,  # Date de migration des messages, optionnel
             "created_at": datetime
         }
     
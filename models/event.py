@@ -12,6 +12,8 @@ class EventModel:
     Représente un événement sur la plateforme
     """
     
+    collection = "events"
+    
     @staticmethod
     def schema():
         """
@@ -24,10 +26,11 @@ class EventModel:
             "start_date": datetime,  # Requis
             "end_date": datetime,  # Requis
             "location": str,  # Requis
+            "location_point": {"type": "Point", "coordinates": [float]},  # GeoJSON [lng, lat], optionnel
             "cover_photo": str,  # URL, optionnel
             "is_private": bool,  # Défaut: False
             "organizers": [ObjectId()],  # Liste d'IDs utilisateurs, au moins 1
-            "participants": [ObjectId()],  # Liste d'IDs utilisateurs
+            "participants_count": int,  # Participants: collection memberships
             "group_id": ObjectId(),  # Optionnel, si créé depuis un groupe
             "has_ticketing": bool,  # Défaut: False
             "has_shopping_list": bool,  # Défaut: False (BONUS)
@@ -48,17 +51,14 @@ class EventModel:
             "start_date": datetime(2026, 3, 15, 19, 0),
             "end_date": datetime(2026, 3, 16, 2, 0),
             "location": "123 Avenue des Champs-Élysées, Paris",
+            "location_point": {"type": "Point", "coordinates": [2.3075, 48.8698]},
             "cover_photo": "https://example.com/events/marie-30.jpg",
             "is_private": True,
             "organizers": [
                 ObjectId("507f1f77bcf86cd799439011"),
                 ObjectId("507f1f77bcf86cd799439013")
             ],
-            "participants": [
-                ObjectId("507f1f77bcf86cd799439011"),
-                ObjectId("507f1f77bcf86cd799439013"),
-                ObjectId("507f1f77bcf86cd799439014")
-            ],
+            "participants_count": 3,
             "group_id": ObjectId("507f1f77bcf86cd799439020"),
             "has_ticketing": False,
             "has_shopping_list": True,
@@ -73,10 +73,19 @@ class EventModel:
         Index recommandés pour la collection events
         """
         return [
-            {"key": "start_date"},
-            {"key": "is_private"},
+            {"key": [("start_date", 1), ("_id", 1)]},  # Tri et pagination par curseur
+            # Branche publique du $or de visibilité: fenêtre de dates et tri
+            {"key": [("is_private", 1), ("start_date", 1), ("_id", 1)]},
+            {"key": [("group_id", 1), ("is_private", 1), ("start_date", 1), ("_id", 1)]},
+            {"key": [("location_point", "2dsphere")]},  # near / within (documents sans point ignorés)
+            # Recherche plein texte (GET /api/events?q=)
+            {
+                "key": [("name", "text"), ("description", "text"), ("location", "text")],
+                "name": "events_text",
+                "weights": {"name": 10, "location": 5, "description": 1},
+                "default_language": "french"
+            },
             {"key": "organizers"},
-            {"key": "participants"},
-            {"key": "group_id"},
+            {"key": "participants"},  # Tableau hérité, tant que MEMBERSHIP_EMBEDDED_ARRAYS
             {"key": "created_at"}
         ]
\ No newline at end of file
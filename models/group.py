@@ -12,6 +12,8 @@ class GroupModel:
     Représente un groupe sur la plateforme
     """
     
+    collection = "groups"
+    
     @staticmethod
     def schema():
         """
@@ -27,7 +29,7 @@ class GroupModel:
             "allow_members_to_post": bool,  # Défaut: True
             "allow_members_to_create_events": bool,  # Défaut: True
             "administrators": [ObjectId()],  # Liste d'IDs utilisateurs, au moins 1
-            "members": [ObjectId()],  # Liste d'IDs utilisateurs
+            "members_count": int,  # Membres: collection memberships
             "created_at": datetime,
             "updated_at": datetime
         }
@@ -49,12 +51,7 @@ class GroupModel:
             "administrators": [
                 ObjectId("507f1f77bcf86cd799439011")
             ],
-            "members": [
-                ObjectId("507f1f77bcf86cd799439011"),
-                ObjectId("507f1f77bcf86cd799439013"),
-                ObjectId("507f1f77bcf86cd799439014"),
-                ObjectId("507f1f77bcf86cd799439015")
-            ],
+            "members_count": 4,
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
@@ -67,6 +64,6 @@ class GroupModel:
         return [
             {"key": "group_type"},
             {"key": "administrators"},
-            {"key": "members"},
+            {"key": "members"},  # Tableau hérité, tant que MEMBERSHIP_EMBEDDED_ARRAYS
             {"key": "created_at"}
         ]
\ No newline at end of file
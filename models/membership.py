@@ -0,0 +1,64 @@
+"""
+Modèle Membership - Appartenance d'un utilisateur à un événement ou un groupe
+
+Collection: memberships
+
+Un document par couple (cible, utilisateur). Remplace les tableaux
+`events.participants` et `groups.members`, qui grossissent sans limite avec
+l'audience; les listes courtes `organizers` et `administrators` restent dans
+les documents et sont recopiées ici sous forme de rôle.
+"""
+
+from datetime import datetime
+from bson import ObjectId
+
+class MembershipModel:
+    """
+    Représente l'appartenance d'un utilisateur à un événement ou un groupe
+    """
+
+    collection = "memberships"
+
+    @staticmethod
+    def schema():
+        """
+        Retourne la structure d'un document membership
+        """
+        return {
+            "_id": ObjectId(),
+            "target_type": str,  # "event" ou "group"
+            "target_id": ObjectId(),  # ID de l'événement ou du groupe
+            "user_id": ObjectId(),
+            "role": str,  # "participant"/"organizer" (événement), "member"/"administrator" (groupe)
+            "private": bool,  # Cible non publique (recopié de la cible, filtre de visibilité des listes)
+            "joined_at": datetime
+        }
+
+    @staticmethod
+    def example():
+        """
+        Exemple d'un document membership
+        """
+        return {
+            "_id": ObjectId("507f1f77bcf86cd799439090"),
+            "target_type": "event",
+            "target_id": ObjectId("507f1f77bcf86cd799439012"),
+            "user_id": ObjectId("507f1f77bcf86cd799439013"),
+            "role": "participant",
+            "private": False,
+            "joined_at": datetime.utcnow()
+        }
+
+    @staticmethod
+    def indexes():
+        """
+        Index recommandés pour la collection memberships
+        """
+        return [
+            # Test d'appartenance et unicité (une adhésion par utilisateur et par cible)
+            {"key": [("target_type", 1), ("target_id", 1), ("user_id", 1)], "unique": True},
+            # Cibles non publiques d'un utilisateur (listes d'événements et de groupes visibles)
+            {"key": [("user_id", 1), ("target_type", 1), ("private", 1)]},
+            # Membres d'une cible, paginés
+            {"key": [("target_type", 1), ("target_id", 1), ("_id", 1)]}
+        ]
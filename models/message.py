@@ -1,8 +1,9 @@
 """
 Modèle Message - Structure d'un message dans une discussion
 
-Note: Les messages sont stockés comme sous-documents dans les discussions,
-mais ce modèle documente leur structure.
+Note: Les messages sont stockés comme sous-documents dans les buckets de la
+collection message_buckets (voir MessageBucketModel), mais ce modèle documente
+leur structure.
 """
 
 from datetime import datetime
@@ -0,0 +1,91 @@
+"""
+Modèle MessageBucket - Structure d'un bucket de messages dans MongoDB
+
+Collection: message_buckets
+
+Les messages d'un fil de discussion (événement ou groupe) sont répartis dans
+des buckets de taille fixe (Config.MESSAGE_BUCKET_SIZE) au lieu d'un tableau
+unique dans le document discussion.
+"""
+
+from datetime import datetime
+from bson import ObjectId
+
+class MessageBucketModel:
+    """
+    Représente un bucket de messages d'un fil de discussion
+    """
+
+    collection = "message_buckets"
+
+    @staticmethod
+    def schema():
+        """
+        Retourne la structure d'un document bucket
+        """
+        return {
+            "_id": ObjectId(),
+            "thread_type": str,  # "event" ou "group"
+            "thread_id": ObjectId(),  # ID de l'événement ou du groupe
+            "count": int,  # Nombre de messages dans le bucket
+            "first_id": ObjectId(),  # Plus petit ID de message du bucket
+            "last_id": ObjectId(),  # Plus grand ID de message du bucket
+            "messages": [
+                {
+                    "_id": ObjectId(),
+                    "author_id": ObjectId(),
+                    "author_name": str,
+                    "content": str,
+                    "parent_message_id": ObjectId(),  # Pour les réponses, optionnel
+                    "created_at": datetime
+                }
+            ],
+            "migrated_from": ObjectId(),  # ID de la discussion d'origine, si migré
+            "migrated_chunk": int,  # Rang de la tranche migrée, si migré
+            "created_at": datetime
+        }
+
+    @staticmethod
+    def example():
+        """
+        Exemple d'un document bucket
+        """
+        return {
+            "_id": ObjectId("507f1f77bcf86cd799439035"),
+            "thread_type": "event",
+            "thread_id": ObjectId("507f1f77bcf86cd799439012"),
+            "count": 2,
+            "first_id": ObjectId("507f1f77bcf86cd799439031"),
+            "last_id": ObjectId("507f1f77bcf86cd799439032"),
+            "messages": [
+                {
+                    "_id": ObjectId("507f1f77bcf86cd799439031"),
+                    "author_id": ObjectId("507f1f77bcf86cd799439011"),
+                    "author_name": "John Doe",
+                    "content": "Salut tout le monde ! J'ai hâte d'être à samedi !",
+                    "parent_message_id": None,
+                    "created_at": datetime.utcnow()
+                },
+                {
+                    "_id": ObjectId("507f1f77bcf86cd799439032"),
+                    "author_id": ObjectId("507f1f77bcf86cd799439013"),
+                    "author_name": "Jane Smith",
+                    "content": "Moi aussi ! Ça va être génial !",
+                    "parent_message_id": ObjectId("507f1f77bcf86cd799439031"),
+                    "created_at": datetime.utcnow()
+                }
+            ],
+            "created_at": datetime.utcnow()
+        }
+
+    @staticmethod
+    def indexes():
+        """
+        Index recommandés pour la collection message_buckets
+        """
+        return [
+            {"key": [("thread_id", 1), ("count", 1)]},  # Bucket courant (écriture)
+            {"key": [("thread_id", 1), ("first_id", -1)]},  # Pagination "before"
+            {"key": [("thread_id", 1), ("last_id", 1)]},  # Pagination "after"
+            {"key": [("migrated_from", 1), ("migrated_chunk", 1)], "sparse": True}  # Migration rejouable
+        ]
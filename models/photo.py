@@ -12,6 +12,8 @@ class PhotoModel:
     Représente une photo dans un album
     """
     
+    collection = "photos"
+    
     @staticmethod
     def schema():
         """
@@ -22,6 +24,7 @@ class PhotoModel:
             "url": str,  # URL de la photo, requis
             "caption": str,  # Légende, optionnel
             "album_id": ObjectId(),  # Requis
+            "event_id": ObjectId(),  # Copié depuis l'album (contrôle d'accès)
             "posted_by": ObjectId(),  # ID de l'utilisateur, requis
             "posted_by_name": str,  # Nom complet
             "comments": [
@@ -46,6 +49,7 @@ class PhotoModel:
             "url": "https://example.com/photos/birthday-cake.jpg",
             "caption": "Le magnifique gâteau d'anniversaire !",
             "album_id": ObjectId("507f1f77bcf86cd799439040"),
+            "event_id": ObjectId("507f1f77bcf86cd799439012"),
             "posted_by": ObjectId("507f1f77bcf86cd799439011"),
             "posted_by_name": "John Doe",
             "comments": [
@@ -67,6 +71,7 @@ class PhotoModel:
         """
         return [
             {"key": "album_id"},
+            {"key": "event_id"},
             {"key": "posted_by"},
             {"key": "created_at"}
         ]
\ No newline at end of file
@@ -12,6 +12,8 @@ class PollModel:
     Représente un sondage pour un événement
     """
     
+    collection = "polls"
+    
     @staticmethod
     def schema():
         """
@@ -42,6 +44,8 @@ class PollModel:
                     "created_at": datetime
                 }
             ],
+            "tallies": [[int]],  # Votes par question puis par option, incrémentés à chaque réponse
+            "total_responses": int,  # Nombre de réponses
             "created_by": ObjectId(),
             "created_at": datetime
         }
@@ -78,6 +82,8 @@ class PollModel:
                     "created_at": datetime.utcnow()
                 }
             ],
+            "tallies": [[0, 1, 0, 0], [1, 0, 0]],
+            "total_responses": 1,
             "created_by": ObjectId("507f1f77bcf86cd799439011"),
             "created_at": datetime.utcnow()
         }
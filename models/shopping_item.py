@@ -12,6 +12,8 @@ class ShoppingItemModel:
     Représente un item à apporter à un événement (BONUS)
     """
     
+    collection = "shopping_items"
+    
     @staticmethod
     def schema():
         """
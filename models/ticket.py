@@ -12,6 +12,8 @@ class TicketTypeModel:
     Représente un type de billet créé par un organisateur
     """
     
+    collection = "ticket_types"
+    
     @staticmethod
     def schema():
         """
@@ -62,6 +64,8 @@ class TicketModel:
     Représente un billet acheté par une personne
     """
     
+    collection = "tickets"
+    
     @staticmethod
     def schema():
         """
@@ -117,7 +121,7 @@ class TicketModel:
         """
         return [
             {"key": "ticket_type_id"},
-            {"key": "event_id"},
+            {"key": [("event_id", 1), ("purchase_date", -1)]},  # Liste et statistiques par événement
             {"key": "buyer_email"},
             {"key": "ticket_number", "unique": True},
             {"key": "purchase_date"}
@@ -12,6 +12,8 @@ class UserModel:
     Représente un utilisateur de la plateforme
     """
     
+    collection = "users"
+    
     @staticmethod
     def schema():
         """
@@ -33,6 +35,7 @@ class UserModel:
             },  # Optionnel
             "bio": str,  # Optionnel, max 500 caractères
             "profile_picture": str,  # URL, optionnel
+            "search_tokens": [str],  # Calculé (utils.user_search), jamais renvoyé par l'API
             "created_at": datetime,  # Date de création du compte
             "updated_at": datetime  # Date de dernière modification
         }
@@ -58,6 +61,7 @@ class UserModel:
             },
             "bio": "Passionné de technologie et d'événements",
             "profile_picture": "https://example.com/profiles/john.jpg",
+            "search_tokens": ["doe", "john", "john.doe@example.com"],
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
@@ -69,5 +73,6 @@ class UserModel:
         """
         return [
             {"key": "email", "unique": True},
+            {"key": "search_tokens"},  # Recherche par préfixe (multikey)
             {"key": "created_at"}
         ]
\ No newline at end of file
@@ -2,7 +2,11 @@ from flask import Blueprint, request
 from bson import ObjectId
 from datetime import datetime
 from utils import get_db, success_response, error_response, not_found_response, created_response
-from middleware import token_required
+from utils.access import get_event_access, get_photo_event_id
+from utils.streaming import stream_response
+from utils.memberships import EVENT, member_of
+from utils.batch import parse_ids, batch_result
+from middleware import token_required, token_claims_required
 from validators import validate_album_create, validate_photo_create, validate_comment_create
 
 albums_bp = Blueprint('albums', __name__, url_prefix='/api/albums')
@@ -18,8 +22,8 @@ def create_album(current_user):
             return error_response("Données invalides", 400, errors)
         
         db = get_db()
-        event = db.events.find_one({"_id": ObjectId(data['event_id'])})
-        if not event or ObjectId(current_user['_id']) not in event['participants']:
+        access = get_event_access(db, data['event_id'], current_user['_id'])
+        if not access or not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
         album_data = {
@@ -38,7 +42,7 @@ def create_album(current_user):
         return error_response(f"Erreur: {str(e)}", 500)
 
 @albums_bp.route('/event/<event_id>', methods=['GET'])
-@token_required
+@token_claims_required
 def get_event_albums(current_user, event_id):
     """Récupérer les albums d'un événement"""
     try:
@@ -46,8 +50,8 @@ def get_event_albums(current_user, event_id):
             return error_response("ID événement invalide", 400)
         
         db = get_db()
-        event = db.events.find_one({"_id": ObjectId(event_id)})
-        if not event or ObjectId(current_user['_id']) not in event['participants']:
+        access = get_event_access(db, event_id, current_user['_id'])
+        if not access or not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
         albums = list(db.albums.find({"event_id": ObjectId(event_id)}))
@@ -56,7 +60,7 @@ def get_event_albums(current_user, event_id):
         return error_response(f"Erreur: {str(e)}", 500)
 
 @albums_bp.route('/<album_id>', methods=['GET'])
-@token_required
+@token_claims_required
 def get_album(current_user, album_id):
     """Récupérer un album par son ID"""
     try:
@@ -68,8 +72,8 @@ def get_album(current_user, album_id):
         if not album:
             return not_found_response("Album non trouvé")
         
-        event = db.events.find_one({"_id": album['event_id']})
-        if not event or ObjectId(current_user['_id']) not in event['participants']:
+        access = get_event_access(db, album['event_id'], current_user['_id'])
+        if not access or not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
         return success_response(album)
@@ -90,8 +94,8 @@ def delete_album(current_user, album_id):
             return not_found_response("Album non trouvé")
         
         # Vérifier que l'utilisateur est le créateur de l'album ou organisateur de l'événement
-        event = db.events.find_one({"_id": album['event_id']})
-        if album['created_by'] != ObjectId(current_user['_id']) and ObjectId(current_user['_id']) not in event.get('organizers', []):
+        access = get_event_access(db, album['event_id'], current_user['_id'])
+        if album['created_by'] != ObjectId(current_user['_id']) and not (access and access['is_organizer']):
             return error_response("Seul le créateur ou un organisateur peut supprimer cet album", 403)
         
         # Supprimer toutes les photos de l'album
@@ -120,18 +124,19 @@ def add_photo(current_user, album_id):
             return error_response("Données invalides", 400, errors)
         
         db = get_db()
-        album = db.albums.find_one({"_id": ObjectId(album_id)})
+        album = db.albums.find_one({"_id": ObjectId(album_id)}, {"event_id": 1})
         if not album:
             return not_found_response("Album non trouvé")
         
-        event = db.events.find_one({"_id": album['event_id']})
-        if not event or ObjectId(current_user['_id']) not in event['participants']:
+        access = get_event_access(db, album['event_id'], current_user['_id'])
+        if not access or not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
         photo_data = {
             "url": data['url'],
             "caption": data.get('caption'),
             "album_id": ObjectId(album_id),
+            "event_id": album['event_id'],  # Dénormalisé pour le contrôle d'accès
             "posted_by": ObjectId(current_user['_id']),
             "posted_by_name": f"{current_user['first_name']} {current_user['last_name']}",
             "comments": [],
@@ -146,7 +151,7 @@ def add_photo(current_user, album_id):
         return error_response(f"Erreur: {str(e)}", 500)
 
 @albums_bp.route('/<album_id>/photos', methods=['GET'])
-@token_required
+@token_claims_required
 def get_album_photos(current_user, album_id):
     """Récupérer les photos d'un album"""
     try:
@@ -154,21 +159,44 @@ def get_album_photos(current_user, album_id):
             return error_response("ID album invalide", 400)
         
         db = get_db()
-        album = db.albums.find_one({"_id": ObjectId(album_id)})
+        album = db.albums.find_one({"_id": ObjectId(album_id)}, {"event_id": 1})
         if not album:
             return not_found_response("Album non trouvé")
         
-        event = db.events.find_one({"_id": album['event_id']})
-        if not event or ObjectId(current_user['_id']) not in event['participants']:
+        access = get_event_access(db, album['event_id'], current_user['_id'])
+        if not access or not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
-        photos = list(db.photos.find({"album_id": ObjectId(album_id)}).sort("created_at", -1))
-        return success_response({"photos": photos})
+        photos = db.photos.find({"album_id": ObjectId(album_id)}).sort("created_at", -1)
+        return stream_response(photos, "photos")
+    except Exception as e:
+        return error_response(f"Erreur: {str(e)}", 500)
+
+@albums_bp.route('/photos/batch', methods=['GET'])
+@token_claims_required
+def get_photos_batch(current_user):
+    """Récupérer plusieurs photos par leurs IDs (?ids=id1,id2,...)"""
+    try:
+        try:
+            ids = parse_ids(request.args)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
+        db = get_db()
+        photos = list(db.photos.find({"_id": {"$in": ids}}))
+        
+        # Mêmes règles que get_photo: réservé aux participants de l'événement
+        event_ids = {photo['_id']: get_photo_event_id(db, photo) for photo in photos}
+        allowed = member_of(db, EVENT, {event_id for event_id in event_ids.values() if event_id}, current_user['_id'])
+        visible = [photo for photo in photos if event_ids[photo['_id']] in allowed]
+        forbidden = [photo['_id'] for photo in photos if event_ids[photo['_id']] not in allowed]
+        
+        return success_response(batch_result("photos", ids, visible, forbidden))
     except Exception as e:
         return error_response(f"Erreur: {str(e)}", 500)
 
 @albums_bp.route('/photos/<photo_id>', methods=['GET'])
-@token_required
+@token_claims_required
 def get_photo(current_user, photo_id):
     """Récupérer une photo par son ID"""
     try:
@@ -180,9 +208,9 @@ def get_photo(current_user, photo_id):
         if not photo:
             return not_found_response("Photo non trouvée")
         
-        album = db.albums.find_one({"_id": photo['album_id']})
-        event = db.events.find_one({"_id": album['event_id']})
-        if not event or ObjectId(current_user['_id']) not in event['participants']:
+        event_id = get_photo_event_id(db, photo)
+        access = get_event_access(db, event_id, current_user['_id']) if event_id else None
+        if not access or not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
         return success_response(photo)
@@ -198,16 +226,16 @@ def delete_photo(current_user, photo_id):
             return error_response("ID photo invalide", 400)
         
         db = get_db()
-        photo = db.photos.find_one({"_id": ObjectId(photo_id)})
+        photo = db.photos.find_one({"_id": ObjectId(photo_id)}, {"album_id": 1, "event_id": 1, "posted_by": 1})
         if not photo:
             return not_found_response("Photo non trouvée")
         
         # Vérifier que l'utilisateur est le créateur de la photo ou organisateur
-        album = db.albums.find_one({"_id": photo['album_id']})
-        event = db.events.find_one({"_id": album['event_id']})
-        
-        if photo['posted_by'] != ObjectId(current_user['_id']) and ObjectId(current_user['_id']) not in event.get('organizers', []):
-            return error_response("Seul le créateur ou un organisateur peut supprimer cette photo", 403)
+        if photo['posted_by'] != ObjectId(current_user['_id']):
+            event_id = get_photo_event_id(db, photo)
+            access = get_event_access(db, event_id, current_user['_id']) if event_id else None
+            if not access or not access['is_organizer']:
+                return error_response("Seul le créateur ou un organisateur peut supprimer cette photo", 403)
         
         db.photos.delete_one({"_id": ObjectId(photo_id)})
         
@@ -229,13 +257,13 @@ def add_comment(current_user, photo_id):
             return error_response("Données invalides", 400, errors)
         
         db = get_db()
-        photo = db.photos.find_one({"_id": ObjectId(photo_id)})
+        photo = db.photos.find_one({"_id": ObjectId(photo_id)}, {"album_id": 1, "event_id": 1})
         if not photo:
             return not_found_response("Photo non trouvée")
         
-        album = db.albums.find_one({"_id": photo['album_id']})
-        event = db.events.find_one({"_id": album['event_id']})
-        if not event or ObjectId(current_user['_id']) not in event['participants']:
+        event_id = get_photo_event_id(db, photo)
+        access = get_event_access(db, event_id, current_user['_id']) if event_id else None
+        if not access or not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
         comment = {
@@ -264,26 +292,25 @@ def delete_comment(current_user, photo_id, comment_id):
             return error_response("ID invalide", 400)
         
         db = get_db()
-        photo = db.photos.find_one({"_id": ObjectId(photo_id)})
+        # Ne charger que le commentaire concerné
+        photo = db.photos.find_one(
+            {"_id": ObjectId(photo_id)},
+            {"album_id": 1, "event_id": 1, "comments": {"$elemMatch": {"_id": ObjectId(comment_id)}}}
+        )
         if not photo:
             return not_found_response("Photo non trouvée")
         
-        # Trouver le commentaire
-        comment = None
-        for c in photo.get('comments', []):
-            if str(c['_id']) == comment_id:
-                comment = c
-                break
+        comment = photo['comments'][0] if photo.get('comments') else None
         
         if not comment:
             return not_found_response("Commentaire non trouvé")
         
         # Vérifier que l'utilisateur est l'auteur du commentaire ou organisateur
-        album = db.albums.find_one({"_id": photo['album_id']})
-        event = db.events.find_one({"_id": album['event_id']})
-        
-        if comment['author_id'] != ObjectId(current_user['_id']) and ObjectId(current_user['_id']) not in event.get('organizers', []):
-            return error_response("Seul l'auteur ou un organisateur peut supprimer ce commentaire", 403)
+        if comment['author_id'] != ObjectId(current_user['_id']):
+            event_id = get_photo_event_id(db, photo)
+            access = get_event_access(db, event_id, current_user['_id']) if event_id else None
+            if not access or not access['is_organizer']:
+                return error_response("Seul l'auteur ou un organisateur peut supprimer ce commentaire", 403)
         
         db.photos.update_one(
             {"_id": ObjectId(photo_id)},
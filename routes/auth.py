@@ -1,10 +1,12 @@
 from flask import Blueprint, request
 from bson import ObjectId
-import bcrypt
 import jwt
 from datetime import datetime, timedelta
 from config import Config
 from utils import get_db, success_response, error_response, created_response
+from utils.passwords import password_hasher, PasswordHasherBusy
+from utils.user_search import PRIVATE_USER_FIELDS, search_tokens
+from middleware import login_rate_limited
 from validators import validate_user_registration, validate_user_login
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
@@ -26,8 +28,8 @@ def register():
         if db.users.find_one({"email": data['email']}):
             return error_response("Un utilisateur avec cet email existe déjà", 400)
         
-        # Hasher le mot de passe
-        hashed_password = bcrypt.hashpw(data['password'].encode('utf-8'), bcrypt.gensalt())
+        # Hasher le mot de passe (pool bcrypt dédié)
+        hashed_password = password_hasher.hash(data['password'])
         
         # Créer l'utilisateur
         user_data = {
@@ -43,6 +45,7 @@ def register():
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
+        user_data["search_tokens"] = search_tokens(user_data)
         
         result = db.users.insert_one(user_data)
         
@@ -50,22 +53,26 @@ def register():
         token = jwt.encode({
             'user_id': str(result.inserted_id),
             'email': data['email'],
+            'first_name': data['first_name'],
+            'last_name': data['last_name'],
             'exp': datetime.utcnow() + Config.JWT_ACCESS_TOKEN_EXPIRES
         }, Config.JWT_SECRET_KEY, algorithm="HS256")
         
         # Récupérer l'utilisateur créé
-        user = db.users.find_one({"_id": result.inserted_id})
-        user.pop('password')  # Ne pas retourner le mot de passe
+        user = db.users.find_one({"_id": result.inserted_id}, PRIVATE_USER_FIELDS)  # Sans le mot de passe
         
         return created_response({
             "user": user,
             "token": token
         }, "Utilisateur créé avec succès")
         
+    except PasswordHasherBusy as e:
+        return error_response(str(e), 503)
     except Exception as e:
         return error_response(f"Erreur lors de l'inscription: {str(e)}", 500)
 
 @auth_bp.route('/login', methods=['POST'])
+@login_rate_limited
 def login():
     """Connexion d'un utilisateur"""
     try:
@@ -85,24 +92,39 @@ def login():
             return error_response("Email ou mot de passe incorrect", 401)
         
         # Vérifier le mot de passe
-        if not bcrypt.checkpw(data['password'].encode('utf-8'), user['password']):
+        if not password_hasher.check(data['password'], user['password']):
             return error_response("Email ou mot de passe incorrect", 401)
         
+        # Re-hacher si le coût bcrypt a changé depuis la création du hash
+        if password_hasher.needs_rehash(user['password']):
+            try:
+                db.users.update_one(
+                    {"_id": user['_id'], "password": user['password']},
+                    {"$set": {"password": password_hasher.hash(data['password'])}}
+                )
+            except PasswordHasherBusy:
+                pass  # Sera fait à une prochaine connexion
+        
         # Générer le token JWT
         token = jwt.encode({
             'user_id': str(user['_id']),
             'email': user['email'],
+            'first_name': user['first_name'],
+            'last_name': user['last_name'],
             'exp': datetime.utcnow() + Config.JWT_ACCESS_TOKEN_EXPIRES
         }, Config.JWT_SECRET_KEY, algorithm="HS256")
         
-        # Retirer le mot de passe
-        user.pop('password')
+        # Retirer le mot de passe et les champs internes
+        for field in PRIVATE_USER_FIELDS:
+            user.pop(field, None)
         
         return success_response({
             "user": user,
             "token": token
         }, "Connexion réussie")
         
+    except PasswordHasherBusy as e:
+        return error_response(str(e), 503)
     except Exception as e:
         return error_response(f"Erreur lors de la connexion: {str(e)}", 500)
 
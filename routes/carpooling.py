@@ -2,7 +2,10 @@ from flask import Blueprint, request
 from bson import ObjectId
 from datetime import datetime
 from utils import get_db, success_response, error_response, not_found_response, created_response
-from middleware import token_required
+from utils.access import get_event_access
+from utils.streaming import stream_response
+from utils.geo import geojson_point, parse_geo_args, near_pipeline, within_filter
+from middleware import token_required, token_claims_required
 from validators import validate_carpooling_create, validate_carpooling_update, validate_carpooling_booking
 
 carpooling_bp = Blueprint('carpooling', __name__, url_prefix='/api/carpooling')
@@ -18,18 +21,19 @@ def create_carpooling_offer(current_user):
             return error_response("Données invalides", 400, errors)
         
         db = get_db()
-        event = db.events.find_one({"_id": ObjectId(data['event_id'])})
-        if not event:
+        access = get_event_access(db, ObjectId(data['event_id']), current_user['_id'])
+        if not access:
             return not_found_response("Événement non trouvé")
         
-        if not event.get('has_carpooling'):
+        if not access.get('has_carpooling'):
             return error_response("Le covoiturage n'est pas activé pour cet événement", 400)
         
-        if ObjectId(current_user['_id']) not in event['participants']:
+        if not access['is_participant']:
             return error_response("Vous devez participer à l'événement", 403)
         
         offer_data = {
             "departure_location": data['departure_location'],
+            "departure_point": geojson_point(data.get('departure_point')),  # GeoJSON, optionnel
             "departure_time": datetime.fromisoformat(data['departure_time'].replace('Z', '+00:00')),
             "price": data['price'],
             "available_seats": data['available_seats'],
@@ -51,7 +55,7 @@ def create_carpooling_offer(current_user):
         return error_response(f"Erreur: {str(e)}", 500)
 
 @carpooling_bp.route('/event/<event_id>', methods=['GET'])
-@token_required
+@token_claims_required
 def get_event_carpooling_offers(current_user, event_id):
     """Récupérer les offres de covoiturage d'un événement"""
     try:
@@ -59,20 +63,34 @@ def get_event_carpooling_offers(current_user, event_id):
             return error_response("ID événement invalide", 400)
         
         db = get_db()
-        event = db.events.find_one({"_id": ObjectId(event_id)})
-        if not event:
+        access = get_event_access(db, ObjectId(event_id), current_user['_id'])
+        if not access:
             return not_found_response("Événement non trouvé")
         
-        if ObjectId(current_user['_id']) not in event['participants']:
+        if not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
-        offers = list(db.carpooling.find({"event_id": ObjectId(event_id)}).sort("departure_time", 1))
-        return success_response({"carpooling_offers": offers})
+        try:
+            geo = parse_geo_args(request.args)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
+        # Départs proches d'un point (triés par distance) ou dans un rectangle
+        query = {"event_id": ObjectId(event_id)}
+        if geo['near']:
+            offers = db.carpooling.aggregate(
+                near_pipeline("departure_point", geo['near'], query, geo['max_distance'])
+            )
+        else:
+            if geo['within']:
+                query.update(within_filter("departure_point", geo['within']))
+            offers = db.carpooling.find(query).sort("departure_time", 1)
+        return stream_response(offers, "carpooling_offers")
     except Exception as e:
         return error_response(f"Erreur: {str(e)}", 500)
 
 @carpooling_bp.route('/<offer_id>', methods=['GET'])
-@token_required
+@token_claims_required
 def get_carpooling_offer(current_user, offer_id):
     """Récupérer une offre par son ID"""
     try:
@@ -84,8 +102,8 @@ def get_carpooling_offer(current_user, offer_id):
         if not offer:
             return not_found_response("Offre non trouvée")
         
-        event = db.events.find_one({"_id": offer['event_id']})
-        if ObjectId(current_user['_id']) not in event['participants']:
+        access = get_event_access(db, offer['event_id'], current_user['_id'])
+        if not access or not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
         return success_response(offer)
@@ -226,8 +244,8 @@ def delete_carpooling_offer(current_user, offer_id):
             return not_found_response("Offre non trouvée")
         
         # Vérifier que l'utilisateur est le conducteur ou organisateur
-        event = db.events.find_one({"_id": offer['event_id']})
-        if offer['driver_id'] != ObjectId(current_user['_id']) and ObjectId(current_user['_id']) not in event.get('organizers', []):
+        access = get_event_access(db, offer['event_id'], current_user['_id'])
+        if offer['driver_id'] != ObjectId(current_user['_id']) and not (access and access['is_organizer']):
             return error_response("Vous ne pouvez supprimer que vos propres offres", 403)
         
         # Vérifier s'il y a des passagers
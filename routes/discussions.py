@@ -2,57 +2,62 @@ from flask import Blueprint, request
 from bson import ObjectId
 from datetime import datetime
 from utils import get_db, success_response, error_response, not_found_response, created_response
-from middleware import token_required
+from utils.access import get_event_access
+from utils.memberships import GROUP, is_member
+from utils.message_store import append_message, get_messages, parse_page_args
+from middleware import token_required, token_claims_required
 from validators import validate_message_create
 
 discussions_bp = Blueprint('discussions', __name__, url_prefix='/api/discussions')
 
 @discussions_bp.route('/event/<event_id>/messages', methods=['GET'])
-@token_required
+@token_claims_required
 def get_event_messages(current_user, event_id):
     """Récupérer les messages d'un événement"""
     try:
         if not ObjectId.is_valid(event_id):
             return error_response("ID événement invalide", 400)
         
+        before, after, limit, page_error = parse_page_args(request.args)
+        if page_error:
+            return error_response(page_error, 400)
+        
         db = get_db()
         
         # Vérifier l'accès à l'événement
-        event = db.events.find_one({"_id": ObjectId(event_id)})
-        if not event or ObjectId(current_user['_id']) not in event['participants']:
+        access = get_event_access(db, ObjectId(event_id), current_user['_id'])
+        if not access or not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
-        discussion = db.discussions.find_one({"event_id": ObjectId(event_id)})
-        
-        if not discussion:
-            return success_response({"messages": []})
+        page = get_messages(db, ObjectId(event_id), before, after, limit)
         
-        return success_response({"messages": discussion.get('messages', [])})
+        return success_response(page)
         
     except Exception as e:
         return error_response(f"Erreur: {str(e)}", 500)
 
 @discussions_bp.route('/group/<group_id>/messages', methods=['GET'])
-@token_required
+@token_claims_required
 def get_group_messages(current_user, group_id):
     """Récupérer les messages d'un groupe"""
     try:
         if not ObjectId.is_valid(group_id):
             return error_response("ID groupe invalide", 400)
         
+        before, after, limit, page_error = parse_page_args(request.args)
+        if page_error:
+            return error_response(page_error, 400)
+        
         db = get_db()
         
         # Vérifier l'accès au groupe
-        group = db.groups.find_one({"_id": ObjectId(group_id)})
-        if not group or ObjectId(current_user['_id']) not in group['members']:
+        group = db.groups.find_one({"_id": ObjectId(group_id)}, {"allow_members_to_post": 1, "administrators": 1})
+        if not group or not is_member(db, GROUP, group_id, current_user['_id']):
             return error_response("Accès non autorisé", 403)
         
-        discussion = db.discussions.find_one({"group_id": ObjectId(group_id)})
-        
-        if not discussion:
-            return success_response({"messages": []})
+        page = get_messages(db, ObjectId(group_id), before, after, limit)
         
-        return success_response({"messages": discussion.get('messages', [])})
+        return success_response(page)
         
     except Exception as e:
         return error_response(f"Erreur: {str(e)}", 500)
@@ -74,8 +79,8 @@ def post_event_message(current_user, event_id):
         db = get_db()
         
         # Vérifier l'accès
-        event = db.events.find_one({"_id": ObjectId(event_id)})
-        if not event or ObjectId(current_user['_id']) not in event['participants']:
+        access = get_event_access(db, ObjectId(event_id), current_user['_id'])
+        if not access or not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
         message = {
@@ -87,10 +92,7 @@ def post_event_message(current_user, event_id):
             "created_at": datetime.utcnow()
         }
         
-        db.discussions.update_one(
-            {"event_id": ObjectId(event_id)},
-            {"$push": {"messages": message}}
-        )
+        append_message(db, "event", ObjectId(event_id), message)
         
         return created_response(message, "Message posté avec succès")
         
@@ -114,8 +116,8 @@ def post_group_message(current_user, group_id):
         db = get_db()
         
         # Vérifier l'accès et les permissions
-        group = db.groups.find_one({"_id": ObjectId(group_id)})
-        if not group or ObjectId(current_user['_id']) not in group['members']:
+        group = db.groups.find_one({"_id": ObjectId(group_id)}, {"allow_members_to_post": 1, "administrators": 1})
+        if not group or not is_member(db, GROUP, group_id, current_user['_id']):
             return error_response("Accès non autorisé", 403)
         
         if not group['allow_members_to_post'] and ObjectId(current_user['_id']) not in group['administrators']:
@@ -130,10 +132,7 @@ def post_group_message(current_user, group_id):
             "created_at": datetime.utcnow()
         }
         
-        db.discussions.update_one(
-            {"group_id": ObjectId(group_id)},
-            {"$push": {"messages": message}}
-        )
+        append_message(db, "group", ObjectId(group_id), message)
         
         return created_response(message, "Message posté avec succès")
         
@@ -3,6 +3,19 @@ from bson import ObjectId
 from datetime import datetime
 from utils import get_db, success_response, error_response, not_found_response, created_response
 from middleware import token_required, optional_token
+from utils.pagination import parse_pagination_args, paginate
+from utils.access import get_event_access, invalidate_event_access
+from utils.dashboard import dashboard_loader, parse_sections
+from utils.event_search import (
+    DATE_SORT_FIELDS, GEO_FIELD, SORT_DISTANCE, SORT_RELEVANCE, build_event_query, parse_sort, search_by_relevance
+)
+from utils.geo import geojson_point, parse_geo_args, paginate_near
+from utils.memberships import (
+    EVENT, add_member, add_members, remove_member, is_member, member_of, private_target_ids, set_target_privacy,
+    list_members, delete_target_memberships
+)
+from utils.batch import parse_ids, batch_result
+from utils.response_cache import cached_response, mark_cacheable, invalidate_event_responses
 from validators import validate_event_create, validate_event_update
 
 events_bp = Blueprint('events', __name__, url_prefix='/api/events')
@@ -21,6 +34,8 @@ def create_event(current_user):
         
         db = get_db()
         
+        creator_id = ObjectId(current_user['_id'])
+        
         # Préparer les données
         event_data = {
             "name": data['name'],
@@ -28,10 +43,11 @@ def create_event(current_user):
             "start_date": datetime.fromisoformat(data['start_date'].replace('Z', '+00:00')),
             "end_date": datetime.fromisoformat(data['end_date'].replace('Z', '+00:00')),
             "location": data['location'],
+            "location_point": geojson_point(data.get('location_point')),  # GeoJSON, optionnel
             "cover_photo": data.get('cover_photo'),
             "is_private": data.get('is_private', False),
-            "organizers": [ObjectId(current_user['_id'])],  # Créateur = organisateur
-            "participants": [ObjectId(current_user['_id'])],  # Créateur = participant
+            "organizers": [creator_id],  # Créateur = organisateur
+            "participants_count": 0,  # Participants: collection memberships
             "group_id": ObjectId(data['group_id']) if data.get('group_id') else None,
             "has_ticketing": data.get('has_ticketing', False),
             "has_shopping_list": data.get('has_shopping_list', False),
@@ -46,13 +62,15 @@ def create_event(current_user):
                 if ObjectId.is_valid(org_id) and ObjectId(org_id) not in event_data['organizers']:
                     event_data['organizers'].append(ObjectId(org_id))
         
-        # Ajouter des participants si spécifiés
+        # Organisateurs et participants (créateur inclus)
+        roles = {org_id: "organizer" for org_id in event_data['organizers']}
         if data.get('participants'):
             for part_id in data['participants']:
-                if ObjectId.is_valid(part_id) and ObjectId(part_id) not in event_data['participants']:
-                    event_data['participants'].append(ObjectId(part_id))
+                if ObjectId.is_valid(part_id):
+                    roles.setdefault(ObjectId(part_id), "participant")
         
         result = db.events.insert_one(event_data)
+        add_members(db, EVENT, result.inserted_id, roles, private=event_data['is_private'])
         
         # Créer automatiquement un fil de discussion pour l'événement
         db.discussions.insert_one({
@@ -76,47 +94,48 @@ def get_events(current_user):
     try:
         db = get_db()
         
-        # Pagination
-        page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 20))
-        skip = (page - 1) * per_page
-        
-        # Filtres
-        query = {}
+        # Pagination (curseur ou numéro de page)
+        try:
+            pagination = parse_pagination_args(request.args)
+        except ValueError as e:
+            return error_response(str(e), 400)
         
-        # Si utilisateur connecté, montrer tous les événements publics + ses événements privés
+        # Visibilité: événements publics + événements privés de l'utilisateur
         if current_user:
-            query = {
+            visibility = {
                 "$or": [
                     {"is_private": False},
-                    {"participants": ObjectId(current_user['_id'])}
+                    {"_id": {"$in": private_target_ids(db, EVENT, current_user['_id'])}}
                 ]
             }
         else:
-            # Sinon, uniquement les événements publics
-            query = {"is_private": False}
-        
-        # Filtre par groupe
-        if request.args.get('group_id'):
-            query['group_id'] = ObjectId(request.args.get('group_id'))
-        
-        events = list(db.events.find(query).skip(skip).limit(per_page).sort("start_date", 1))
-        total = db.events.count_documents(query)
+            visibility = {"is_private": False}
+        
+        # Recherche et filtres (texte, dates, lieu, position, groupe)
+        geo = parse_geo_args(request.args)
+        query = build_event_query(request.args, visibility, geo)
+        
+        sort = parse_sort(request.args, query, geo)
+        if sort == SORT_DISTANCE:
+            events, pagination_meta = paginate_near(db.events, GEO_FIELD, geo['near'], query, pagination,
+                                                    geo['max_distance'])
+        elif sort == SORT_RELEVANCE:
+            events, pagination_meta = search_by_relevance(db.events, query, pagination)
+        else:
+            events, pagination_meta = paginate(db.events, query, DATE_SORT_FIELDS, pagination)
         
         return success_response({
             "events": events,
-            "pagination": {
-                "page": page,
-                "per_page": per_page,
-                "total": total,
-                "pages": (total + per_page - 1) // per_page
-            }
+            "pagination": pagination_meta
         })
         
+    except ValueError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response(f"Erreur lors de la récupération: {str(e)}", 500)
 
 @events_bp.route('/<event_id>', methods=['GET'])
+@cached_response('event_id')
 @optional_token
 def get_event(current_user, event_id):
     """Récupérer un événement par son ID"""
@@ -132,8 +151,10 @@ def get_event(current_user, event_id):
         
         # Vérifier l'accès pour les événements privés
         if event['is_private']:
-            if not current_user or ObjectId(current_user['_id']) not in event['participants']:
+            if not current_user or not is_member(db, EVENT, event['_id'], current_user['_id']):
                 return error_response("Accès non autorisé à cet événement privé", 403)
+        else:
+            mark_cacheable()
         
         return success_response(event)
         
@@ -165,6 +186,9 @@ def update_event(current_user, event_id):
         if not is_valid:
             return error_response("Données invalides", 400, errors)
         
+        if 'location_point' in data:
+            data['location_point'] = geojson_point(data['location_point'])
+        
         # Convertir les dates si présentes
         if 'start_date' in data:
             data['start_date'] = datetime.fromisoformat(data['start_date'].replace('Z', '+00:00'))
@@ -174,6 +198,10 @@ def update_event(current_user, event_id):
         data['updated_at'] = datetime.utcnow()
         
         db.events.update_one({"_id": ObjectId(event_id)}, {"$set": data})
+        if 'is_private' in data and data['is_private'] != event.get('is_private', False):
+            set_target_privacy(db, EVENT, event_id, data['is_private'])
+        invalidate_event_access(event_id)
+        invalidate_event_responses(event_id)
         
         updated_event = db.events.find_one({"_id": ObjectId(event_id)})
         
@@ -201,6 +229,9 @@ def delete_event(current_user, event_id):
             return error_response("Seuls les organisateurs peuvent supprimer l'événement", 403)
         
         db.events.delete_one({"_id": ObjectId(event_id)})
+        delete_target_memberships(db, EVENT, event_id)
+        invalidate_event_access(event_id)
+        invalidate_event_responses(event_id)
         
         return success_response(None, "Événement supprimé avec succès")
         
@@ -216,22 +247,17 @@ def join_event(current_user, event_id):
             return error_response("ID événement invalide", 400)
         
         db = get_db()
-        event = db.events.find_one({"_id": ObjectId(event_id)})
+        user_id = ObjectId(current_user['_id'])
         
+        event = db.events.find_one({"_id": ObjectId(event_id)}, {"is_private": 1})
         if not event:
             return not_found_response("Événement non trouvé")
         
-        user_id = ObjectId(current_user['_id'])
-        
-        # Vérifier si l'utilisateur est déjà participant
-        if user_id in event['participants']:
+        # L'index unique de memberships empêche les doublons concurrents
+        if not add_member(db, EVENT, event_id, user_id, private=event.get('is_private', False)):
             return error_response("Vous participez déjà à cet événement", 400)
         
-        # Ajouter l'utilisateur aux participants
-        db.events.update_one(
-            {"_id": ObjectId(event_id)},
-            {"$push": {"participants": user_id}}
-        )
+        invalidate_event_responses(event_id)
         
         return success_response(None, "Vous participez maintenant à l'événement")
         
@@ -247,24 +273,123 @@ def leave_event(current_user, event_id):
             return error_response("ID événement invalide", 400)
         
         db = get_db()
-        event = db.events.find_one({"_id": ObjectId(event_id)})
+        user_id = ObjectId(current_user['_id'])
+        
+        # Retirer l'utilisateur des organisateurs, sauf s'il est le dernier
+        # (vérifié par le filtre, de manière atomique)
+        result = db.events.update_one(
+            {
+                "_id": ObjectId(event_id),
+                "$or": [{"organizers": {"$ne": user_id}}, {"organizers.1": {"$exists": True}}]
+            },
+            {"$pull": {"organizers": user_id}}
+        )
+        
+        if result.matched_count == 0:
+            if not db.events.find_one({"_id": ObjectId(event_id)}, {"_id": 1}):
+                return not_found_response("Événement non trouvé")
+            return error_response("Le dernier organisateur ne peut pas quitter l'événement", 400)
+        
+        remove_member(db, EVENT, event_id, user_id)
+        invalidate_event_access(event_id, user_id)
+        invalidate_event_responses(event_id)
+        
+        return success_response(None, "Vous avez quitté l'événement")
+        
+    except Exception as e:
+        return error_response(f"Erreur: {str(e)}", 500)
+
+@events_bp.route('/<event_id>/participants', methods=['GET'])
+@optional_token
+def get_event_participants(current_user, event_id):
+    """Récupérer les participants d'un événement (paginés)"""
+    try:
+        if not ObjectId.is_valid(event_id):
+            return error_response("ID événement invalide", 400)
+        
+        try:
+            pagination = parse_pagination_args(request.args)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
+        db = get_db()
+        event = db.events.find_one({"_id": ObjectId(event_id)}, {"is_private": 1, "participants_count": 1})
         
         if not event:
             return not_found_response("Événement non trouvé")
         
-        user_id = ObjectId(current_user['_id'])
+        if event['is_private']:
+            if not current_user or not is_member(db, EVENT, event_id, current_user['_id']):
+                return error_response("Accès non autorisé à cet événement privé", 403)
         
-        # Vérifier si l'utilisateur est organisateur
-        if user_id in event['organizers'] and len(event['organizers']) == 1:
-            return error_response("Le dernier organisateur ne peut pas quitter l'événement", 400)
+        participants, pagination_meta = list_members(db, EVENT, event_id, pagination)
         
-        # Retirer l'utilisateur des participants et organisateurs
-        db.events.update_one(
-            {"_id": ObjectId(event_id)},
-            {"$pull": {"participants": user_id, "organizers": user_id}}
-        )
+        return success_response({
+            "participants": participants,
+            "participants_count": event.get('participants_count'),
+            "pagination": pagination_meta
+        })
         
-        return success_response(None, "Vous avez quitté l'événement")
+    except ValueError as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(f"Erreur lors de la récupération: {str(e)}", 500)
+
+@events_bp.route('/batch', methods=['GET'])
+@optional_token
+def get_events_batch(current_user):
+    """Récupérer plusieurs événements par leurs IDs (?ids=id1,id2,...)"""
+    try:
+        try:
+            ids = parse_ids(request.args)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
+        db = get_db()
+        events = list(db.events.find({"_id": {"$in": ids}}))
+        
+        # Mêmes règles que get_event: un événement privé est réservé à ses membres
+        private_ids = [event['_id'] for event in events if event['is_private']]
+        allowed = set()
+        if current_user and private_ids:
+            allowed = member_of(db, EVENT, private_ids, current_user['_id'])
+        forbidden = [event_id for event_id in private_ids if event_id not in allowed]
+        visible = [event for event in events if not event['is_private'] or event['_id'] in allowed]
+        
+        return success_response(batch_result("events", ids, visible, forbidden))
+        
+    except Exception as e:
+        return error_response(f"Erreur lors de la récupération: {str(e)}", 500)
+
+@events_bp.route('/<event_id>/dashboard', methods=['GET'])
+@optional_token
+def get_event_dashboard(current_user, event_id):
+    """Récupérer en une requête l'événement et ses données associées (?sections=...)"""
+    try:
+        if not ObjectId.is_valid(event_id):
+            return error_response("ID événement invalide", 400)
+        
+        try:
+            sections = parse_sections(request.args)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
+        db = get_db()
+        
+        # Contrôle d'accès unique pour toutes les sections
+        if current_user:
+            access = get_event_access(db, event_id, current_user['_id'])
+        else:
+            event = db.events.find_one({"_id": ObjectId(event_id)}, {"is_private": 1})
+            access = {"is_private": event['is_private'], "is_participant": False} if event else None
+        
+        if not access:
+            return not_found_response("Événement non trouvé")
+        
+        if access['is_private'] and not access['is_participant']:
+            return error_response("Accès non autorisé à cet événement privé", 403)
+        
+        return success_response(dashboard_loader.load(db, event_id, access, sections))
         
     except Exception as e:
-        return error_response(f"Erreur: {str(e)}", 500)
\ No newline at end of file
+        return error_response(f"Erreur lors de la récupération: {str(e)}", 500)
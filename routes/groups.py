@@ -3,6 +3,11 @@ from bson import ObjectId
 from datetime import datetime
 from utils import get_db, success_response, error_response, not_found_response, created_response
 from middleware import token_required, optional_token
+from utils.pagination import parse_pagination_args, paginate
+from utils.memberships import (
+    GROUP, add_member, add_members, remove_member, is_member, is_private_target, private_target_ids, set_target_privacy,
+    list_members
+)
 from validators import validate_group_create, validate_group_update
 
 groups_bp = Blueprint('groups', __name__, url_prefix='/api/groups')
@@ -29,17 +34,20 @@ def create_group(current_user):
             "allow_members_to_post": data.get('allow_members_to_post', True),
             "allow_members_to_create_events": data.get('allow_members_to_create_events', True),
             "administrators": [ObjectId(current_user['_id'])],
-            "members": [ObjectId(current_user['_id'])],
+            "members_count": 0,  # Membres: collection memberships
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
         
+        # Administrateurs et membres (créateur inclus)
+        roles = {admin_id: "administrator" for admin_id in group_data['administrators']}
         if data.get('members'):
             for member_id in data['members']:
-                if ObjectId.is_valid(member_id) and ObjectId(member_id) not in group_data['members']:
-                    group_data['members'].append(ObjectId(member_id))
+                if ObjectId.is_valid(member_id):
+                    roles.setdefault(ObjectId(member_id), "member")
         
         result = db.groups.insert_one(group_data)
+        add_members(db, GROUP, result.inserted_id, roles, private=is_private_target(GROUP, group_data))
         
         # Créer le fil de discussion du groupe
         db.discussions.insert_one({
@@ -63,9 +71,10 @@ def get_groups(current_user):
     try:
         db = get_db()
         
-        page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 20))
-        skip = (page - 1) * per_page
+        try:
+            pagination = parse_pagination_args(request.args)
+        except ValueError as e:
+            return error_response(str(e), 400)
         
         query = {}
         
@@ -73,25 +82,21 @@ def get_groups(current_user):
             query = {
                 "$or": [
                     {"group_type": "public"},
-                    {"members": ObjectId(current_user['_id'])}
+                    {"_id": {"$in": private_target_ids(db, GROUP, current_user['_id'])}}
                 ]
             }
         else:
             query = {"group_type": "public"}
         
-        groups = list(db.groups.find(query).skip(skip).limit(per_page))
-        total = db.groups.count_documents(query)
+        groups, pagination_meta = paginate(db.groups, query, [("_id", 1)], pagination)
         
         return success_response({
             "groups": groups,
-            "pagination": {
-                "page": page,
-                "per_page": per_page,
-                "total": total,
-                "pages": (total + per_page - 1) // per_page
-            }
+            "pagination": pagination_meta
         })
         
+    except ValueError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         return error_response(f"Erreur: {str(e)}", 500)
 
@@ -111,7 +116,7 @@ def get_group(current_user, group_id):
         
         # Vérifier l'accès pour les groupes privés/secrets
         if group['group_type'] in ['private', 'secret']:
-            if not current_user or ObjectId(current_user['_id']) not in group['members']:
+            if not current_user or not is_member(db, GROUP, group['_id'], current_user['_id']):
                 return error_response("Accès non autorisé", 403)
         
         return success_response(group)
@@ -145,6 +150,8 @@ def update_group(current_user, group_id):
         data['updated_at'] = datetime.utcnow()
         
         db.groups.update_one({"_id": ObjectId(group_id)}, {"$set": data})
+        if 'group_type' in data and data['group_type'] != group.get('group_type'):
+            set_target_privacy(db, GROUP, group_id, is_private_target(GROUP, data))
         
         updated_group = db.groups.find_one({"_id": ObjectId(group_id)})
         
@@ -162,24 +169,20 @@ def join_group(current_user, group_id):
             return error_response("ID groupe invalide", 400)
         
         db = get_db()
-        group = db.groups.find_one({"_id": ObjectId(group_id)})
+        user_id = ObjectId(current_user['_id'])
         
+        group = db.groups.find_one({"_id": ObjectId(group_id)}, {"group_type": 1})
         if not group:
             return not_found_response("Groupe non trouvé")
         
-        if group['group_type'] == 'secret':
+        # Un membre d'un groupe secret reçoit "déjà membre" plutôt qu'un refus
+        if group['group_type'] == 'secret' and not is_member(db, GROUP, group_id, user_id):
             return error_response("Impossible de rejoindre un groupe secret sans invitation", 403)
         
-        user_id = ObjectId(current_user['_id'])
-        
-        if user_id in group['members']:
+        # L'index unique de memberships empêche les doublons concurrents
+        if not add_member(db, GROUP, group_id, user_id, private=is_private_target(GROUP, group)):
             return error_response("Vous êtes déjà membre de ce groupe", 400)
         
-        db.groups.update_one(
-            {"_id": ObjectId(group_id)},
-            {"$push": {"members": user_id}}
-        )
-        
         return success_response(None, "Vous êtes maintenant membre du groupe")
         
     except Exception as e:
@@ -194,22 +197,61 @@ def leave_group(current_user, group_id):
             return error_response("ID groupe invalide", 400)
         
         db = get_db()
-        group = db.groups.find_one({"_id": ObjectId(group_id)})
-        
-        if not group:
-            return not_found_response("Groupe non trouvé")
-        
         user_id = ObjectId(current_user['_id'])
         
-        if user_id in group['administrators'] and len(group['administrators']) == 1:
+        # Le dernier administrateur ne peut pas partir (vérifié par le filtre)
+        result = db.groups.update_one(
+            {
+                "_id": ObjectId(group_id),
+                "$or": [{"administrators": {"$ne": user_id}}, {"administrators.1": {"$exists": True}}]
+            },
+            {"$pull": {"administrators": user_id}}
+        )
+        
+        if result.matched_count == 0:
+            if not db.groups.find_one({"_id": ObjectId(group_id)}, {"_id": 1}):
+                return not_found_response("Groupe non trouvé")
             return error_response("Le dernier administrateur ne peut pas quitter le groupe", 400)
         
-        db.groups.update_one(
-            {"_id": ObjectId(group_id)},
-            {"$pull": {"members": user_id, "administrators": user_id}}
-        )
+        remove_member(db, GROUP, group_id, user_id)
         
         return success_response(None, "Vous avez quitté le groupe")
         
     except Exception as e:
-        return error_response(f"Erreur: {str(e)}", 500)
\ No newline at end of file
+        return error_response(f"Erreur: {str(e)}", 500)
+
+@groups_bp.route('/<group_id>/members', methods=['GET'])
+@optional_token
+def get_group_members(current_user, group_id):
+    """Récupérer les membres d'un groupe (paginés)"""
+    try:
+        if not ObjectId.is_valid(group_id):
+            return error_response("ID groupe invalide", 400)
+        
+        try:
+            pagination = parse_pagination_args(request.args)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
+        db = get_db()
+        group = db.groups.find_one({"_id": ObjectId(group_id)}, {"group_type": 1, "members_count": 1})
+        
+        if not group:
+            return not_found_response("Groupe non trouvé")
+        
+        if group['group_type'] in ['private', 'secret']:
+            if not current_user or not is_member(db, GROUP, group_id, current_user['_id']):
+                return error_response("Accès non autorisé", 403)
+        
+        members, pagination_meta = list_members(db, GROUP, group_id, pagination)
+        
+        return success_response({
+            "members": members,
+            "members_count": group.get('members_count'),
+            "pagination": pagination_meta
+        })
+        
+    except ValueError as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(f"Erreur: {str(e)}", 500)
@@ -2,7 +2,9 @@ from flask import Blueprint, request
 from bson import ObjectId
 from datetime import datetime
 from utils import get_db, success_response, error_response, not_found_response, created_response
-from middleware import token_required
+from utils.access import get_event_access
+from utils.poll_tallies import empty_tallies, parse_answers, tally_increments, recount_poll, build_results
+from middleware import token_required, token_claims_required
 from validators import validate_poll_create, validate_poll_response
 
 polls_bp = Blueprint('polls', __name__, url_prefix='/api/polls')
@@ -18,8 +20,8 @@ def create_poll(current_user):
             return error_response("Données invalides", 400, errors)
         
         db = get_db()
-        event = db.events.find_one({"_id": ObjectId(data['event_id'])})
-        if not event or ObjectId(current_user['_id']) not in event['organizers']:
+        access = get_event_access(db, ObjectId(data['event_id']), current_user['_id'])
+        if not access or not access['is_organizer']:
             return error_response("Seuls les organisateurs peuvent créer des sondages", 403)
         
         poll_data = {
@@ -29,6 +31,8 @@ def create_poll(current_user):
             "questions": data['questions'],
             "allow_multiple_votes": data.get('allow_multiple_votes', False),
             "responses": [],
+            "tallies": empty_tallies(data['questions']),
+            "total_responses": 0,
             "created_by": ObjectId(current_user['_id']),
             "created_at": datetime.utcnow()
         }
@@ -41,7 +45,7 @@ def create_poll(current_user):
         return error_response(f"Erreur: {str(e)}", 500)
 
 @polls_bp.route('/event/<event_id>', methods=['GET'])
-@token_required
+@token_claims_required
 def get_event_polls(current_user, event_id):
     """Récupérer les sondages d'un événement"""
     try:
@@ -49,8 +53,8 @@ def get_event_polls(current_user, event_id):
             return error_response("ID événement invalide", 400)
         
         db = get_db()
-        event = db.events.find_one({"_id": ObjectId(event_id)})
-        if not event or ObjectId(current_user['_id']) not in event['participants']:
+        access = get_event_access(db, ObjectId(event_id), current_user['_id'])
+        if not access or not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
         polls = list(db.polls.find({"event_id": ObjectId(event_id)}))
@@ -59,7 +63,7 @@ def get_event_polls(current_user, event_id):
         return error_response(f"Erreur: {str(e)}", 500)
 
 @polls_bp.route('/<poll_id>', methods=['GET'])
-@token_required
+@token_claims_required
 def get_poll(current_user, poll_id):
     """Récupérer un sondage par son ID"""
     try:
@@ -71,8 +75,8 @@ def get_poll(current_user, poll_id):
         if not poll:
             return not_found_response("Sondage non trouvé")
         
-        event = db.events.find_one({"_id": poll['event_id']})
-        if not event or ObjectId(current_user['_id']) not in event['participants']:
+        access = get_event_access(db, poll['event_id'], current_user['_id'])
+        if not access or not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
         return success_response(poll)
@@ -92,10 +96,10 @@ def delete_poll(current_user, poll_id):
         if not poll:
             return not_found_response("Sondage non trouvé")
         
-        event = db.events.find_one({"_id": poll['event_id']})
+        access = get_event_access(db, poll['event_id'], current_user['_id'])
         
         # Vérifier que l'utilisateur est le créateur ou organisateur
-        if poll['created_by'] != ObjectId(current_user['_id']) and ObjectId(current_user['_id']) not in event.get('organizers', []):
+        if poll['created_by'] != ObjectId(current_user['_id']) and not (access and access['is_organizer']):
             return error_response("Seul le créateur ou un organisateur peut supprimer ce sondage", 403)
         
         db.polls.delete_one({"_id": ObjectId(poll_id)})
@@ -118,38 +122,51 @@ def respond_to_poll(current_user, poll_id):
             return error_response("Données invalides", 400, errors)
         
         db = get_db()
-        poll = db.polls.find_one({"_id": ObjectId(poll_id)})
+        poll = db.polls.find_one({"_id": ObjectId(poll_id)}, {"responses": 0})
         if not poll:
             return not_found_response("Sondage non trouvé")
         
-        event = db.events.find_one({"_id": poll['event_id']})
-        if not event or ObjectId(current_user['_id']) not in event['participants']:
+        access = get_event_access(db, poll['event_id'], current_user['_id'])
+        if not access or not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
-        # Vérifier si l'utilisateur a déjà répondu
-        if not poll.get('allow_multiple_votes', False):
-            existing = [r for r in poll.get('responses', []) if r['user_id'] == ObjectId(current_user['_id'])]
-            if existing:
-                return error_response("Vous avez déjà répondu à ce sondage", 400)
+        try:
+            answers = parse_answers(poll['questions'], data['responses'])
+            increments = tally_increments(poll['questions'], answers)
+        except ValueError as e:
+            return error_response(f"Réponse invalide: {str(e)}", 400)
+        
+        # Sondage antérieur aux compteurs: les initialiser avant d'incrémenter
+        if 'tallies' not in poll:
+            recount_poll(db, poll['_id'])
         
         response = {
             "user_id": ObjectId(current_user['_id']),
             "user_name": f"{current_user['first_name']} {current_user['last_name']}",
-            "responses": data['responses'],
+            "responses": answers,
             "created_at": datetime.utcnow()
         }
         
-        db.polls.update_one(
-            {"_id": ObjectId(poll_id)},
-            {"$push": {"responses": response}}
+        # Le filtre empêche atomiquement un second vote du même utilisateur
+        query = {"_id": ObjectId(poll_id)}
+        if not poll.get('allow_multiple_votes', False):
+            query["responses.user_id"] = {"$ne": ObjectId(current_user['_id'])}
+        
+        increments['total_responses'] = 1
+        result = db.polls.update_one(
+            query,
+            {"$push": {"responses": response}, "$inc": increments}
         )
         
+        if result.matched_count == 0:
+            return error_response("Vous avez déjà répondu à ce sondage", 400)
+        
         return created_response(response, "Réponse enregistrée avec succès")
     except Exception as e:
         return error_response(f"Erreur: {str(e)}", 500)
 
 @polls_bp.route('/<poll_id>/results', methods=['GET'])
-@token_required
+@token_claims_required
 def get_poll_results(current_user, poll_id):
     """Obtenir les résultats d'un sondage"""
     try:
@@ -157,41 +174,23 @@ def get_poll_results(current_user, poll_id):
             return error_response("ID sondage invalide", 400)
         
         db = get_db()
-        poll = db.polls.find_one({"_id": ObjectId(poll_id)})
+        # Les réponses individuelles ne sont pas chargées: les compteurs suffisent
+        poll = db.polls.find_one({"_id": ObjectId(poll_id)}, {"responses": 0})
         if not poll:
             return not_found_response("Sondage non trouvé")
         
-        event = db.events.find_one({"_id": poll['event_id']})
-        if not event or ObjectId(current_user['_id']) not in event['participants']:
+        access = get_event_access(db, poll['event_id'], current_user['_id'])
+        if not access or not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
-        # Calculer les statistiques
-        results = []
-        for q_index, question in enumerate(poll['questions']):
-            question_results = {
-                "question": question['question'],
-                "options": []
-            }
-            
-            # Compter les votes pour chaque option
-            for o_index, option in enumerate(question['options']):
-                count = 0
-                for response in poll.get('responses', []):
-                    for r in response['responses']:
-                        if r.get('question_index') == q_index and r.get('option_index') == o_index:
-                            count += 1
-                
-                question_results['options'].append({
-                    "option": option,
-                    "votes": count
-                })
-            
-            results.append(question_results)
+        # Sondage antérieur aux compteurs: les calculer une fois
+        if 'tallies' not in poll:
+            poll = recount_poll(db, poll['_id'])
         
         return success_response({
             "poll": poll,
-            "total_responses": len(poll.get('responses', [])),
-            "results": results
+            "total_responses": poll['total_responses'],
+            "results": build_results(poll)
         })
     except Exception as e:
         return error_response(f"Erreur: {str(e)}", 500)
\ No newline at end of file
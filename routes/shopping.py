@@ -2,7 +2,9 @@ from flask import Blueprint, request
 from bson import ObjectId
 from datetime import datetime
 from utils import get_db, success_response, error_response, not_found_response, created_response
-from middleware import token_required
+from utils.access import get_event_access
+from utils.streaming import stream_response
+from middleware import token_required, token_claims_required
 from validators import validate_shopping_item_create, validate_shopping_item_update
 
 shopping_bp = Blueprint('shopping', __name__, url_prefix='/api/shopping')
@@ -18,14 +20,14 @@ def create_shopping_item(current_user):
             return error_response("Données invalides", 400, errors)
         
         db = get_db()
-        event = db.events.find_one({"_id": ObjectId(data['event_id'])})
-        if not event:
+        access = get_event_access(db, ObjectId(data['event_id']), current_user['_id'])
+        if not access:
             return not_found_response("Événement non trouvé")
         
-        if not event.get('has_shopping_list'):
+        if not access.get('has_shopping_list'):
             return error_response("La shopping list n'est pas activée pour cet événement", 400)
         
-        if ObjectId(current_user['_id']) not in event['participants']:
+        if not access['is_participant']:
             return error_response("Vous devez participer à l'événement", 403)
         
         # Vérifier l'unicité du nom par événement
@@ -55,7 +57,7 @@ def create_shopping_item(current_user):
         return error_response(f"Erreur: {str(e)}", 500)
 
 @shopping_bp.route('/event/<event_id>', methods=['GET'])
-@token_required
+@token_claims_required
 def get_event_shopping_items(current_user, event_id):
     """Récupérer la shopping list d'un événement"""
     try:
@@ -63,20 +65,20 @@ def get_event_shopping_items(current_user, event_id):
             return error_response("ID événement invalide", 400)
         
         db = get_db()
-        event = db.events.find_one({"_id": ObjectId(event_id)})
-        if not event:
+        access = get_event_access(db, ObjectId(event_id), current_user['_id'])
+        if not access:
             return not_found_response("Événement non trouvé")
         
-        if ObjectId(current_user['_id']) not in event['participants']:
+        if not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
-        items = list(db.shopping_items.find({"event_id": ObjectId(event_id)}).sort("arrival_time", 1))
-        return success_response({"shopping_items": items})
+        items = db.shopping_items.find({"event_id": ObjectId(event_id)}).sort("arrival_time", 1)
+        return stream_response(items, "shopping_items")
     except Exception as e:
         return error_response(f"Erreur: {str(e)}", 500)
 
 @shopping_bp.route('/<item_id>', methods=['GET'])
-@token_required
+@token_claims_required
 def get_shopping_item(current_user, item_id):
     """Récupérer un item par son ID"""
     try:
@@ -88,8 +90,8 @@ def get_shopping_item(current_user, item_id):
         if not item:
             return not_found_response("Item non trouvé")
         
-        event = db.events.find_one({"_id": item['event_id']})
-        if ObjectId(current_user['_id']) not in event['participants']:
+        access = get_event_access(db, item['event_id'], current_user['_id'])
+        if not access or not access['is_participant']:
             return error_response("Accès non autorisé", 403)
         
         return success_response(item)
@@ -143,8 +145,8 @@ def delete_shopping_item(current_user, item_id):
             return not_found_response("Item non trouvé")
         
         # Vérifier que l'utilisateur est le créateur ou organisateur
-        event = db.events.find_one({"_id": item['event_id']})
-        if item['user_id'] != ObjectId(current_user['_id']) and ObjectId(current_user['_id']) not in event.get('organizers', []):
+        access = get_event_access(db, item['event_id'], current_user['_id'])
+        if item['user_id'] != ObjectId(current_user['_id']) and not (access and access['is_organizer']):
             return error_response("Vous ne pouvez supprimer que vos propres items", 403)
         
         db.shopping_items.delete_one({"_id": ObjectId(item_id)})
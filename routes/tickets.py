@@ -2,11 +2,19 @@ from flask import Blueprint, request
 from bson import ObjectId
 from datetime import datetime
 from utils import get_db, success_response, error_response, not_found_response, created_response
-from middleware import token_required, optional_token
-from validators import validate_ticket_type_create, validate_ticket_purchase
+from utils.streaming import stream_response
+from utils.pagination import parse_pagination_args
+from utils.memberships import EVENT, is_member
+from utils.response_cache import cached_response, mark_cacheable, invalidate_event_responses
+from middleware import token_required, token_claims_required, optional_token
+from pymongo import ReturnDocument
+from validators import validate_ticket_type_create, validate_ticket_purchase, validate_ticket_bulk_purchase
 
 tickets_bp = Blueprint('tickets', __name__, url_prefix='/api/tickets')
 
+# Tentatives d'une modification de quantité concurrente d'une autre modification
+QUANTITY_UPDATE_RETRIES = 5
+
 @tickets_bp.route('/types', methods=['POST'])
 @token_required
 def create_ticket_type(current_user):
@@ -46,6 +54,7 @@ def create_ticket_type(current_user):
         }
         
         result = db.ticket_types.insert_one(ticket_type_data)
+        invalidate_event_responses(event_id)
         ticket_type = db.ticket_types.find_one({"_id": result.inserted_id})
         
         return created_response(ticket_type, "Type de billet créé avec succès")
@@ -53,6 +62,7 @@ def create_ticket_type(current_user):
         return error_response(f"Erreur: {str(e)}", 500)
 
 @tickets_bp.route('/types/event/<event_id>', methods=['GET'])
+@cached_response('event_id')
 @optional_token
 def get_ticket_types(current_user, event_id):
     """Récupérer les types de billets d'un événement"""
@@ -61,17 +71,19 @@ def get_ticket_types(current_user, event_id):
             return error_response("ID événement invalide", 400)
         
         db = get_db()
-        event = db.events.find_one({"_id": ObjectId(event_id)})
+        event = db.events.find_one({"_id": ObjectId(event_id)}, {"is_private": 1})
         if not event:
             return not_found_response("Événement non trouvé")
         
         # Vérifier l'accès pour les événements privés
         if event.get('is_private'):
-            if not current_user or ObjectId(current_user['_id']) not in event['participants']:
+            if not current_user or not is_member(db, EVENT, event['_id'], current_user['_id']):
                 return error_response("Accès non autorisé à cet événement privé", 403)
+        else:
+            mark_cacheable()
         
-        ticket_types = list(db.ticket_types.find({"event_id": ObjectId(event_id)}))
-        return success_response({"ticket_types": ticket_types})
+        ticket_types = db.ticket_types.find({"event_id": ObjectId(event_id)})
+        return stream_response(ticket_types, "ticket_types")
     except Exception as e:
         return error_response(f"Erreur: {str(e)}", 500)
 
@@ -88,15 +100,46 @@ def get_ticket_type(current_user, ticket_type_id):
         if not ticket_type:
             return not_found_response("Type de billet non trouvé")
         
-        event = db.events.find_one({"_id": ticket_type['event_id']})
+        event = db.events.find_one({"_id": ticket_type['event_id']}, {"is_private": 1})
         if event.get('is_private'):
-            if not current_user or ObjectId(current_user['_id']) not in event['participants']:
+            if not current_user or not is_member(db, EVENT, event['_id'], current_user['_id']):
                 return error_response("Accès non autorisé", 403)
         
         return success_response(ticket_type)
     except Exception as e:
         return error_response(f"Erreur: {str(e)}", 500)
 
+def update_ticket_quantity(db, ticket_type, quantity, fields, retries=QUANTITY_UPDATE_RETRIES):
+    """
+    Applique une nouvelle quantité sous forme de delta sur quantity et remaining
+
+    La mise à jour est conditionnée à la quantité lue (une autre modification
+    la rejoue) et à un stock restant suffisant pour une baisse: un achat
+    concurrent n'est jamais écrasé et la quantité ne descend pas sous les
+    billets vendus.
+
+    Returns:
+        Réponse d'erreur, ou None si la mise à jour est appliquée
+    """
+    for _ in range(retries):
+        delta = quantity - ticket_type['quantity']
+        guard = {"_id": ticket_type['_id'], "quantity": ticket_type['quantity']}
+        if delta < 0:
+            guard["remaining"] = {"$gte": -delta}
+        
+        result = db.ticket_types.update_one(guard, {"$inc": {"quantity": delta, "remaining": delta}, "$set": fields})
+        if result.matched_count:
+            return None
+        
+        ticket_type = db.ticket_types.find_one({"_id": ticket_type['_id']}, {"quantity": 1, "remaining": 1})
+        if not ticket_type:
+            return not_found_response("Type de billet non trouvé")
+        sold = ticket_type['quantity'] - ticket_type['remaining']
+        if quantity < sold:
+            return error_response(f"Impossible de réduire la quantité en dessous de {sold} (billets déjà vendus)", 400)
+    
+    return error_response("Stock modifié simultanément, veuillez réessayer", 409)
+
 @tickets_bp.route('/types/<ticket_type_id>', methods=['PUT'])
 @token_required
 def update_ticket_type(current_user, ticket_type_id):
@@ -116,16 +159,20 @@ def update_ticket_type(current_user, ticket_type_id):
         if ObjectId(current_user['_id']) not in event['organizers']:
             return error_response("Seuls les organisateurs peuvent modifier les types de billets", 403)
         
-        # Ne pas permettre de réduire la quantité en dessous des billets vendus
-        if 'quantity' in data:
-            sold = ticket_type['quantity'] - ticket_type['remaining']
-            if data['quantity'] < sold:
-                return error_response(f"Impossible de réduire la quantité en dessous de {sold} (billets déjà vendus)", 400)
-            data['remaining'] = data['quantity'] - sold
-        
+        # Le stock restant n'est jamais écrit en valeur absolue (achats concurrents)
+        data.pop('remaining', None)
+        quantity = data.pop('quantity', None)
+        if quantity is not None and (not isinstance(quantity, int) or isinstance(quantity, bool) or quantity < 0):
+            return error_response("La quantité doit être un entier positif", 400)
         data['updated_at'] = datetime.utcnow()
         
-        db.ticket_types.update_one({"_id": ObjectId(ticket_type_id)}, {"$set": data})
+        if quantity is None:
+            db.ticket_types.update_one({"_id": ObjectId(ticket_type_id)}, {"$set": data})
+        else:
+            error = update_ticket_quantity(db, ticket_type, quantity, data)
+            if error:
+                return error
+        invalidate_event_responses(ticket_type['event_id'])
         updated_ticket_type = db.ticket_types.find_one({"_id": ObjectId(ticket_type_id)})
         
         return success_response(updated_ticket_type, "Type de billet mis à jour avec succès")
@@ -155,11 +202,82 @@ def delete_ticket_type(current_user, ticket_type_id):
             return error_response(f"Impossible de supprimer ce type de billet car {sold} billet(s) ont déjà été vendu(s)", 400)
         
         db.ticket_types.delete_one({"_id": ObjectId(ticket_type_id)})
+        invalidate_event_responses(ticket_type['event_id'])
         
         return success_response(None, "Type de billet supprimé avec succès")
     except Exception as e:
         return error_response(f"Erreur: {str(e)}", 500)
 
+def purchase_tickets(data, quantity):
+    """
+    Réserve puis émet `quantity` billets pour un même acheteur
+    
+    La réservation est un décrément conditionnel (remaining >= quantity):
+    deux achats concurrents ne peuvent pas vendre plus que le stock.
+    
+    Returns:
+        tuple: (billets, réponse d'erreur)
+    """
+    db = get_db()
+    ticket_type_id = ObjectId(data['ticket_type_id'])
+    
+    # Réserver les billets de manière atomique
+    ticket_type = db.ticket_types.find_one_and_update(
+        {"_id": ticket_type_id, "remaining": {"$gte": quantity}},
+        {"$inc": {"remaining": -quantity}},
+        projection={"name": 1, "price": 1, "event_id": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if not ticket_type:
+        if not db.ticket_types.find_one({"_id": ticket_type_id}, {"_id": 1}):
+            return None, not_found_response("Type de billet non trouvé")
+        if quantity == 1:
+            return None, error_response("Plus de billets disponibles pour ce type", 400)
+        return None, error_response(f"Pas assez de billets disponibles pour en acheter {quantity}", 400)
+    
+    def release():
+        db.ticket_types.update_one({"_id": ticket_type_id}, {"$inc": {"remaining": quantity}})
+    
+    # Vérifier que l'événement est public
+    event = db.events.find_one({"_id": ticket_type['event_id']}, {"is_private": 1})
+    if not event or event.get('is_private'):
+        release()
+        return None, error_response("Impossible d'acheter des billets pour un événement privé", 403)
+    
+    purchase_date = datetime.utcnow()
+    tickets = []
+    for _ in range(quantity):
+        ticket_id = ObjectId()
+        tickets.append({
+            "_id": ticket_id,
+            "ticket_type_id": ticket_type_id,
+            "ticket_type_name": ticket_type['name'],
+            "event_id": ticket_type['event_id'],
+            "buyer_first_name": data['buyer_first_name'],
+            "buyer_last_name": data['buyer_last_name'],
+            "buyer_email": data['buyer_email'],
+            "buyer_address": data['buyer_address'],
+            "price_paid": ticket_type['price'],
+            "purchase_date": purchase_date,
+            "ticket_number": f"T-{ticket_id}"  # Numéro de billet unique
+        })
+    
+    try:
+        if quantity == 1:
+            db.tickets.insert_one(tickets[0])
+        else:
+            db.tickets.insert_many(tickets)
+    except Exception:
+        # Annuler un achat partiel et rendre les billets au stock
+        db.tickets.delete_many({"_id": {"$in": [t['_id'] for t in tickets]}})
+        release()
+        raise
+    
+    # Le stock restant affiché par les types de billets a changé
+    invalidate_event_responses(ticket_type['event_id'])
+    
+    return tickets, None
+
 @tickets_bp.route('/purchase', methods=['POST'])
 def purchase_ticket():
     """Acheter un billet (route publique)"""
@@ -169,75 +287,172 @@ def purchase_ticket():
         if not is_valid:
             return error_response("Données invalides", 400, errors)
         
-        db = get_db()
-        ticket_type = db.ticket_types.find_one({"_id": ObjectId(data['ticket_type_id'])})
-        if not ticket_type:
-            return not_found_response("Type de billet non trouvé")
-        
-        if ticket_type['remaining'] <= 0:
-            return error_response("Plus de billets disponibles pour ce type", 400)
-        
-        # Vérifier que l'événement est public
-        event = db.events.find_one({"_id": ticket_type['event_id']})
-        if event.get('is_private'):
-            return error_response("Impossible d'acheter des billets pour un événement privé", 403)
+        if not ObjectId.is_valid(data['ticket_type_id']):
+            return error_response("ID type de billet invalide", 400)
         
-        ticket_data = {
-            "ticket_type_id": ObjectId(data['ticket_type_id']),
-            "ticket_type_name": ticket_type['name'],
-            "event_id": ticket_type['event_id'],
-            "buyer_first_name": data['buyer_first_name'],
-            "buyer_last_name": data['buyer_last_name'],
-            "buyer_email": data['buyer_email'],
-            "buyer_address": data['buyer_address'],
-            "price_paid": ticket_type['price'],
-            "purchase_date": datetime.utcnow(),
-            "ticket_number": f"T-{ObjectId()}"  # Générer un numéro de billet unique
-        }
+        tickets, error = purchase_tickets(data, 1)
+        if error:
+            return error
         
-        result = db.tickets.insert_one(ticket_data)
+        return created_response(tickets[0], "Billet acheté avec succès")
+    except Exception as e:
+        return error_response(f"Erreur: {str(e)}", 500)
+
+@tickets_bp.route('/purchase/bulk', methods=['POST'])
+def purchase_tickets_bulk():
+    """Acheter plusieurs billets pour un même acheteur (route publique)"""
+    try:
+        data = request.get_json()
+        is_valid, errors = validate_ticket_bulk_purchase(data)
+        if not is_valid:
+            return error_response("Données invalides", 400, errors)
         
-        # Décrémenter le nombre de billets restants
-        db.ticket_types.update_one(
-            {"_id": ObjectId(data['ticket_type_id'])},
-            {"$inc": {"remaining": -1}}
-        )
+        if not ObjectId.is_valid(data['ticket_type_id']):
+            return error_response("ID type de billet invalide", 400)
         
-        ticket = db.tickets.find_one({"_id": result.inserted_id})
+        tickets, error = purchase_tickets(data, data['quantity'])
+        if error:
+            return error
         
-        return created_response(ticket, "Billet acheté avec succès")
+        return created_response({
+            "tickets": tickets,
+            "quantity": len(tickets),
+            "total_price": sum(t['price_paid'] for t in tickets)
+        }, f"{len(tickets)} billet(s) acheté(s) avec succès")
     except Exception as e:
         return error_response(f"Erreur: {str(e)}", 500)
 
+# Champs retournés dans la liste des billets vendus (l'adresse reste consultable par billet)
+TICKET_LIST_PROJECTION = {
+    "ticket_number": 1,
+    "ticket_type_id": 1,
+    "ticket_type_name": 1,
+    "buyer_first_name": 1,
+    "buyer_last_name": 1,
+    "buyer_email": 1,
+    "price_paid": 1,
+    "purchase_date": 1
+}
+
+def ticket_sales_totals(db, event_id):
+    """Nombre de billets vendus et chiffre d'affaires, calculés par MongoDB"""
+    totals = list(db.tickets.aggregate([
+        {"$match": {"event_id": event_id}},
+        {"$group": {"_id": None, "total_sold": {"$sum": 1}, "total_revenue": {"$sum": "$price_paid"}}}
+    ]))
+    if not totals:
+        return {"total_sold": 0, "total_revenue": 0}
+    return {"total_sold": totals[0]['total_sold'], "total_revenue": totals[0]['total_revenue']}
+
+def ticket_sales_stats(db, event_id):
+    """Totaux, répartition par type de billet et histogramme des ventes par jour"""
+    result = list(db.tickets.aggregate([
+        {"$match": {"event_id": event_id}},
+        {"$facet": {
+            "totals": [
+                {"$group": {"_id": None, "total_sold": {"$sum": 1}, "total_revenue": {"$sum": "$price_paid"}}}
+            ],
+            "by_ticket_type": [
+                {"$group": {
+                    "_id": "$ticket_type_id",
+                    "name": {"$first": "$ticket_type_name"},
+                    "sold": {"$sum": 1},
+                    "revenue": {"$sum": "$price_paid"}
+                }},
+                {"$sort": {"sold": -1}}
+            ],
+            "by_day": [
+                {"$group": {
+                    "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$purchase_date"}},
+                    "sold": {"$sum": 1},
+                    "revenue": {"$sum": "$price_paid"}
+                }},
+                {"$sort": {"_id": 1}}
+            ]
+        }}
+    ]))[0]
+    
+    totals = result['totals'][0] if result['totals'] else {"total_sold": 0, "total_revenue": 0}
+    return {
+        "total_sold": totals['total_sold'],
+        "total_revenue": totals['total_revenue'],
+        "by_ticket_type": [
+            {"ticket_type_id": t['_id'], "name": t['name'], "sold": t['sold'], "revenue": t['revenue']}
+            for t in result['by_ticket_type']
+        ],
+        "by_day": [
+            {"date": d['_id'], "sold": d['sold'], "revenue": d['revenue']}
+            for d in result['by_day']
+        ]
+    }
+
 @tickets_bp.route('/event/<event_id>', methods=['GET'])
-@token_required
+@token_claims_required
 def get_event_tickets(current_user, event_id):
     """Récupérer les billets vendus pour un événement (organisateurs uniquement)"""
     try:
         if not ObjectId.is_valid(event_id):
             return error_response("ID événement invalide", 400)
         
+        # Pagination
+        try:
+            pagination = parse_pagination_args(request.args, default_per_page=50, max_per_page=200)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        page, per_page = pagination['page'], pagination['per_page']
+        skip = (page - 1) * per_page
+        
         db = get_db()
-        event = db.events.find_one({"_id": ObjectId(event_id)})
+        event = db.events.find_one({"_id": ObjectId(event_id)}, {"organizers": 1})
         if not event:
             return not_found_response("Événement non trouvé")
         
         if ObjectId(current_user['_id']) not in event['organizers']:
             return error_response("Seuls les organisateurs peuvent voir les billets vendus", 403)
         
-        tickets = list(db.tickets.find({"event_id": ObjectId(event_id)}).sort("purchase_date", -1))
+        # Calculer les statistiques côté MongoDB
+        totals = ticket_sales_totals(db, ObjectId(event_id))
         
-        # Calculer les statistiques
-        total_revenue = sum(t.get('price_paid', 0) for t in tickets)
+        tickets = (
+            db.tickets.find({"event_id": ObjectId(event_id)}, TICKET_LIST_PROJECTION)
+            .sort("purchase_date", -1)
+            .skip(skip)
+            .limit(per_page)
+        )
         
-        return success_response({
-            "tickets": tickets,
-            "total_sold": len(tickets),
-            "total_revenue": total_revenue
+        return stream_response(tickets, "tickets", extra={
+            "total_sold": totals['total_sold'],
+            "total_revenue": totals['total_revenue'],
+            "pagination": {
+                "page": page,
+                "per_page": per_page,
+                "total": totals['total_sold'],
+                "pages": (totals['total_sold'] + per_page - 1) // per_page
+            }
         })
     except Exception as e:
         return error_response(f"Erreur: {str(e)}", 500)
 
+@tickets_bp.route('/event/<event_id>/stats', methods=['GET'])
+@token_claims_required
+def get_event_ticket_stats(current_user, event_id):
+    """Statistiques de vente des billets d'un événement (organisateurs uniquement)"""
+    try:
+        if not ObjectId.is_valid(event_id):
+            return error_response("ID événement invalide", 400)
+        
+        db = get_db()
+        event = db.events.find_one({"_id": ObjectId(event_id)}, {"organizers": 1})
+        if not event:
+            return not_found_response("Événement non trouvé")
+        
+        if ObjectId(current_user['_id']) not in event['organizers']:
+            return error_response("Seuls les organisateurs peuvent voir les statistiques de vente", 403)
+        
+        return success_response(ticket_sales_stats(db, ObjectId(event_id)))
+    except Exception as e:
+        return error_response(f"Erreur: {str(e)}", 500)
+
 @tickets_bp.route('/<ticket_id>', methods=['GET'])
 def get_ticket(ticket_id):
     """Récupérer un billet par son ID (route publique pour vérification)"""
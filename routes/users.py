@@ -2,53 +2,66 @@ from flask import Blueprint, request
 from bson import ObjectId
 from datetime import datetime
 from utils import get_db, success_response, error_response, not_found_response
-from middleware import token_required
+from middleware import fresh_token_required, token_claims_required, invalidate_user
+from utils.pagination import parse_pagination_args, paginate
+from utils.batch import parse_ids, batch_result
+from utils.user_search import PRIVATE_USER_FIELDS, search_tokens, search_users
 from validators import validate_user_update
 
 users_bp = Blueprint('users', __name__, url_prefix='/api/users')
 
 @users_bp.route('', methods=['GET'])
-@token_required
+@token_claims_required
 def get_users(current_user):
     """Récupérer la liste des utilisateurs"""
     try:
         db = get_db()
         
-        # Pagination
-        page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 20))
-        skip = (page - 1) * per_page
+        # Pagination (curseur ou numéro de page)
+        try:
+            pagination = parse_pagination_args(request.args)
+        except ValueError as e:
+            return error_response(str(e), 400)
         
-        # Recherche optionnelle
+        # Recherche optionnelle: résultats classés par pertinence (pagination par page)
         search = request.args.get('search', '')
-        query = {}
         if search:
-            query = {
-                "$or": [
-                    {"first_name": {"$regex": search, "$options": "i"}},
-                    {"last_name": {"$regex": search, "$options": "i"}},
-                    {"email": {"$regex": search, "$options": "i"}}
-                ]
-            }
-        
-        users = list(db.users.find(query, {"password": 0}).skip(skip).limit(per_page))
-        total = db.users.count_documents(query)
+            if pagination['cursor']:
+                return error_response("La pagination par curseur n'est pas disponible avec search", 400)
+            users, pagination_meta = search_users(db, search, pagination)
+        else:
+            users, pagination_meta = paginate(db.users, {}, [("_id", 1)], pagination, PRIVATE_USER_FIELDS)
         
         return success_response({
             "users": users,
-            "pagination": {
-                "page": page,
-                "per_page": per_page,
-                "total": total,
-                "pages": (total + per_page - 1) // per_page
-            }
+            "pagination": pagination_meta
         })
         
+    except ValueError as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(f"Erreur lors de la récupération des utilisateurs: {str(e)}", 500)
+
+@users_bp.route('/batch', methods=['GET'])
+@token_claims_required
+def get_users_batch(current_user):
+    """Récupérer plusieurs utilisateurs par leurs IDs (?ids=id1,id2,...)"""
+    try:
+        try:
+            ids = parse_ids(request.args)
+        except ValueError as e:
+            return error_response(str(e), 400)
+        
+        db = get_db()
+        users = db.users.find({"_id": {"$in": ids}}, PRIVATE_USER_FIELDS)
+        
+        return success_response(batch_result("users", ids, users))
+        
     except Exception as e:
         return error_response(f"Erreur lors de la récupération des utilisateurs: {str(e)}", 500)
 
 @users_bp.route('/<user_id>', methods=['GET'])
-@token_required
+@token_claims_required
 def get_user(current_user, user_id):
     """Récupérer un utilisateur par son ID"""
     try:
@@ -56,7 +69,7 @@ def get_user(current_user, user_id):
             return error_response("ID utilisateur invalide", 400)
         
         db = get_db()
-        user = db.users.find_one({"_id": ObjectId(user_id)}, {"password": 0})
+        user = db.users.find_one({"_id": ObjectId(user_id)}, PRIVATE_USER_FIELDS)
         
         if not user:
             return not_found_response("Utilisateur non trouvé")
@@ -67,7 +80,7 @@ def get_user(current_user, user_id):
         return error_response(f"Erreur lors de la récupération de l'utilisateur: {str(e)}", 500)
 
 @users_bp.route('/<user_id>', methods=['PUT'])
-@token_required
+@fresh_token_required
 def update_user(current_user, user_id):
     """Mettre à jour un utilisateur"""
     try:
@@ -87,8 +100,10 @@ def update_user(current_user, user_id):
         
         db = get_db()
         
-        # Mettre à jour
+        # Mettre à jour (et les tokens de recherche si le nom change)
         data['updated_at'] = datetime.utcnow()
+        if 'first_name' in data or 'last_name' in data:
+            data['search_tokens'] = search_tokens({**current_user, **data})
         result = db.users.update_one(
             {"_id": ObjectId(user_id)},
             {"$set": data}
@@ -97,8 +112,10 @@ def update_user(current_user, user_id):
         if result.matched_count == 0:
             return not_found_response("Utilisateur non trouvé")
         
+        invalidate_user(user_id)
+        
         # Récupérer l'utilisateur mis à jour
-        user = db.users.find_one({"_id": ObjectId(user_id)}, {"password": 0})
+        user = db.users.find_one({"_id": ObjectId(user_id)}, PRIVATE_USER_FIELDS)
         
         return success_response(user, "Utilisateur mis à jour avec succès")
         
@@ -106,7 +123,7 @@ def update_user(current_user, user_id):
         return error_response(f"Erreur lors de la mise à jour: {str(e)}", 500)
 
 @users_bp.route('/<user_id>', methods=['DELETE'])
-@token_required
+@fresh_token_required
 def delete_user(current_user, user_id):
     """Supprimer un utilisateur"""
     try:
@@ -124,6 +141,8 @@ def delete_user(current_user, user_id):
         if result.deleted_count == 0:
             return not_found_response("Utilisateur non trouvé")
         
+        invalidate_user(user_id)
+        
         return success_response(None, "Utilisateur supprimé avec succès")
         
     except Exception as e:
@@ -1,4 +1,5 @@
 from .database import mongo, init_db, get_db, PyObjectId
+from .indexes import ensure_indexes, plan_indexes, IndexConflictError
 from .response import (
     success_response, 
     error_response, 
@@ -14,6 +15,9 @@ __all__ = [
     'init_db',
     'get_db',
     'PyObjectId',
+    'ensure_indexes',
+    'plan_indexes',
+    'IndexConflictError',
     'success_response',
     'error_response',
     'created_response',
@@ -0,0 +1,121 @@
+"""
+Contrôle d'accès aux événements
+
+`get_event_access` répond à "l'utilisateur X peut-il accéder à l'événement Y"
+sans charger le tableau `organizers` (participation lue dans la collection
+`memberships`), et garde le résultat en cache quand l'utilisateur est membre.
+Les routes albums, sondages, shopping, covoiturage et discussions l'utilisent
+à la place de `db.events.find_one` suivi d'un test `in`.
+
+Usage en ligne de commande (ajout de event_id aux anciennes photos):
+    python -m utils.access
+"""
+
+from bson import ObjectId
+from config import Config
+from .cache import TTLCache
+from .memberships import EVENT, is_member
+
+# Champs de l'événement exposés dans le résultat
+EVENT_ACCESS_FIELDS = ('is_private', 'has_ticketing', 'has_shopping_list', 'has_carpooling')
+
+# Clés (event_id, user_id) indexées par événement pour l'invalidation
+event_access_cache = TTLCache(Config.EVENT_ACCESS_CACHE_SIZE, Config.EVENT_ACCESS_CACHE_TTL,
+                              group_of=lambda key: key[0])
+
+
+def get_event_access(db, event_id, user_id):
+    """
+    Retourne les droits d'un utilisateur sur un événement
+
+    Returns:
+        dict: {"event_id", "is_participant", "is_organizer", "is_private",
+               "has_ticketing", "has_shopping_list", "has_carpooling"},
+              ou None si l'événement n'existe pas
+    """
+    event_id = ObjectId(event_id)
+    user_id = ObjectId(user_id)
+    key = (event_id, user_id)
+
+    access = event_access_cache.get(key)
+    if access is not None:
+        return access
+
+    projection = {field: 1 for field in EVENT_ACCESS_FIELDS}
+    projection["is_organizer"] = {"$in": [user_id, {"$ifNull": ["$organizers", []]}]}
+
+    result = list(db.events.aggregate([
+        {"$match": {"_id": event_id}},
+        {"$project": projection}
+    ]))
+    if not result:
+        return None
+
+    event = result[0]
+    access = {"event_id": event_id}
+    access.update({field: event.get(field, False) for field in EVENT_ACCESS_FIELDS})
+    access["is_participant"] = is_member(db, EVENT, event_id, user_id)
+    access["is_organizer"] = event['is_organizer']
+
+    # Seuls les accès accordés sont mis en cache: un utilisateur qui vient de
+    # rejoindre l'événement n'est jamais refusé à cause du cache.
+    if access['is_participant'] or access['is_organizer']:
+        event_access_cache.set(key, access)
+
+    return access
+
+
+def invalidate_event_access(event_id, user_id=None):
+    """Invalide les droits en cache pour un événement (et un utilisateur si précisé)"""
+    event_id = ObjectId(event_id)
+    if user_id is not None:
+        event_access_cache.invalidate((event_id, ObjectId(user_id)))
+    else:
+        event_access_cache.invalidate_group(event_id)
+
+
+def get_photo_event_id(db, photo):
+    """
+    Retourne l'event_id d'une photo
+
+    Les photos antérieures à la dénormalisation n'ont pas d'event_id: il est
+    alors lu depuis l'album puis enregistré sur la photo.
+    """
+    if photo.get('event_id'):
+        return photo['event_id']
+
+    album = db.albums.find_one({"_id": photo['album_id']}, {"event_id": 1})
+    if not album:
+        return None
+
+    db.photos.update_one({"_id": photo['_id']}, {"$set": {"event_id": album['event_id']}})
+    return album['event_id']
+
+
+def backfill_photo_event_ids(db):
+    """Ajoute event_id à toutes les photos qui n'en ont pas, album par album"""
+    updated = 0
+    for album_id in db.photos.distinct("album_id", {"event_id": {"$exists": False}}):
+        album = db.albums.find_one({"_id": album_id}, {"event_id": 1})
+        if album:
+            result = db.photos.update_many(
+                {"album_id": album_id, "event_id": {"$exists": False}},
+                {"$set": {"event_id": album['event_id']}}
+            )
+            updated += result.modified_count
+    return updated
+
+
+if __name__ == '__main__':
+    import argparse
+    from pymongo import MongoClient
+
+    parser = argparse.ArgumentParser(description="Ajoute event_id aux photos qui n'en ont pas")
+    parser.add_argument('--uri', default=Config.MONGO_URI, help="URI MongoDB (défaut: Config.MONGO_URI)")
+    args = parser.parse_args()
+
+    client = MongoClient(args.uri)
+    try:
+        print(f"✓ {backfill_photo_event_ids(client.get_default_database())} photo(s) mise(s) à jour")
+    finally:
+        client.close()
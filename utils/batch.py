@@ -0,0 +1,58 @@
+"""
+Endpoints batch ("multi-get")
+
+Un écran qui affiche plusieurs événements, utilisateurs ou photos les
+récupère en une requête HTTP (`GET .../batch?ids=id1,id2,...`) résolue par un
+seul `$in`, au lieu d'un appel par ressource. Chaque élément suit les mêmes
+règles d'accès que la route unitaire correspondante.
+
+Réponse: {"<ressource>": {id: document}, "not_found": [id], "forbidden": [id]}
+"""
+
+from bson import ObjectId
+from config import Config
+
+
+def parse_ids(args, limit=None):
+    """
+    Lit le paramètre `ids` (IDs séparés par des virgules, doublons ignorés)
+
+    Returns:
+        list: ObjectId dans l'ordre de la requête
+
+    Raises:
+        ValueError: si le paramètre est absent, contient un ID invalide ou trop d'IDs
+    """
+    limit = limit or Config.BATCH_MAX_IDS
+    raw_ids = [value.strip() for value in args.get('ids', '').split(',') if value.strip()]
+    if not raw_ids:
+        raise ValueError("Paramètre ids requis (IDs séparés par des virgules)")
+
+    ids = list(dict.fromkeys(raw_ids))
+    if len(ids) > limit:
+        raise ValueError(f"Trop d'IDs (maximum {limit})")
+
+    invalid = [value for value in ids if not ObjectId.is_valid(value)]
+    if invalid:
+        raise ValueError(f"ID invalide: {', '.join(invalid)}")
+
+    return [ObjectId(value) for value in ids]
+
+
+def batch_result(key, ids, docs, forbidden=()):
+    """
+    Construit la réponse d'un endpoint batch
+
+    Args:
+        key: Nom de la ressource ("events", "users", "photos")
+        ids: IDs demandés (ObjectId)
+        docs: Documents trouvés et accessibles
+        forbidden: IDs trouvés mais non accessibles
+    """
+    found = {doc['_id']: doc for doc in docs}
+    forbidden = set(forbidden)
+    return {
+        key: {str(doc_id): found[doc_id] for doc_id in ids if doc_id in found},
+        "not_found": [str(doc_id) for doc_id in ids if doc_id not in found and doc_id not in forbidden],
+        "forbidden": [str(doc_id) for doc_id in ids if doc_id in forbidden]
+    }
@@ -0,0 +1,102 @@
+"""
+Cache en mémoire borné (LRU) avec expiration (TTL)
+
+Propre à chaque processus: chaque entrée expire après un TTL, ce qui limite
+la durée pendant laquelle un autre worker peut servir une valeur périmée.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Cache LRU borné avec expiration (TTL), sûr entre threads
+
+    Avec `group_of` (fonction clé -> groupe), les clés de chaque groupe sont
+    indexées: `invalidate_group` ne parcourt que les entrées du groupe.
+    """
+
+    def __init__(self, max_size=1024, ttl=60, group_of=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.group_of = group_of
+        self._entries = OrderedDict()
+        self._groups = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_size > 0 and self.ttl > 0
+
+    def _remove(self, key):
+        """Retire une entrée et sa référence de groupe (verrou tenu par l'appelant)"""
+        if self._entries.pop(key, None) is None or self.group_of is None:
+            return
+        group = self.group_of(key)
+        keys = self._groups.get(group)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._groups[group]
+
+    def get(self, key):
+        """Retourne une copie de la valeur en cache, ou None"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+
+        # Copie: l'appelant peut modifier la valeur retournée
+        return copy.deepcopy(value)
+
+    def set(self, key, value):
+        """Ajoute ou remplace une valeur dans le cache"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            if self.group_of is not None:
+                self._groups.setdefault(self.group_of(key), set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, key):
+        """Retire une entrée du cache"""
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_group(self, group):
+        """Retire toutes les entrées d'un groupe (nécessite `group_of`)"""
+        with self._lock:
+            for key in list(self._groups.get(group, ())):
+                self._remove(key)
+
+    def invalidate_where(self, predicate):
+        """Retire toutes les entrées dont la clé vérifie `predicate` (parcourt tout le cache)"""
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                self._remove(key)
+
+    def clear(self):
+        """Vide le cache"""
+        with self._lock:
+            self._entries.clear()
+            self._groups.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,129 @@
+"""
+Tableau de bord d'un événement (GET /api/events/<event_id>/dashboard)
+
+Assemble en une requête les données affichées sur la page d'un événement:
+l'événement, ses albums, sondages, types de billets, shopping list et
+offres de covoiturage. Le contrôle d'accès est fait une seule fois
+(`get_event_access`), puis les sections sont lues en parallèle sur des
+threads propres à la requête (au plus DASHBOARD_WORKERS): la latence est
+celle de la section la plus lente au lieu de la somme des allers-retours, et
+une section n'attend jamais derrière celles d'autres requêtes. Les threads
+reçoivent une copie du contexte de requête (commandes attribuées à la route
+par le profileur).
+
+Chaque section applique la règle de sa route unitaire: les types de billets
+et l'événement sont visibles par tous sur un événement public, les autres
+sections sont réservées aux participants. Une section non autorisée est
+listée dans `forbidden`; une section en erreur ou trop lente
+(DASHBOARD_TIMEOUT) dans `errors`, sans faire échouer les autres. Le délai
+est aussi transmis à MongoDB (maxTimeMS): une requête trop lente est
+interrompue côté serveur et ne garde pas son thread occupé.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from bson import ObjectId
+from config import Config
+from .request_context import request_task
+
+# Règles d'accès des sections
+PUBLIC = "public"  # Événement visible (public, ou privé et membre)
+PARTICIPANTS = "participants"
+
+
+def _find_event(db, event_id, max_time_ms):
+    return db.events.find_one({"_id": event_id}, max_time_ms=max_time_ms)
+
+
+def _find_all(collection, sort=None):
+    def fetch(db, event_id, max_time_ms):
+        cursor = db[collection].find({"event_id": event_id}).max_time_ms(max_time_ms)
+        if sort:
+            cursor = cursor.sort(sort, 1)
+        return list(cursor)
+    return fetch
+
+
+# Section: (lecture, règle d'accès), mêmes clés que les routes unitaires
+SECTIONS = {
+    "event": (_find_event, PUBLIC),
+    "albums": (_find_all("albums"), PARTICIPANTS),
+    "polls": (_find_all("polls"), PARTICIPANTS),
+    "ticket_types": (_find_all("ticket_types"), PUBLIC),
+    "shopping_items": (_find_all("shopping_items", "arrival_time"), PARTICIPANTS),
+    "carpooling_offers": (_find_all("carpooling", "departure_time"), PARTICIPANTS)
+}
+
+
+def parse_sections(args):
+    """
+    Lit le paramètre `sections` (noms séparés par des virgules, toutes par défaut)
+
+    Raises:
+        ValueError: si une section est inconnue
+    """
+    value = args.get('sections', '').strip()
+    if not value:
+        return list(SECTIONS)
+
+    sections = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    unknown = [name for name in sections if name not in SECTIONS]
+    if unknown:
+        raise ValueError(f"Section(s) inconnue(s): {', '.join(unknown)} (disponibles: {', '.join(SECTIONS)})")
+    return sections
+
+
+class DashboardLoader:
+    """Lecture parallèle des sections sur des threads propres à chaque requête"""
+
+    def __init__(self, workers=8, timeout=5):
+        self.workers = workers
+        self.timeout = timeout
+
+    def load(self, db, event_id, access, sections):
+        """
+        Lit les sections autorisées (à appeler dans le contexte de la requête)
+
+        Args:
+            access: Résultat de get_event_access (is_participant suffit)
+            sections: Noms des sections demandées
+
+        Returns:
+            dict: {section: données, ..., "forbidden": [...], "errors": {...}}
+        """
+        event_id = ObjectId(event_id)
+        result = {"forbidden": [], "errors": {}}
+
+        tasks = {}
+        for name in sections:
+            fetch, rule = SECTIONS[name]
+            if rule == PARTICIPANTS and not access['is_participant']:
+                result["forbidden"].append(name)
+                continue
+            tasks[name] = request_task(fetch)
+        if not tasks:
+            return result
+
+        # Pool dédié à la requête: le délai ne compte pas d'attente derrière d'autres requêtes
+        executor = ThreadPoolExecutor(max_workers=min(self.workers, len(tasks)), thread_name_prefix='dashboard')
+        try:
+            max_time_ms = int(self.timeout * 1000)
+            futures = {executor.submit(task, db, event_id, max_time_ms): name for name, task in tasks.items()}
+            done, pending = wait(futures, timeout=self.timeout)
+        finally:
+            # Les lectures en cours sont interrompues par MongoDB (maxTimeMS)
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for future in pending:
+            result["errors"][futures[future]] = "Délai dépassé"
+        for future in done:
+            name = futures[future]
+            try:
+                result[name] = future.result()
+            except Exception as e:
+                result["errors"][name] = str(e)
+
+        return result
+
+
+dashboard_loader = DashboardLoader(workers=Config.DASHBOARD_WORKERS, timeout=Config.DASHBOARD_TIMEOUT)
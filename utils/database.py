@@ -1,11 +1,44 @@
 from flask_pymongo import PyMongo
 from bson import ObjectId
+from .pool_monitor import pool_monitor
 
 mongo = PyMongo()
 
+def client_options(config):
+    """Options du MongoClient (pool, compression, préférence de lecture) issues de la configuration"""
+    options = {
+        "maxPoolSize": config.get('MONGO_MAX_POOL_SIZE', 100),
+        "minPoolSize": config.get('MONGO_MIN_POOL_SIZE', 0),
+        "readPreference": config.get('MONGO_READ_PREFERENCE', 'primary'),
+        "event_listeners": [pool_monitor]
+    }
+    if config.get('MONGO_MAX_IDLE_TIME_MS'):
+        options["maxIdleTimeMS"] = config['MONGO_MAX_IDLE_TIME_MS']
+    if config.get('MONGO_WAIT_QUEUE_TIMEOUT_MS'):
+        options["waitQueueTimeoutMS"] = config['MONGO_WAIT_QUEUE_TIMEOUT_MS']
+    if config.get('MONGO_COMPRESSORS'):
+        options["compressors"] = config['MONGO_COMPRESSORS']
+    if config.get('QUERY_PROFILER_ENABLED'):
+        from .query_profiler import query_profiler
+        options["event_listeners"].append(query_profiler)
+    return options
+
 def init_db(app):
     """Initialise la connexion à la base de données"""
-    mongo.init_app(app)
+    mongo.init_app(app, **client_options(app.config))
+    
+    # Créer les index déclarés par les modèles
+    if app.config.get('AUTO_CREATE_INDEXES'):
+        from .indexes import ensure_indexes, IndexConflictError
+        try:
+            report = ensure_indexes(mongo.db)
+            created = sum(1 for entry in report if entry['status'] == "created")
+            print(f"✓ Index MongoDB synchronisés ({created} créé(s))")
+        except IndexConflictError:
+            raise
+        except Exception as e:
+            print(f"⚠ Index MongoDB non synchronisés: {e}")
+    
     return mongo
 
 def get_db():
@@ -0,0 +1,146 @@
+"""
+Recherche d'événements (GET /api/events)
+
+Filtres combinables avec la visibilité (événements publics + ceux dont
+l'utilisateur est membre):
+  - q             recherche plein texte sur name, description et location
+                  (index texte `events_text`, pondéré, langue française)
+  - from / to     fenêtre sur start_date (bornes de l'index composé)
+  - ends_before   borne supérieure sur end_date
+  - location      sous-chaîne du lieu, insensible à la casse
+  - group_id
+  - near, max_distance, within   recherche géographique sur location_point
+                  (index 2dsphere, voir utils.geo)
+
+Les index composés (is_private, start_date, _id) et (group_id, is_private,
+start_date, _id) servent la branche publique du `$or` de visibilité, la
+fenêtre de dates et le tri de la pagination par curseur. Avec `q`, le tri
+`sort=relevance` classe par score texte; avec `near`, les résultats sont
+triés par distance (pagination par page uniquement dans les deux cas).
+"""
+
+import re
+from datetime import datetime
+
+from bson import ObjectId
+from .geo import within_filter
+
+SORT_DATE = "date"
+SORT_RELEVANCE = "relevance"
+SORT_DISTANCE = "distance"
+SORTS = (SORT_DATE, SORT_RELEVANCE, SORT_DISTANCE)
+
+GEO_FIELD = "location_point"
+
+DATE_SORT_FIELDS = [("start_date", 1), ("_id", 1)]
+
+
+def parse_date(value, name):
+    """
+    Lit une date ISO 8601 passée en paramètre
+
+    Raises:
+        ValueError: si la date est invalide
+    """
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"Paramètre {name} invalide (date ISO 8601 attendue)")
+
+
+def build_event_query(args, visibility, geo=None):
+    """
+    Construit le filtre de recherche à partir des paramètres de la requête
+
+    Args:
+        args: Paramètres de la requête (request.args)
+        visibility: Filtre de visibilité de l'utilisateur
+        geo: Résultat de utils.geo.parse_geo_args (within est ajouté au filtre)
+
+    Returns:
+        dict: Filtre MongoDB
+
+    Raises:
+        ValueError: si un paramètre est invalide
+    """
+    query = dict(visibility)
+
+    if args.get('group_id'):
+        if not ObjectId.is_valid(args['group_id']):
+            raise ValueError("ID groupe invalide")
+        query['group_id'] = ObjectId(args['group_id'])
+
+    start_range = {}
+    if args.get('from'):
+        start_range['$gte'] = parse_date(args['from'], 'from')
+    if args.get('to'):
+        start_range['$lte'] = parse_date(args['to'], 'to')
+    if start_range:
+        query['start_date'] = start_range
+
+    if args.get('ends_before'):
+        query['end_date'] = {"$lte": parse_date(args['ends_before'], 'ends_before')}
+
+    location = args.get('location', '').strip()
+    if location:
+        query['location'] = {"$regex": re.escape(location), "$options": "i"}
+
+    text = args.get('q', '').strip()
+    if text:
+        query['$text'] = {"$search": text}
+
+    if geo and geo['within']:
+        query.update(within_filter(GEO_FIELD, geo['within']))
+
+    return query
+
+
+def parse_sort(args, query, geo=None):
+    """
+    Ordre des résultats: chronologique (défaut), pertinence (avec q) ou distance (avec near, défaut)
+
+    Raises:
+        ValueError: si l'ordre est inconnu ou incompatible avec les paramètres
+    """
+    near = bool(geo and geo['near'])
+    sort = args.get('sort', SORT_DISTANCE if near else SORT_DATE)
+    if sort not in SORTS:
+        raise ValueError(f"Paramètre sort invalide ({', '.join(SORTS)})")
+    if near != (sort == SORT_DISTANCE):
+        raise ValueError("Le tri par distance nécessite near, et near implique le tri par distance")
+    if near and '$text' in query:
+        raise ValueError("Les paramètres q et near ne peuvent pas être combinés")
+    if sort == SORT_RELEVANCE:
+        if '$text' not in query:
+            raise ValueError("Le tri par pertinence nécessite le paramètre q")
+        if args.get('cursor'):
+            raise ValueError("La pagination par curseur n'est pas disponible avec sort=relevance")
+    return sort
+
+
+def search_by_relevance(collection, query, pagination):
+    """
+    Page de résultats classés par score texte
+
+    Returns:
+        tuple: (documents, bloc "pagination" de la réponse)
+    """
+    per_page = pagination['per_page']
+    page = pagination['page']
+    score = {"score": {"$meta": "textScore"}}
+
+    docs = list(
+        collection.find(query, score)
+        .sort([("score", {"$meta": "textScore"}), ("_id", 1)])
+        .skip((page - 1) * per_page)
+        .limit(per_page + 1)
+    )
+    has_more = len(docs) > per_page
+
+    meta = {"per_page": per_page, "has_more": has_more, "next_cursor": None, "page": page}
+    if pagination['include_total']:
+        total = collection.count_documents(query)
+        meta["total"] = total
+        meta["pages"] = (total + per_page - 1) // per_page
+
+    return docs[:per_page], meta
@@ -0,0 +1,163 @@
+"""
+Recherche géographique (points GeoJSON, index 2dsphere)
+
+Les événements (`location_point`) et les offres de covoiturage
+(`departure_point`) peuvent porter un point GeoJSON
+{"type": "Point", "coordinates": [longitude, latitude]}. Les documents sans
+point ne sont pas indexés et n'apparaissent pas dans les recherches
+géographiques.
+
+Paramètres de requête communs:
+  - near=<lng>,<lat>                       tri par distance croissante
+  - max_distance=<mètres>                  rayon maximum autour de near
+  - within=<lng_min>,<lat_min>,<lng_max>,<lat_max>   rectangle (ex: vue carte)
+
+Le tri par distance passe par l'étape d'agrégation `$geoNear`, qui ajoute
+le champ `distance` (en mètres) à chaque document.
+"""
+
+EARTH_RADIUS_METERS = 6378100
+
+
+def geojson_point(value):
+    """Normalise un point GeoJSON validé (coordonnées en float), None si absent"""
+    if not value:
+        return None
+    longitude, latitude = value['coordinates']
+    return {"type": "Point", "coordinates": [float(longitude), float(latitude)]}
+
+
+def _parse_floats(value, count, name):
+    try:
+        numbers = [float(part) for part in value.split(',')]
+    except ValueError:
+        numbers = []
+    if len(numbers) != count:
+        raise ValueError(f"Paramètre {name} invalide")
+    return numbers
+
+
+def parse_point(value, name="near"):
+    """
+    Lit un point "<lng>,<lat>"
+
+    Raises:
+        ValueError: si le point est invalide
+    """
+    longitude, latitude = _parse_floats(value, 2, name)
+    if not -180 <= longitude <= 180 or not -90 <= latitude <= 90:
+        raise ValueError(f"Paramètre {name} hors bornes (longitude -180..180, latitude -90..90)")
+    return [longitude, latitude]
+
+
+def parse_box(value, name="within"):
+    """
+    Lit un rectangle "<lng_min>,<lat_min>,<lng_max>,<lat_max>" et le convertit en polygone GeoJSON
+
+    Raises:
+        ValueError: si le rectangle est invalide
+    """
+    min_lng, min_lat, max_lng, max_lat = _parse_floats(value, 4, name)
+    parse_point(f"{min_lng},{min_lat}", name)
+    parse_point(f"{max_lng},{max_lat}", name)
+    if min_lng >= max_lng or min_lat >= max_lat:
+        raise ValueError(f"Paramètre {name} invalide (coin sud-ouest puis coin nord-est)")
+    return {
+        "type": "Polygon",
+        "coordinates": [[
+            [min_lng, min_lat], [max_lng, min_lat], [max_lng, max_lat], [min_lng, max_lat], [min_lng, min_lat]
+        ]]
+    }
+
+
+def parse_geo_args(args):
+    """
+    Lit les paramètres near, max_distance et within
+
+    Returns:
+        dict: {"near": [lng, lat] | None, "max_distance": float | None, "within": polygone | None}
+
+    Raises:
+        ValueError: si un paramètre est invalide ou si near et within sont combinés
+    """
+    near = parse_point(args['near']) if args.get('near') else None
+    within = parse_box(args['within']) if args.get('within') else None
+
+    max_distance = None
+    if args.get('max_distance'):
+        try:
+            max_distance = float(args['max_distance'])
+        except ValueError:
+            raise ValueError("Paramètre max_distance invalide")
+        if max_distance <= 0:
+            raise ValueError("Paramètre max_distance invalide")
+        if near is None:
+            raise ValueError("Le paramètre max_distance nécessite near")
+
+    if near and within:
+        raise ValueError("Les paramètres near et within ne peuvent pas être combinés")
+
+    return {"near": near, "max_distance": max_distance, "within": within}
+
+
+def within_filter(field, polygon):
+    """Filtre des documents dont le point est dans le polygone"""
+    return {field: {"$geoWithin": {"$geometry": polygon}}}
+
+
+def near_pipeline(field, point, query, max_distance=None, skip=0, limit=None):
+    """Pipeline d'agrégation triant les documents par distance au point"""
+    geo_near = {
+        "near": {"type": "Point", "coordinates": point},
+        "key": field,
+        "distanceField": "distance",
+        "spherical": True,
+        "query": query
+    }
+    if max_distance is not None:
+        geo_near["maxDistance"] = max_distance
+
+    pipeline = [{"$geoNear": geo_near}]
+    if skip:
+        pipeline.append({"$skip": skip})
+    if limit is not None:
+        pipeline.append({"$limit": limit})
+    return pipeline
+
+
+def count_near(collection, field, point, query, max_distance=None):
+    """Nombre de documents renvoyés par near_pipeline (sans tri)"""
+    if max_distance is None:
+        area = {field: {"$exists": True, "$ne": None}}
+    else:
+        area = {field: {"$geoWithin": {"$centerSphere": [point, max_distance / EARTH_RADIUS_METERS]}}}
+    return collection.count_documents({"$and": [query, area]} if query else area)
+
+
+def paginate_near(collection, field, point, query, pagination, max_distance=None):
+    """
+    Page de résultats triés par distance (pagination par page uniquement)
+
+    Returns:
+        tuple: (documents avec `distance` en mètres, bloc "pagination" de la réponse)
+
+    Raises:
+        ValueError: si un curseur est fourni
+    """
+    if pagination['cursor']:
+        raise ValueError("La pagination par curseur n'est pas disponible avec near")
+
+    per_page = pagination['per_page']
+    page = pagination['page']
+    docs = list(collection.aggregate(
+        near_pipeline(field, point, query, max_distance, skip=(page - 1) * per_page, limit=per_page + 1)
+    ))
+    has_more = len(docs) > per_page
+
+    meta = {"per_page": per_page, "has_more": has_more, "next_cursor": None, "page": page}
+    if pagination['include_total']:
+        total = count_near(collection, field, point, query, max_distance)
+        meta["total"] = total
+        meta["pages"] = (total + per_page - 1) // per_page
+
+    return docs[:per_page], meta
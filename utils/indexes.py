@@ -0,0 +1,216 @@
+"""
+Réconciliation des index MongoDB
+
+Lit les déclarations `indexes()` de chaque modèle, les compare aux index
+existants des collections et crée ceux qui manquent.
+
+Usage en ligne de commande:
+    python -m utils.indexes            # Crée les index manquants
+    python -m utils.indexes --dry-run  # Affiche le rapport sans rien créer
+"""
+
+from pymongo import IndexModel
+
+# Options d'index prises en compte lors de la comparaison avec l'existant
+COMPARED_OPTIONS = ('unique', 'sparse', 'expireAfterSeconds', 'partialFilterExpression')
+
+
+class IndexConflictError(Exception):
+    """Levée quand un index déclaré est incompatible avec un index existant ou déclaré"""
+    pass
+
+
+def normalize_keys(key):
+    """Convertit la clé déclarée ("champ" ou [("champ", 1), ...]) en liste de tuples"""
+    if isinstance(key, str):
+        return [(key, 1)]
+    return [(field, direction) for field, direction in key]
+
+
+def index_name(keys):
+    """Nom par défaut d'un index, identique à celui généré par MongoDB"""
+    return "_".join(f"{field}_{direction}" for field, direction in keys)
+
+
+def is_text_index(keys):
+    """Indique si l'index est un index texte"""
+    return any(direction == 'text' for _, direction in keys)
+
+
+def declared_indexes(models=None):
+    """
+    Retourne les index déclarés par les modèles, regroupés par collection
+
+    Returns:
+        dict: {collection: [{"name", "keys", "options"}, ...]}
+
+    Raises:
+        IndexConflictError: si deux déclarations portent le même nom avec des spécifications différentes
+    """
+    if models is None:
+        import models as models_module
+        models = [getattr(models_module, name) for name in models_module.__all__]
+
+    declared = {}
+    for model in models:
+        collection = getattr(model, 'collection', None)
+        if not collection or not hasattr(model, 'indexes'):
+            continue
+
+        specs = declared.setdefault(collection, [])
+        for spec in model.indexes():
+            spec = dict(spec)
+            keys = normalize_keys(spec.pop('key'))
+            name = spec.pop('name', None) or index_name(keys)
+            entry = {"name": name, "keys": keys, "options": spec}
+
+            duplicate = next((s for s in specs if s['name'] == name), None)
+            if duplicate:
+                if duplicate['keys'] != keys or duplicate['options'] != spec:
+                    raise IndexConflictError(
+                        f"{collection}.{name}: déclarations contradictoires ({duplicate} / {entry})"
+                    )
+                continue
+            specs.append(entry)
+
+    return declared
+
+
+def _options_conflict(declared_options, existing):
+    """Retourne la liste des options qui diffèrent entre la déclaration et l'index existant"""
+    differences = []
+    for option in COMPARED_OPTIONS:
+        wanted = declared_options.get(option)
+        current = existing.get(option)
+        # unique/sparse absents équivalent à False
+        if option in ('unique', 'sparse'):
+            wanted, current = bool(wanted), bool(current)
+        if wanted != current:
+            differences.append(option)
+    return differences
+
+
+def plan_indexes(db, declared=None):
+    """
+    Compare les index déclarés aux index existants
+
+    Returns:
+        list: une entrée par index déclaré avec son statut
+              ("present", "missing" ou "conflict")
+    """
+    if declared is None:
+        declared = declared_indexes()
+
+    existing_collections = set(db.list_collection_names())
+    report = []
+
+    for collection, specs in declared.items():
+        existing = db[collection].index_information() if collection in existing_collections else {}
+        by_keys = {tuple(info['key']): name for name, info in existing.items()}
+
+        for spec in specs:
+            entry = {
+                "collection": collection,
+                "name": spec['name'],
+                "keys": spec['keys'],
+                "options": spec['options'],
+                "status": "missing"
+            }
+
+            current_name = spec['name'] if spec['name'] in existing else by_keys.get(tuple(spec['keys']))
+            if current_name:
+                current = existing[current_name]
+                # Les index texte sont stockés avec des clés internes (_fts, _ftsx)
+                keys_differ = not is_text_index(spec['keys']) and list(current['key']) != spec['keys']
+                differences = _options_conflict(spec['options'], current)
+                if keys_differ:
+                    differences.insert(0, 'key')
+
+                if differences:
+                    entry['status'] = "conflict"
+                    entry['existing'] = current_name
+                    entry['differences'] = differences
+                else:
+                    entry['status'] = "present"
+
+            report.append(entry)
+
+    return report
+
+
+def ensure_indexes(db, dry_run=False, declared=None):
+    """
+    Crée les index manquants déclarés par les modèles
+
+    Args:
+        db: Base de données PyMongo
+        dry_run: Si True, ne crée rien et retourne uniquement le rapport
+
+    Returns:
+        list: Rapport de réconciliation (les index créés ont le statut "created")
+
+    Raises:
+        IndexConflictError: si un index existant est incompatible avec sa déclaration
+    """
+    report = plan_indexes(db, declared)
+
+    conflicts = [entry for entry in report if entry['status'] == "conflict"]
+    if conflicts:
+        details = ", ".join(
+            f"{c['collection']}.{c['name']} ({', '.join(c['differences'])} ≠ {c['existing']})" for c in conflicts
+        )
+        raise IndexConflictError(f"Index en conflit: {details}")
+
+    if dry_run:
+        return report
+
+    missing_by_collection = {}
+    for entry in report:
+        if entry['status'] == "missing":
+            missing_by_collection.setdefault(entry['collection'], []).append(entry)
+
+    for collection, entries in missing_by_collection.items():
+        db[collection].create_indexes([
+            IndexModel(entry['keys'], name=entry['name'], background=True, **entry['options'])
+            for entry in entries
+        ])
+        for entry in entries:
+            entry['status'] = "created"
+
+    return report
+
+
+def format_report(report):
+    """Formate le rapport de réconciliation pour l'affichage"""
+    symbols = {"present": "✓", "created": "+", "missing": "·", "conflict": "✗"}
+    lines = []
+    for entry in report:
+        lines.append(f" {symbols[entry['status']]} {entry['collection']}.{entry['name']} [{entry['status']}]")
+    summary = {status: sum(1 for e in report if e['status'] == status) for status in symbols}
+    lines.append(" " + ", ".join(f"{count} {status}" for status, count in summary.items() if count))
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+    from pymongo import MongoClient
+    from config import Config
+
+    parser = argparse.ArgumentParser(description="Crée les index MongoDB déclarés par les modèles")
+    parser.add_argument('--dry-run', action='store_true', help="Afficher le rapport sans créer d'index")
+    parser.add_argument('--uri', default=Config.MONGO_URI, help="URI MongoDB (défaut: Config.MONGO_URI)")
+    args = parser.parse_args()
+
+    client = MongoClient(args.uri)
+    try:
+        report = ensure_indexes(client.get_default_database(), dry_run=args.dry_run)
+    except IndexConflictError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    finally:
+        client.close()
+
+    print(format_report(report))
+    if args.dry_run and any(entry['status'] == "missing" for entry in report):
+        sys.exit(2)
@@ -0,0 +1,60 @@
+"""
+Sérialisation JSON des documents MongoDB
+
+`MongoJSONProvider` remplace le provider JSON de Flask: `ObjectId` et
+`datetime` sont convertis par l'encodeur lui-même, pendant l'unique passe
+d'encodage, au lieu d'un parcours préalable des documents (`serialize_doc`).
+Si la bibliothèque optionnelle `orjson` est installée (et JSON_USE_ORJSON
+activé), elle est utilisée pour l'encodage.
+"""
+
+import json
+from datetime import datetime
+from bson import ObjectId
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+
+def mongo_default(o):
+    """Conversion des types non natifs JSON (ObjectId, datetime, puis types gérés par Flask)"""
+    if isinstance(o, ObjectId):
+        return str(o)
+    if isinstance(o, datetime):
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
+
+
+class MongoJSONProvider(DefaultJSONProvider):
+    """Provider JSON de l'application, en une seule passe"""
+
+    default = staticmethod(mongo_default)
+    use_orjson = orjson is not None
+
+    def dumps(self, obj, **kwargs):
+        if self.use_orjson and not kwargs.get('cls'):
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+            if kwargs.get('sort_keys', self.sort_keys):
+                option |= orjson.OPT_SORT_KEYS
+            if kwargs.get('indent'):
+                option |= orjson.OPT_INDENT_2
+            try:
+                return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode('utf-8')
+            except orjson.JSONEncodeError:
+                # Entiers hors 64 bits, etc.: encodeur standard
+                pass
+
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+
+def init_json(app):
+    """Installe le provider JSON sur l'application"""
+    app.json_provider_class = MongoJSONProvider
+    app.json = MongoJSONProvider(app)
+    app.json.use_orjson = orjson is not None and app.config.get('JSON_USE_ORJSON', True)
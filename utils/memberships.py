@@ -0,0 +1,317 @@
+"""
+Appartenance aux événements et aux groupes
+
+Les participants d'un événement et les membres d'un groupe sont stockés dans
+la collection `memberships` (un document par couple cible/utilisateur) au
+lieu des tableaux `events.participants` et `groups.members`. Les documents
+des cibles ne gardent qu'un compteur (`participants_count`, `members_count`)
+et les listes courtes `organizers` / `administrators`. Chaque adhésion
+recopie la visibilité de sa cible (`private`): les listes ne lisent que les
+adhésions aux cibles non publiques pour compléter leur filtre de visibilité.
+
+Pendant la migration d'une base existante, et seulement sur activation
+explicite (MEMBERSHIP_EMBEDDED_ARRAYS=True), les tableaux sont encore
+alimentés à chaque écriture et consultés quand aucune adhésion n'est trouvée.
+Une fois `migrate_embedded` exécuté, l'option est désactivée (défaut).
+
+Usage en ligne de commande (copie des tableaux existants vers memberships):
+    python -m utils.memberships
+    python -m utils.memberships --drop-arrays   # Supprime ensuite les tableaux
+"""
+
+from datetime import datetime
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from config import Config
+from .pagination import paginate
+
+EVENT = "event"
+GROUP = "group"
+
+# Par type de cible: collection, tableau embarqué des membres, liste des
+# responsables, compteur, rôles (membre, responsable), filtre des cibles non
+# publiques (recopié dans le champ `private` des adhésions)
+TARGETS = {
+    EVENT: {
+        "collection": "events",
+        "members": "participants",
+        "managers": "organizers",
+        "count": "participants_count",
+        "roles": ("participant", "organizer"),
+        "private": {"is_private": True}
+    },
+    GROUP: {
+        "collection": "groups",
+        "members": "members",
+        "managers": "administrators",
+        "count": "members_count",
+        "roles": ("member", "administrator"),
+        "private": {"group_type": {"$ne": "public"}}
+    }
+}
+
+MEMBER_FIELDS = {"_id": 1, "user_id": 1, "role": 1, "joined_at": 1}
+
+
+def _embedded_arrays():
+    return Config.MEMBERSHIP_EMBEDDED_ARRAYS
+
+
+def _membership_filter(target_type, target_id, user_id):
+    return {"target_type": target_type, "target_id": ObjectId(target_id), "user_id": ObjectId(user_id)}
+
+
+def is_private_target(target_type, doc):
+    """Indique si la cible (document avec is_private / group_type) n'est pas publique"""
+    if target_type == EVENT:
+        return bool(doc.get('is_private'))
+    return doc.get('group_type', 'public') != 'public'
+
+
+def _target_private(db, target_type, target_id):
+    target = TARGETS[target_type]
+    doc = db[target['collection']].find_one({"_id": ObjectId(target_id)}, {"is_private": 1, "group_type": 1})
+    return is_private_target(target_type, doc or {})
+
+
+def add_members(db, target_type, target_id, roles, joined_at=None, private=None):
+    """
+    Ajoute des membres à une cible (les adhésions existantes sont conservées)
+
+    Args:
+        roles: dict {user_id: rôle}
+        joined_at: Date d'adhésion (défaut: maintenant)
+        private: Cible non publique (défaut: lu dans le document de la cible)
+
+    Returns:
+        list: ObjectId des utilisateurs effectivement ajoutés
+    """
+    target = TARGETS[target_type]
+    target_id = ObjectId(target_id)
+    user_ids = [ObjectId(user_id) for user_id in roles]
+    if not user_ids:
+        return []
+
+    joined_at = joined_at or datetime.utcnow()
+    if private is None:
+        private = _target_private(db, target_type, target_id)
+    operations = [
+        UpdateOne(
+            _membership_filter(target_type, target_id, user_id),
+            {"$setOnInsert": {"role": roles[key], "joined_at": joined_at, "private": private}},
+            upsert=True
+        )
+        for key, user_id in zip(roles, user_ids)
+    ]
+
+    try:
+        upserted = db.memberships.bulk_write(operations, ordered=False).upserted_ids
+    except BulkWriteError as e:
+        # Deux ajouts concurrents du même utilisateur: l'index unique rejette le second
+        if any(error.get('code') != 11000 for error in e.details.get('writeErrors', [])):
+            raise
+        upserted = {item['index']: item['_id'] for item in e.details.get('upserted', [])}
+
+    added = [user_ids[index] for index in sorted(upserted)]
+    if added:
+        update = {"$inc": {target['count']: len(added)}}
+        if _embedded_arrays():
+            update["$addToSet"] = {target['members']: {"$each": added}}
+        db[target['collection']].update_one({"_id": target_id}, update)
+    return added
+
+
+def add_member(db, target_type, target_id, user_id, role=None, private=None):
+    """
+    Ajoute un membre à une cible
+
+    Returns:
+        bool: False si l'utilisateur était déjà membre
+    """
+    if get_membership(db, target_type, target_id, user_id):
+        return False
+    role = role or TARGETS[target_type]['roles'][0]
+    return bool(add_members(db, target_type, target_id, {user_id: role}, private=private))
+
+
+def remove_member(db, target_type, target_id, user_id):
+    """
+    Retire un membre d'une cible
+
+    Returns:
+        bool: True si une adhésion a été supprimée
+    """
+    target = TARGETS[target_type]
+    result = db.memberships.delete_one(_membership_filter(target_type, target_id, user_id))
+
+    update = {}
+    if result.deleted_count:
+        update["$inc"] = {target['count']: -1}
+    if _embedded_arrays():
+        update["$pull"] = {target['members']: ObjectId(user_id)}
+    if update:
+        db[target['collection']].update_one({"_id": ObjectId(target_id)}, update)
+    return bool(result.deleted_count)
+
+
+def get_membership(db, target_type, target_id, user_id):
+    """
+    Retourne l'adhésion d'un utilisateur à une cible, ou None
+
+    En mode compatibilité, une cible non migrée est consultée via son tableau
+    embarqué (le document retourné n'a alors pas d'_id ni de joined_at).
+    """
+    membership = db.memberships.find_one(_membership_filter(target_type, target_id, user_id))
+    if membership is not None or not _embedded_arrays():
+        return membership
+
+    target = TARGETS[target_type]
+    user_id = ObjectId(user_id)
+    legacy = db[target['collection']].find_one(
+        {"_id": ObjectId(target_id), target['members']: user_id},
+        {target['managers']: 1}
+    )
+    if legacy is None:
+        return None
+
+    member_role, manager_role = target['roles']
+    return {
+        "target_type": target_type,
+        "target_id": ObjectId(target_id),
+        "user_id": user_id,
+        "role": manager_role if user_id in legacy.get(target['managers'], []) else member_role
+    }
+
+
+def is_member(db, target_type, target_id, user_id):
+    """Indique si l'utilisateur est membre de la cible"""
+    return get_membership(db, target_type, target_id, user_id) is not None
+
+
+def member_of(db, target_type, target_ids, user_id):
+    """Parmi `target_ids`, ensemble des cibles dont l'utilisateur est membre (une requête)"""
+    user_id = ObjectId(user_id)
+    target_ids = [ObjectId(target_id) for target_id in target_ids]
+    if not target_ids:
+        return set()
+
+    found = set(db.memberships.distinct(
+        "target_id",
+        {"target_type": target_type, "target_id": {"$in": target_ids}, "user_id": user_id}
+    ))
+    missing = [target_id for target_id in target_ids if target_id not in found]
+    if missing and _embedded_arrays():
+        target = TARGETS[target_type]
+        found.update(db[target['collection']].distinct("_id", {"_id": {"$in": missing}, target['members']: user_id}))
+    return found
+
+
+def private_target_ids(db, target_type, user_id):
+    """
+    Liste des ObjectId des cibles non publiques dont l'utilisateur est membre
+
+    Les cibles publiques sont visibles de tous: seules les adhésions marquées
+    `private` sont lues pour compléter un filtre de visibilité.
+    """
+    user_id = ObjectId(user_id)
+    target_ids = set(db.memberships.distinct(
+        "target_id",
+        {"user_id": user_id, "target_type": target_type, "private": True}
+    ))
+    if _embedded_arrays():
+        target = TARGETS[target_type]
+        legacy_query = dict(target['private'], **{target['members']: user_id})
+        target_ids.update(db[target['collection']].distinct("_id", legacy_query))
+    return list(target_ids)
+
+
+def set_target_privacy(db, target_type, target_id, private):
+    """Recopie la visibilité d'une cible modifiée dans ses adhésions"""
+    return db.memberships.update_many(
+        {"target_type": target_type, "target_id": ObjectId(target_id)},
+        {"$set": {"private": private}}
+    ).modified_count
+
+
+def list_members(db, target_type, target_id, pagination):
+    """
+    Page des adhésions d'une cible, par ordre d'arrivée
+
+    Returns:
+        tuple: (adhésions, métadonnées de pagination)
+    """
+    query = {"target_type": target_type, "target_id": ObjectId(target_id)}
+    return paginate(db.memberships, query, [("_id", 1)], pagination, projection=MEMBER_FIELDS)
+
+
+def delete_target_memberships(db, target_type, target_id):
+    """Supprime toutes les adhésions d'une cible supprimée"""
+    return db.memberships.delete_many({"target_type": target_type, "target_id": ObjectId(target_id)}).deleted_count
+
+
+def migrate_embedded(db, drop_arrays=False):
+    """
+    Copie les tableaux embarqués vers la collection memberships, recalcule les
+    compteurs et recopie la visibilité des cibles dans les adhésions
+
+    Idempotent: les adhésions déjà présentes sont conservées.
+
+    Args:
+        drop_arrays: Supprime les tableaux `participants` / `members` après la copie
+    """
+    stats = {}
+    for target_type, target in TARGETS.items():
+        collection = db[target['collection']]
+        member_role, manager_role = target['roles']
+        migrated = 0
+
+        projection = {target['members']: 1, target['managers']: 1, "created_at": 1, "is_private": 1, "group_type": 1}
+        for doc in collection.find({}, projection):
+            private = is_private_target(target_type, doc)
+            managers = doc.get(target['managers']) or []
+            roles = {user_id: manager_role for user_id in managers}
+            for user_id in doc.get(target['members']) or []:
+                roles.setdefault(user_id, member_role)
+
+            if roles:
+                operations = [
+                    UpdateOne(
+                        _membership_filter(target_type, doc['_id'], user_id),
+                        {"$setOnInsert": {"role": role, "joined_at": doc.get('created_at') or datetime.utcnow(),
+                                          "private": private}},
+                        upsert=True
+                    )
+                    for user_id, role in roles.items()
+                ]
+                migrated += len(db.memberships.bulk_write(operations, ordered=False).upserted_ids)
+
+            set_target_privacy(db, target_type, doc['_id'], private)
+            count = db.memberships.count_documents({"target_type": target_type, "target_id": doc['_id']})
+            update = {"$set": {target['count']: count}}
+            if drop_arrays:
+                update["$unset"] = {target['members']: ""}
+            collection.update_one({"_id": doc['_id']}, update)
+
+        stats[target['collection']] = migrated
+    return stats
+
+
+if __name__ == '__main__':
+    import argparse
+    from pymongo import MongoClient
+
+    parser = argparse.ArgumentParser(description="Copie les participants et membres embarqués vers memberships")
+    parser.add_argument('--drop-arrays', action='store_true',
+                        help="Supprimer les tableaux participants/members après la copie")
+    parser.add_argument('--uri', default=Config.MONGO_URI, help="URI MongoDB (défaut: Config.MONGO_URI)")
+    args = parser.parse_args()
+
+    client = MongoClient(args.uri)
+    try:
+        stats = migrate_embedded(client.get_default_database(), drop_arrays=args.drop_arrays)
+    finally:
+        client.close()
+
+    for collection, migrated in stats.items():
+        print(f"✓ {collection}: {migrated} adhésion(s) créée(s)")
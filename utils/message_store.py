@@ -0,0 +1,218 @@
+"""
+Stockage des messages de discussion par buckets
+
+Chaque fil (événement ou groupe) est découpé en buckets de taille fixe dans
+la collection `message_buckets`. L'écriture ajoute le message au bucket
+courant (non plein) et la lecture parcourt uniquement les buckets
+nécessaires à la page demandée.
+
+Usage en ligne de commande (migration des anciens documents `discussions`):
+    python -m utils.message_store --dry-run
+    python -m utils.message_store
+"""
+
+from datetime import datetime
+from bson import ObjectId
+from pymongo import UpdateOne
+from config import Config
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def append_message(db, thread_type, thread_id, message, bucket_size=None):
+    """
+    Ajoute un message au bucket courant du fil, ou crée un nouveau bucket s'ils sont tous pleins
+
+    Args:
+        db: Base de données PyMongo
+        thread_type: "event" ou "group"
+        thread_id: ObjectId de l'événement ou du groupe
+        message: Message à ajouter (doit contenir un "_id")
+    """
+    bucket_size = bucket_size or Config.MESSAGE_BUCKET_SIZE
+
+    db.message_buckets.update_one(
+        {"thread_id": thread_id, "count": {"$lt": bucket_size}},
+        {
+            "$push": {"messages": message},
+            "$inc": {"count": 1},
+            "$min": {"first_id": message['_id']},
+            "$max": {"last_id": message['_id']},
+            "$setOnInsert": {"thread_type": thread_type, "created_at": datetime.utcnow()}
+        },
+        upsert=True
+    )
+
+
+def _collect(db, thread_id, cursor_id, limit, newest_first):
+    """Collecte au plus `limit` messages strictement avant (ou après) cursor_id"""
+    if newest_first:
+        bucket_query = {"thread_id": thread_id}
+        if cursor_id:
+            bucket_query["first_id"] = {"$lt": cursor_id}
+        buckets = db.message_buckets.find(bucket_query, {"messages": 1, "last_id": 1}).sort("first_id", -1)
+        in_range = (lambda m: m['_id'] < cursor_id) if cursor_id else (lambda m: True)
+    else:
+        bucket_query = {"thread_id": thread_id, "last_id": {"$gt": cursor_id}}
+        buckets = db.message_buckets.find(bucket_query, {"messages": 1, "first_id": 1}).sort("first_id", 1)
+        in_range = lambda m: m['_id'] > cursor_id
+
+    collected = []
+    scanned = []
+    for bucket in buckets:
+        scanned.append(bucket['_id'])
+        collected.extend(m for m in bucket.get('messages', []) if in_range(m))
+        if len(collected) >= limit:
+            break
+    else:
+        return sorted(collected, key=lambda m: m['_id'], reverse=newest_first)
+
+    # Les écritures concurrentes peuvent produire des buckets dont les plages
+    # d'IDs se chevauchent: récupérer ceux qui contiennent des messages plus
+    # proches du curseur que le dernier message retenu.
+    collected.sort(key=lambda m: m['_id'], reverse=newest_first)
+    threshold = collected[limit - 1]['_id']
+    overlap_query = dict(bucket_query, _id={"$nin": scanned})
+    if newest_first:
+        overlap_query["last_id"] = {"$gt": threshold}
+    else:
+        overlap_query["first_id"] = {"$lt": threshold}
+    for bucket in db.message_buckets.find(overlap_query, {"messages": 1}):
+        collected.extend(m for m in bucket.get('messages', []) if in_range(m))
+
+    return sorted(collected, key=lambda m: m['_id'], reverse=newest_first)
+
+
+def get_messages(db, thread_id, before=None, after=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Récupère une page de messages d'un fil, triée par ordre chronologique
+
+    Args:
+        before: ObjectId, retourne les messages plus anciens que celui-ci
+        after: ObjectId, retourne les messages plus récents que celui-ci
+        limit: Taille de la page
+
+    Sans curseur, retourne les messages les plus récents.
+
+    Returns:
+        dict: {"messages": [...], "pagination": {...}}
+    """
+    newest_first = after is None
+    collected = _collect(db, thread_id, before if newest_first else after, limit + 1, newest_first)
+
+    has_more = len(collected) > limit
+    page = collected[:limit]
+    if newest_first:
+        page.reverse()
+
+    return {
+        "messages": page,
+        "pagination": {
+            "limit": limit,
+            "has_more": has_more,
+            "before": page[0]['_id'] if page else None,
+            "after": page[-1]['_id'] if page else None
+        }
+    }
+
+
+def parse_page_args(args):
+    """
+    Lit les paramètres de pagination `before`, `after` et `limit` d'une requête
+
+    Returns:
+        tuple: (before, after, limit, erreur)
+    """
+    before = args.get('before')
+    after = args.get('after')
+
+    if before and after:
+        return None, None, None, "Utilisez soit 'before', soit 'after'"
+    for value in (before, after):
+        if value and not ObjectId.is_valid(value):
+            return None, None, None, "Curseur de pagination invalide"
+
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return None, None, None, "Paramètre 'limit' invalide"
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        return None, None, None, f"Le paramètre 'limit' doit être compris entre 1 et {MAX_PAGE_SIZE}"
+
+    return (ObjectId(before) if before else None), (ObjectId(after) if after else None), limit, None
+
+
+def migrate_discussions(db, dry_run=False, bucket_size=None):
+    """
+    Déplace les messages embarqués dans `discussions.messages` vers `message_buckets`
+
+    La migration est rejouable: chaque tranche de messages est insérée par un
+    upsert sur (migrated_from, migrated_chunk), sans écraser un bucket déjà
+    créé. Le dernier bucket migré, non plein, peut recevoir de nouveaux
+    messages via append_message; ils sont conservés si la migration est
+    relancée (avec la même taille de bucket).
+
+    Returns:
+        dict: {"discussions": nombre de discussions migrées, "messages": nombre de messages déplacés}
+    """
+    bucket_size = bucket_size or Config.MESSAGE_BUCKET_SIZE
+    stats = {"discussions": 0, "messages": 0}
+
+    cursor = db.discussions.find({"messages.0": {"$exists": True}})
+    for discussion in cursor:
+        if discussion.get('event_id'):
+            thread_type, thread_id = "event", discussion['event_id']
+        else:
+            thread_type, thread_id = "group", discussion['group_id']
+
+        messages = sorted(discussion['messages'], key=lambda m: m['_id'])
+        stats['discussions'] += 1
+        stats['messages'] += len(messages)
+        if dry_run:
+            continue
+
+        operations = []
+        for chunk_index, start in enumerate(range(0, len(messages), bucket_size)):
+            chunk = messages[start:start + bucket_size]
+            bucket = {
+                "thread_type": thread_type,
+                "thread_id": thread_id,
+                "count": len(chunk),
+                "first_id": chunk[0]['_id'],
+                "last_id": chunk[-1]['_id'],
+                "messages": chunk,
+                "created_at": datetime.utcnow()
+            }
+            operations.append(UpdateOne(
+                {"migrated_from": discussion['_id'], "migrated_chunk": chunk_index},
+                {"$setOnInsert": bucket},
+                upsert=True
+            ))
+
+        db.message_buckets.bulk_write(operations, ordered=False)
+        db.discussions.update_one(
+            {"_id": discussion['_id']},
+            {"$set": {"messages": [], "migrated_at": datetime.utcnow()}}
+        )
+
+    return stats
+
+
+if __name__ == '__main__':
+    import argparse
+    from pymongo import MongoClient
+
+    parser = argparse.ArgumentParser(description="Migre les messages des discussions vers les buckets")
+    parser.add_argument('--dry-run', action='store_true', help="Compter les messages sans les déplacer")
+    parser.add_argument('--uri', default=Config.MONGO_URI, help="URI MongoDB (défaut: Config.MONGO_URI)")
+    args = parser.parse_args()
+
+    client = MongoClient(args.uri)
+    try:
+        stats = migrate_discussions(client.get_default_database(), dry_run=args.dry_run)
+    finally:
+        client.close()
+
+    action = "à migrer" if args.dry_run else "migrés"
+    print(f"✓ {stats['messages']} message(s) de {stats['discussions']} discussion(s) {action}")
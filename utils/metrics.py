@@ -0,0 +1,186 @@
+"""
+Métriques HTTP au format texte Prometheus (GET /api/metrics)
+
+Collectées par des hooks before_request / after_request / teardown_request
+enregistrés dans `create_app` (si METRICS_ENABLED):
+  - http_requests_total                 compteur par méthode, blueprint, endpoint, statut
+  - http_request_duration_seconds       histogramme, mêmes labels
+  - http_response_size_bytes            histogramme par méthode, blueprint, endpoint
+  - http_requests_in_flight             jauge
+
+La route de consultation est protégée par le jeton d'administration
+(header X-Admin-Token, voir ADMIN_TOKEN).
+
+Une observation coûte une recherche dichotomique et quelques incréments
+sous un verrou; les cumuls des histogrammes ne sont calculés qu'à la lecture.
+Les valeurs sont propres à chaque processus worker.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, request
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Méthodes gardées telles quelles dans le label `method`, les autres deviennent "other"
+HTTP_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Compteur à labels"""
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values=(), amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Jauge à labels"""
+
+    def dec(self, label_values=(), amount=1):
+        self.inc(label_values, -amount)
+
+    def render(self):
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        if len(lines) == 2:
+            lines.append(f"{self.name} 0")
+        return lines
+
+
+class Histogram:
+    """Histogramme à labels (buckets non cumulés en mémoire)"""
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, label_values=()):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # [compte par bucket (+Inf en dernier), somme, total]
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._series.items())
+        label_names = self.labels + ("le",)
+        for label_values, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                le = bound if bound == "+Inf" else _format_value(float(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(label_names, label_values + (le,))} {cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class HttpMetrics:
+    """Métriques des requêtes HTTP de l'application"""
+
+    def __init__(self):
+        labels = ("method", "blueprint", "endpoint", "status")
+        self.requests = Counter("http_requests_total", "Nombre de requêtes HTTP traitées", labels)
+        self.latency = Histogram("http_request_duration_seconds", "Durée de traitement des requêtes HTTP", labels)
+        self.response_size = Histogram("http_response_size_bytes", "Taille des réponses HTTP",
+                                       labels[:3], SIZE_BUCKETS)
+        self.in_flight = Gauge("http_requests_in_flight", "Requêtes HTTP en cours de traitement")
+
+    def before_request(self):
+        g._metrics_started_at = time.perf_counter()
+        self.in_flight.inc()
+
+    def after_request(self, response):
+        started_at = g.get('_metrics_started_at')
+        if started_at is None:
+            return response
+
+        # Les méthodes non standard et les routes inconnues sont regroupées pour borner le nombre de séries
+        method = request.method if request.method in HTTP_METHODS else "other"
+        route = (method, request.blueprint or "", request.endpoint or "unmatched")
+        labels = route + (str(response.status_code),)
+        self.requests.inc(labels)
+        self.latency.observe(time.perf_counter() - started_at, labels)
+
+        # Taille inconnue pour les réponses en streaming
+        size = response.content_length
+        if size is not None:
+            self.response_size.observe(size, route)
+        return response
+
+    def teardown_request(self, exc=None):
+        if g.pop('_metrics_started_at', None) is not None:
+            self.in_flight.dec()
+
+    def render(self):
+        lines = []
+        for metric in (self.requests, self.latency, self.response_size, self.in_flight):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+http_metrics = HttpMetrics()
+
+
+def init_metrics(app):
+    """Enregistre la collecte et la route /api/metrics si METRICS_ENABLED"""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    app.before_request(http_metrics.before_request)
+    app.after_request(http_metrics.after_request)
+    app.teardown_request(http_metrics.teardown_request)
+
+    from middleware import admin_token_required
+
+    @app.route('/api/metrics')
+    @admin_token_required
+    def metrics():
+        """Métriques au format texte Prometheus (X-Admin-Token)"""
+        return app.response_class(http_metrics.render(), mimetype=None, content_type=CONTENT_TYPE)
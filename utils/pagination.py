@@ -0,0 +1,141 @@
+"""
+Pagination par curseur (keyset)
+
+Le curseur est un jeton opaque contenant les valeurs de tri du dernier
+document de la page. La page suivante est obtenue par une requête
+`(clé > dernière clé)` servie par l'index, au lieu d'un `skip` dont le coût
+croît avec la profondeur de la page.
+"""
+
+import base64
+import json
+from datetime import datetime
+from bson import ObjectId
+
+MAX_PER_PAGE = 100
+
+
+def _encode_value(value):
+    if isinstance(value, ObjectId):
+        return {"$oid": str(value)}
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "$oid" in value:
+        return ObjectId(value["$oid"])
+    if isinstance(value, dict) and "$date" in value:
+        return datetime.fromisoformat(value["$date"])
+    return value
+
+
+def encode_cursor(doc, sort_fields):
+    """Construit le curseur pointant après `doc`"""
+    values = [_encode_value(doc.get(field)) for field, _ in sort_fields]
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, sort_fields):
+    """
+    Décode un curseur
+
+    Raises:
+        ValueError: si le curseur est invalide
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw)
+    except Exception:
+        raise ValueError("Curseur de pagination invalide")
+    if not isinstance(values, list) or len(values) != len(sort_fields):
+        raise ValueError("Curseur de pagination invalide")
+    try:
+        return [_decode_value(value) for value in values]
+    except Exception:
+        raise ValueError("Curseur de pagination invalide")
+
+
+def keyset_filter(sort_fields, values):
+    """
+    Filtre sélectionnant les documents situés après `values` dans l'ordre de tri
+
+    Pour un tri (a, b): a > va OU (a == va ET b > vb)
+    """
+    clauses = []
+    for i, (field, direction) in enumerate(sort_fields):
+        clause = {f: v for (f, _), v in zip(sort_fields[:i], values[:i])}
+        clause[field] = {"$gt" if direction == 1 else "$lt": values[i]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def parse_pagination_args(args, default_per_page=20, max_per_page=MAX_PER_PAGE):
+    """
+    Lit les paramètres `page`, `per_page`, `cursor` et `include_total`
+
+    Returns:
+        dict: {"page", "per_page", "cursor", "include_total"}
+
+    Raises:
+        ValueError: si un paramètre est invalide
+    """
+    try:
+        page = int(args.get('page', 1))
+        per_page = int(args.get('per_page', default_per_page))
+    except ValueError:
+        raise ValueError("Paramètres de pagination invalides")
+    if page < 1 or per_page < 1:
+        raise ValueError("Paramètres de pagination invalides")
+
+    return {
+        "page": page,
+        "per_page": min(per_page, max_per_page),
+        "cursor": args.get('cursor') or None,
+        "include_total": args.get('include_total', 'true').lower() not in ('false', '0', 'no')
+    }
+
+
+def paginate(collection, query, sort_fields, pagination, projection=None):
+    """
+    Pagine une requête par curseur, ou par numéro de page si `page` > 1 sans curseur
+
+    Args:
+        collection: Collection PyMongo
+        query: Filtre de la requête
+        sort_fields: [(champ, 1 | -1), ...], doit se terminer par un champ unique (_id)
+        pagination: Résultat de parse_pagination_args
+
+    Returns:
+        tuple: (documents, bloc "pagination" de la réponse)
+    """
+    per_page = pagination['per_page']
+    cursor = pagination['cursor']
+
+    find_query = query
+    skip = 0
+    if cursor:
+        after = keyset_filter(sort_fields, decode_cursor(cursor, sort_fields))
+        find_query = {"$and": [query, after]} if query else after
+    else:
+        skip = (pagination['page'] - 1) * per_page
+
+    docs = list(collection.find(find_query, projection).sort(sort_fields).skip(skip).limit(per_page + 1))
+    has_more = len(docs) > per_page
+    docs = docs[:per_page]
+
+    meta = {
+        "per_page": per_page,
+        "has_more": has_more,
+        "next_cursor": encode_cursor(docs[-1], sort_fields) if has_more else None
+    }
+    if not cursor:
+        meta["page"] = pagination['page']
+    if pagination['include_total']:
+        total = collection.count_documents(query)
+        meta["total"] = total
+        meta["pages"] = (total + per_page - 1) // per_page
+
+    return docs, meta
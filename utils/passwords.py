@@ -0,0 +1,137 @@
+"""
+Hachage des mots de passe (bcrypt)
+
+Les appels bcrypt sont exécutés sur un pool de threads dédié et borné
+(bcrypt libère le GIL pendant le calcul): une rafale d'inscriptions ou de
+connexions occupe au plus PASSWORD_HASH_WORKERS cœurs, et au-delà de
+PASSWORD_HASH_QUEUE_SIZE demandes en attente les nouvelles sont refusées
+(`PasswordHasherBusy`) au lieu d'immobiliser les workers Flask.
+
+Le coût (BCRYPT_ROUNDS) est configurable; `needs_rehash` permet de
+re-hacher à la connexion les mots de passe créés avec un autre coût.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import bcrypt
+from config import Config
+from .timing import LatencyWindow
+
+
+class PasswordHasherBusy(Exception):
+    """Trop de demandes de hachage en attente"""
+    pass
+
+
+def _to_bytes(value):
+    return value.encode('utf-8') if isinstance(value, str) else bytes(value)
+
+
+def hash_rounds(hashed):
+    """Coût bcrypt d'un hash ("$2b$12$..." -> 12), None si illisible"""
+    try:
+        return int(_to_bytes(hashed).split(b'$')[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """Hachage et vérification bcrypt sur un pool de threads borné"""
+
+    def __init__(self, rounds=12, workers=2, queue_size=64, timeout=10):
+        self.rounds = rounds
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._wait_times = LatencyWindow()
+        self._hash_times = LatencyWindow()
+
+    def _get_executor(self):
+        # Créé au premier usage: les threads ne survivent pas à un fork
+        # (workers gunicorn avec --preload)
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bcrypt')
+        return self._executor
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordHasherBusy("Trop de demandes d'authentification en cours, réessayez plus tard")
+
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        def task():
+            started_at = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            try:
+                return func(*args)
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                self._wait_times.add(started_at - submitted_at)
+                self._hash_times.add(finished_at - started_at)
+                self._slots.release()
+
+        future = self._get_executor().submit(task)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            raise PasswordHasherBusy("Délai d'authentification dépassé, réessayez plus tard")
+
+    def hash(self, password):
+        """Retourne le hash bcrypt (bytes) du mot de passe"""
+        return self._run(lambda: bcrypt.hashpw(_to_bytes(password), bcrypt.gensalt(self.rounds)))
+
+    def check(self, password, hashed):
+        """Vérifie un mot de passe contre son hash"""
+        return self._run(bcrypt.checkpw, _to_bytes(password), _to_bytes(hashed))
+
+    def needs_rehash(self, hashed):
+        """Vrai si le hash a été créé avec un autre coût que le coût configuré"""
+        return hash_rounds(hashed) != self.rounds
+
+    def metrics(self):
+        """Profondeur de file, compteurs et latences (en millisecondes)"""
+        with self._lock:
+            metrics = {
+                "rounds": self.rounds,
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "queue_depth": self._queued,
+                "in_progress": self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts
+            }
+        metrics["wait_ms"] = self._wait_times.summary()
+        metrics["hash_ms"] = self._hash_times.summary()
+        return metrics
+
+
+password_hasher = PasswordHasher(
+    rounds=Config.BCRYPT_ROUNDS,
+    workers=Config.PASSWORD_HASH_WORKERS,
+    queue_size=Config.PASSWORD_HASH_QUEUE_SIZE,
+    timeout=Config.PASSWORD_HASH_TIMEOUT
+)
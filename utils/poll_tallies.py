@@ -0,0 +1,157 @@
+"""
+Compteurs de votes des sondages
+
+Chaque sondage maintient `tallies` (un tableau de compteurs par question,
+un compteur par option) et `total_responses`, incrémentés avec `$inc` à
+chaque réponse. Les résultats se calculent ainsi en O(questions × options)
+sans parcourir les réponses.
+
+Usage en ligne de commande (recalcul des compteurs):
+    python -m utils.poll_tallies                # Tous les sondages
+    python -m utils.poll_tallies --poll <id>    # Un seul sondage
+"""
+
+from collections import Counter
+from bson import ObjectId
+
+
+def empty_tallies(questions):
+    """Compteurs à zéro pour chaque option de chaque question"""
+    return [[0] * len(question['options']) for question in questions]
+
+
+def _answer_index(value, name):
+    # Entiers JSON uniquement: "0", 1.0 ou true produiraient un chemin `tallies` invalide
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"{name} invalide: {value!r} (entier attendu)")
+    return value
+
+
+def parse_answers(questions, answers):
+    """
+    Vérifie les réponses d'un utilisateur et les réduit aux champs enregistrés
+
+    Args:
+        questions: Questions du sondage
+        answers: [{"question_index": int, "option_index": int}, ...]
+
+    Returns:
+        list: [{"question_index": int, "option_index": int}, ...]
+
+    Raises:
+        ValueError: si un index n'est pas un entier ou référence une question ou une option inexistante
+    """
+    parsed = []
+    for answer in answers:
+        q_index = _answer_index(answer.get('question_index'), "question_index")
+        o_index = _answer_index(answer.get('option_index'), "option_index")
+        if not 0 <= q_index < len(questions):
+            raise ValueError(f"Question inexistante: {q_index}")
+        if not 0 <= o_index < len(questions[q_index]['options']):
+            raise ValueError(f"Option inexistante pour la question {q_index}: {o_index}")
+        parsed.append({"question_index": q_index, "option_index": o_index})
+    return parsed
+
+
+def tally_increments(questions, answers):
+    """
+    Convertit les réponses d'un utilisateur en incréments `$inc`
+
+    Args:
+        questions: Questions du sondage
+        answers: [{"question_index": int, "option_index": int}, ...]
+
+    Returns:
+        dict: {"tallies.<q>.<o>": n, ...}
+
+    Raises:
+        ValueError: si une réponse est invalide (voir parse_answers)
+    """
+    counts = Counter(
+        f"tallies.{answer['question_index']}.{answer['option_index']}"
+        for answer in parse_answers(questions, answers)
+    )
+    return dict(counts)
+
+
+def compute_tallies(questions, responses):
+    """Recalcule les compteurs à partir de la liste complète des réponses"""
+    tallies = empty_tallies(questions)
+    for response in responses:
+        for answer in response.get('responses', []):
+            try:
+                q_index = _answer_index(answer.get('question_index'), "question_index")
+                o_index = _answer_index(answer.get('option_index'), "option_index")
+            except ValueError:
+                continue  # Réponse enregistrée avant la vérification des types
+            if 0 <= q_index < len(tallies) and 0 <= o_index < len(tallies[q_index]):
+                tallies[q_index][o_index] += 1
+    return tallies
+
+
+def recount_poll(db, poll_id, retries=5):
+    """
+    Recalcule et enregistre les compteurs d'un sondage
+
+    L'écriture n'est appliquée que si aucune réponse n'a été ajoutée entre la
+    lecture et la mise à jour; sinon le recalcul est relancé.
+
+    Returns:
+        dict: Le sondage avec ses compteurs à jour (sans les réponses), ou None
+    """
+    for _ in range(retries):
+        poll = db.polls.find_one({"_id": ObjectId(poll_id)})
+        if not poll:
+            return None
+
+        responses = poll.get('responses', [])
+        tallies = compute_tallies(poll['questions'], responses)
+        result = db.polls.update_one(
+            {"_id": poll['_id'], "responses": {"$size": len(responses)}},
+            {"$set": {"tallies": tallies, "total_responses": len(responses)}}
+        )
+        if result.matched_count:
+            poll.pop('responses', None)
+            poll['tallies'] = tallies
+            poll['total_responses'] = len(responses)
+            return poll
+
+    raise RuntimeError(f"Impossible de recalculer le sondage {poll_id}: réponses modifiées en continu")
+
+
+def build_results(poll):
+    """Construit les résultats par question à partir des compteurs"""
+    results = []
+    for question, counts in zip(poll['questions'], poll['tallies']):
+        results.append({
+            "question": question['question'],
+            "options": [
+                {"option": option, "votes": votes}
+                for option, votes in zip(question['options'], counts)
+            ]
+        })
+    return results
+
+
+if __name__ == '__main__':
+    import argparse
+    from pymongo import MongoClient
+    from config import Config
+
+    parser = argparse.ArgumentParser(description="Recalcule les compteurs de votes des sondages")
+    parser.add_argument('--poll', help="ID d'un sondage (défaut: tous les sondages)")
+    parser.add_argument('--uri', default=Config.MONGO_URI, help="URI MongoDB (défaut: Config.MONGO_URI)")
+    args = parser.parse_args()
+
+    client = MongoClient(args.uri)
+    try:
+        db = client.get_default_database()
+        poll_ids = [ObjectId(args.poll)] if args.poll else [p['_id'] for p in db.polls.find({}, {"_id": 1})]
+        for poll_id in poll_ids:
+            poll = recount_poll(db, poll_id)
+            if poll:
+                print(f"✓ {poll_id}: {poll['total_responses']} réponse(s)")
+            else:
+                print(f"⚠ {poll_id}: sondage non trouvé")
+    finally:
+        client.close()
@@ -0,0 +1,120 @@
+"""
+Suivi du pool de connexions MongoDB
+
+`PoolMonitor` est un listener PyMongo (monitoring.ConnectionPoolListener)
+enregistré à la création du client dans `init_db`. Il maintient, par
+serveur, le nombre de connexions ouvertes et utilisées ainsi que le temps
+d'attente pour obtenir une connexion du pool: un temps d'attente qui
+augmente avec des connexions toutes utilisées indique un maxPoolSize trop
+faible pour le nombre de threads du worker.
+"""
+
+import os
+import threading
+import time
+from pymongo import monitoring
+from .timing import LatencyWindow
+
+
+class _ServerPool:
+    """Compteurs du pool d'un serveur"""
+
+    def __init__(self):
+        self.open = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.checkouts = 0
+        self.checkout_failures = {}
+        self.cleared = 0
+        self.wait_times = LatencyWindow()
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Jauges du pool de connexions, par adresse de serveur"""
+
+    def __init__(self):
+        self._pools = {}
+        self._lock = threading.Lock()
+        # Le début et la fin d'un checkout ont lieu dans le même thread
+        self._local = threading.local()
+
+    def _pool(self, address):
+        pool = self._pools.get(address)
+        if pool is None:
+            pool = self._pools.setdefault(address, _ServerPool())
+        return pool
+
+    def pool_created(self, event):
+        with self._lock:
+            self._pool(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._pool(event.address).cleared += 1
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._pools.pop(event.address, None)
+
+    def connection_created(self, event):
+        with self._lock:
+            self._pool(event.address).open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.open = max(0, pool.open - 1)
+
+    def connection_check_out_started(self, event):
+        self._local.started_at = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        self._local.started_at = None
+        with self._lock:
+            failures = self._pool(event.address).checkout_failures
+            failures[event.reason] = failures.get(event.reason, 0) + 1
+
+    def connection_checked_out(self, event):
+        started_at = getattr(self._local, 'started_at', None)
+        self._local.started_at = None
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.in_use += 1
+            pool.max_in_use = max(pool.max_in_use, pool.in_use)
+            pool.checkouts += 1
+        if started_at is not None:
+            pool.wait_times.add(time.perf_counter() - started_at)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.in_use = max(0, pool.in_use - 1)
+
+    def stats(self):
+        """Jauges par serveur ("host:port")"""
+        with self._lock:
+            pools = list(self._pools.items())
+            servers = {
+                f"{address[0]}:{address[1]}": {
+                    "open": pool.open,
+                    "in_use": pool.in_use,
+                    "available": max(0, pool.open - pool.in_use),
+                    "max_in_use": pool.max_in_use,
+                    "checkouts": pool.checkouts,
+                    "checkout_failures": dict(pool.checkout_failures),
+                    "cleared": pool.cleared
+                }
+                for address, pool in pools
+            }
+        for address, pool in pools:
+            servers[f"{address[0]}:{address[1]}"]["checkout_wait_ms"] = pool.wait_times.summary()
+        return {"pid": os.getpid(), "servers": servers}
+
+
+pool_monitor = PoolMonitor()
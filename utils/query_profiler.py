@@ -0,0 +1,199 @@
+"""
+Profilage des commandes MongoDB (optionnel, QUERY_PROFILER_ENABLED)
+
+`QueryProfiler` est un listener PyMongo (monitoring.CommandListener) qui
+associe chaque commande à la route Flask qui l'a émise, avec sa durée et le
+nombre de documents retournés. Il tient:
+  - par route: nombre de requêtes HTTP et de commandes MongoDB (moyenne et
+    max par requête, ce qui fait apparaître les schémas N+1), détail par
+    commande/collection
+  - les dernières commandes et les commandes lentes
+    (> QUERY_PROFILER_SLOW_MS, également écrites dans le log)
+
+Consultation: GET /api/debug/queries (DELETE pour remettre à zéro).
+"""
+
+import logging
+import threading
+from collections import deque
+
+from flask import g, has_request_context, request, jsonify
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+# Commandes dont le nom du premier champ n'est pas la collection
+COLLECTION_FIELDS = {"getMore": "collection"}
+
+
+def command_collection(command_name, command):
+    """Collection visée par une commande"""
+    value = command.get(COLLECTION_FIELDS.get(command_name, command_name))
+    return value if isinstance(value, str) else None
+
+
+def documents_returned(reply):
+    """Nombre de documents retournés (curseur) ou affectés (écriture)"""
+    cursor = reply.get('cursor')
+    if isinstance(cursor, dict):
+        return len(cursor.get('firstBatch', cursor.get('nextBatch', [])))
+    if 'value' in reply:  # findAndModify
+        return 1 if reply['value'] is not None else 0
+    if 'values' in reply:  # distinct
+        return len(reply['values'])
+    return reply.get('n')
+
+
+def current_route():
+    """Route Flask à l'origine de la commande (None hors requête)"""
+    if has_request_context():
+        return request.endpoint or request.path
+    return None
+
+
+class QueryProfiler(monitoring.CommandListener):
+    """Statistiques des commandes MongoDB par route"""
+
+    def __init__(self, slow_ms=100, history_size=200):
+        self.slow_ms = slow_ms
+        self.history_size = history_size
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._routes = {}
+            self._recent = deque(maxlen=self.history_size)
+            self._slow = deque(maxlen=self.history_size)
+
+    def _route_stats(self, route):
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = self._routes[route] = {
+                "requests": 0,
+                "commands": 0,
+                "max_commands_per_request": 0,
+                "total_ms": 0.0,
+                "by_command": {}
+            }
+        return stats
+
+    # -- CommandListener -----------------------------------------------------
+
+    def started(self, event):
+        route = current_route()
+        with self._lock:
+            if route is not None:
+                # Thread secondaire (utils.request_context): compté dans la requête parente
+                counter = g.get('_request_parent') or g._get_current_object()
+                counter._query_count = counter.get('_query_count', 0) + 1
+            self._pending[event.request_id] = (
+                route,
+                event.command_name,
+                command_collection(event.command_name, event.command)
+            )
+
+    def succeeded(self, event):
+        self._finish(event, documents_returned(event.reply))
+
+    def failed(self, event):
+        self._finish(event, None, failure=str(event.failure))
+
+    def _finish(self, event, documents, failure=None):
+        duration_ms = event.duration_micros / 1000
+        with self._lock:
+            route, command_name, collection = self._pending.pop(event.request_id, (None, event.command_name, None))
+            entry = {
+                "route": route,
+                "command": command_name,
+                "collection": collection,
+                "duration_ms": round(duration_ms, 2),
+                "documents": documents
+            }
+            if failure:
+                entry["failure"] = failure
+            self._recent.append(entry)
+
+            stats = self._route_stats(route or "(hors requête)")
+            stats["commands"] += 1
+            stats["total_ms"] += duration_ms
+            key = f"{command_name}:{collection}" if collection else command_name
+            detail = stats["by_command"].setdefault(key, {"count": 0, "total_ms": 0.0})
+            detail["count"] += 1
+            detail["total_ms"] += duration_ms
+
+            slow = duration_ms >= self.slow_ms
+            if slow:
+                self._slow.append(entry)
+
+        if slow:
+            logger.warning("Requête MongoDB lente (%.1f ms): %s %s depuis %s, %s document(s)",
+                           duration_ms, command_name, collection, route, documents)
+
+    # -- Requêtes HTTP -------------------------------------------------------
+
+    def request_finished(self):
+        """Comptabilise la requête HTTP courante (appelé en fin de requête)"""
+        route = current_route()
+        if route is None or g.get('_request_parent') is not None:
+            return
+        with self._lock:
+            count = g.pop('_query_count', 0)
+            stats = self._route_stats(route)
+            stats["requests"] += 1
+            stats["max_commands_per_request"] = max(stats["max_commands_per_request"], count)
+
+    def report(self):
+        """Statistiques par route, commandes récentes et lentes"""
+        with self._lock:
+            routes = {}
+            for route, stats in self._routes.items():
+                routes[route] = {
+                    "requests": stats["requests"],
+                    "commands": stats["commands"],
+                    "avg_commands_per_request": round(stats["commands"] / stats["requests"], 2) if stats["requests"] else None,
+                    "max_commands_per_request": stats["max_commands_per_request"],
+                    "total_ms": round(stats["total_ms"], 2),
+                    "by_command": {
+                        key: {"count": detail["count"], "total_ms": round(detail["total_ms"], 2)}
+                        for key, detail in stats["by_command"].items()
+                    }
+                }
+            return {
+                "slow_threshold_ms": self.slow_ms,
+                "routes": routes,
+                "slow": list(self._slow),
+                "recent": list(self._recent)
+            }
+
+
+query_profiler = QueryProfiler()
+
+
+def init_query_profiler(app):
+    """
+    Active le profilage si QUERY_PROFILER_ENABLED
+
+    Le listener est ajouté au MongoClient par init_db (utils.database.client_options);
+    cette fonction enregistre le comptage par requête et la route de consultation.
+    """
+    if not app.config.get('QUERY_PROFILER_ENABLED'):
+        return
+
+    from middleware import admin_token_required
+
+    query_profiler.slow_ms = app.config.get('QUERY_PROFILER_SLOW_MS', 100)
+
+    @app.teardown_request
+    def count_request_queries(exc=None):
+        query_profiler.request_finished()
+
+    @app.route('/api/debug/queries', methods=['GET', 'DELETE'])
+    @admin_token_required
+    def debug_queries():
+        """Statistiques des requêtes MongoDB par route (X-Admin-Token)"""
+        if request.method == 'DELETE':
+            query_profiler.reset()
+            return jsonify({"message": "Statistiques remises à zéro"}), 200
+        return jsonify(query_profiler.report()), 200
@@ -0,0 +1,29 @@
+"""
+Travail en parallèle dans une requête Flask
+
+Les threads d'un pool n'ont pas de contexte de requête: `request_task`
+leur en donne une copie (request, endpoint) et expose `g` de la requête
+parente dans `g._request_parent`.
+"""
+
+from functools import wraps
+
+from flask import copy_current_request_context, g
+
+
+def request_task(func):
+    """
+    Prépare `func` pour un thread secondaire de la requête en cours
+
+    À appeler dans le contexte de la requête. Le thread reçoit son propre `g`;
+    celui de la requête parente reste accessible via `g._request_parent`.
+    """
+    parent = g._get_current_object()
+
+    @copy_current_request_context
+    @wraps(func)
+    def run(*args, **kwargs):
+        g._request_parent = parent
+        return func(*args, **kwargs)
+
+    return run
@@ -3,7 +3,13 @@ from bson import ObjectId
 from datetime import datetime
 
 def serialize_doc(doc):
-    """Convertit un document MongoDB en format JSON"""
+    """
+    Convertit un document MongoDB en format JSON
+
+    Les réponses n'en ont plus besoin: ObjectId et datetime sont gérés par le
+    provider JSON de l'application (utils.json_provider). Conservé pour les
+    usages hors réponse HTTP.
+    """
     if doc is None:
         return None
     
@@ -37,7 +43,7 @@ def success_response(data=None, message="Success", status=200):
         "message": message
     }
     if data is not None:
-        response["data"] = serialize_doc(data)
+        response["data"] = data
     
     return jsonify(response), status
 
@@ -0,0 +1,104 @@
+"""
+Cache des réponses publiques en lecture
+
+Les routes décorées par `cached_response` gardent en mémoire le corps de
+leurs réponses 200, par route, ressource et classe de visibilité. Seules les
+réponses marquées par la vue avec `mark_cacheable()` sont conservées: les
+événements privés, dont la réponse dépend de l'utilisateur, ne sont jamais
+mis en cache.
+
+Chaque entrée porte un ETag: un client qui renvoie `If-None-Match` reçoit
+un 304 sans que le corps soit recalculé ni renvoyé. Les écritures appellent
+`invalidate_event_responses`; le TTL borne la durée pendant laquelle un
+autre worker peut servir une réponse périmée.
+"""
+
+import hashlib
+import itertools
+from functools import wraps
+
+from flask import current_app, g, request
+from config import Config
+from .cache import TTLCache
+
+PUBLIC = "public"
+
+response_cache = TTLCache(Config.RESPONSE_CACHE_SIZE, Config.RESPONSE_CACHE_TTL)
+
+# Génération par ressource: une réponse calculée avant une invalidation
+# n'est pas enregistrée après celle-ci. Les valeurs viennent d'un compteur
+# global (jamais réutilisées) et sont gardées dans un cache borné: une
+# génération expirée ne concerne plus aucune requête en cours.
+_generations = TTLCache(Config.RESPONSE_CACHE_SIZE, Config.RESPONSE_CACHE_TTL)
+_generation_counter = itertools.count(1)
+
+# Routes décorées par cached_response (clés à invalider pour une ressource)
+_cached_endpoints = set()
+
+
+def _generation(resource_id):
+    return _generations.get(resource_id) or 0
+
+
+def mark_cacheable(visibility=PUBLIC):
+    """À appeler par la vue quand sa réponse est identique pour tous les visiteurs de la classe"""
+    g._response_cache_class = visibility
+
+
+def invalidate_event_responses(event_id):
+    """Invalide les réponses en cache d'un événement (événement et types de billets)"""
+    resource_id = str(event_id)
+    _generations.set(resource_id, next(_generation_counter))
+    for endpoint in list(_cached_endpoints):
+        response_cache.invalidate((endpoint, resource_id, PUBLIC))
+
+
+def _cached(entry, status):
+    """Réponse construite depuis une entrée du cache (304 si l'ETag correspond)"""
+    if entry['etag'] in request.if_none_match:
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(entry['body'], mimetype=entry['mimetype'])
+    response.set_etag(entry['etag'])
+    # Le client peut garder la réponse mais doit la revalider (If-None-Match)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Cache'] = status
+    return response
+
+
+def cached_response(resource_arg):
+    """
+    Met en cache les réponses d'une route GET
+
+    Args:
+        resource_arg: Argument de la route identifiant la ressource (ex: "event_id"),
+                      utilisé par invalidate_event_responses
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            resource_id = str(kwargs.get(resource_arg))
+            key = (request.endpoint, resource_id, PUBLIC)
+            _cached_endpoints.add(request.endpoint)
+
+            entry = response_cache.get(key)
+            if entry is not None:
+                return _cached(entry, "HIT")
+
+            generation = _generation(resource_id)
+            response = current_app.make_response(f(*args, **kwargs))
+            if response.status_code != 200 or g.pop('_response_cache_class', None) != PUBLIC:
+                return response
+
+            body = response.get_data()
+            entry = {
+                "body": body,
+                "etag": hashlib.sha1(body).hexdigest(),
+                "mimetype": response.mimetype
+            }
+            if generation == _generation(resource_id):
+                response_cache.set(key, entry)
+            return _cached(entry, "MISS")
+
+        return decorated
+    return decorator
@@ -0,0 +1,68 @@
+"""
+Statistiques générales de l'API (route publique `/api/stats`)
+
+Les compteurs sont lus avec `estimated_document_count` (métadonnées de la
+collection, O(1)) et gardés en cache dans le processus pendant
+Config.STATS_REFRESH_INTERVAL secondes: quel que soit le trafic sur la
+route, la base n'est interrogée qu'une fois par intervalle.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+# Nom de la statistique -> collection MongoDB
+STATS_COLLECTIONS = {
+    "users": "users",
+    "events": "events",
+    "groups": "groups",
+    "albums": "albums",
+    "photos": "photos",
+    "polls": "polls",
+    "tickets_sold": "tickets",
+    "shopping_items": "shopping_items",
+    "carpooling_offers": "carpooling"
+}
+
+
+class StatsCache:
+    """Cache des statistiques, rafraîchi au plus une fois par intervalle"""
+
+    def __init__(self, refresh_interval=60):
+        self.refresh_interval = refresh_interval
+        self._stats = None
+        self._computed_at = None
+        self._expires_at = 0
+        self._lock = threading.Lock()
+
+    def get(self, db):
+        """
+        Retourne (statistiques, date de calcul)
+
+        Si le cache a expiré, un seul thread recalcule; les autres continuent
+        de servir la dernière valeur connue.
+        """
+        if self._stats is not None and time.monotonic() < self._expires_at:
+            return self._stats, self._computed_at
+
+        if not self._lock.acquire(blocking=self._stats is None):
+            return self._stats, self._computed_at
+
+        try:
+            if self._stats is None or time.monotonic() >= self._expires_at:
+                self._stats = {
+                    name: db[collection].estimated_document_count()
+                    for name, collection in STATS_COLLECTIONS.items()
+                }
+                self._computed_at = datetime.utcnow()
+                self._expires_at = time.monotonic() + self.refresh_interval
+        finally:
+            self._lock.release()
+
+        return self._stats, self._computed_at
+
+    def clear(self):
+        """Force un recalcul au prochain appel"""
+        with self._lock:
+            self._stats = None
+            self._expires_at = 0
@@ -0,0 +1,69 @@
+"""
+Réponses JSON en streaming
+
+`stream_response` produit le même corps que `success_response` pour une
+liste de documents, mais encode les documents au fil du curseur PyMongo et
+les envoie par blocs (transfert chunked): la mémoire utilisée par la requête
+ne dépend plus du nombre de résultats.
+"""
+
+from flask import current_app, stream_with_context
+from .response import success_response
+
+# Taille approximative des blocs envoyés au client (en caractères)
+CHUNK_SIZE = 64 * 1024
+
+
+def stream_response(documents, key, message="Success", extra=None, status=200):
+    """
+    Retourne {"success", "message", "data": {key: [...documents], **extra}}
+
+    Args:
+        documents: Curseur PyMongo (ou tout itérable de documents)
+        key: Nom de la liste dans "data"
+        extra: Champs supplémentaires de "data", déjà calculés
+
+    Si STREAM_RESPONSES est désactivé, la liste est chargée puis renvoyée
+    par success_response.
+    """
+    if not current_app.config.get('STREAM_RESPONSES', True):
+        data = {key: list(documents)}
+        data.update(extra or {})
+        return success_response(data, message, status)
+
+    dumps = current_app.json.dumps
+    iterator = iter(documents)
+
+    # Lire le premier lot dans la route: une erreur MongoDB donne encore une
+    # réponse 500 au lieu d'un flux tronqué
+    first = next(iterator, None)
+
+    def generate():
+        try:
+            buffer = [dumps({"success": True, "message": message})[:-1], ', "data": {', dumps(key), ': [']
+            size = 0
+            if first is not None:
+                buffer.append(dumps(first))
+                for doc in iterator:
+                    encoded = dumps(doc)
+                    buffer.append(',')
+                    buffer.append(encoded)
+                    size += len(encoded)
+                    if size >= CHUNK_SIZE:
+                        yield ''.join(buffer)
+                        buffer, size = [], 0
+            buffer.append(']')
+            for name, value in (extra or {}).items():
+                buffer.append(f', {dumps(name)}: {dumps(value)}')
+            buffer.append('}}\n')
+            yield ''.join(buffer)
+        finally:
+            close = getattr(documents, 'close', None)
+            if close:
+                close()
+
+    return current_app.response_class(
+        stream_with_context(generate()),
+        status=status,
+        mimetype=current_app.json.mimetype
+    )
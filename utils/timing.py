@@ -0,0 +1,30 @@
+"""
+Fenêtre glissante de durées (latences des files d'attente et des pools)
+"""
+
+import threading
+from collections import deque
+
+
+class LatencyWindow:
+    """Garde les `size` dernières durées (en secondes) et en donne un résumé"""
+
+    def __init__(self, size=1000):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def summary(self):
+        """Moyenne, p95 et max en millisecondes"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {"avg": 0, "p95": 0, "max": 0}
+        return {
+            "avg": round(sum(samples) / len(samples) * 1000, 2),
+            "p95": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 2),
+            "max": round(samples[-1] * 1000, 2)
+        }
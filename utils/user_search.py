@@ -0,0 +1,198 @@
+"""
+Recherche d'utilisateurs (GET /api/users?search=)
+
+Chaque utilisateur porte un tableau `search_tokens` indexé, calculé à
+l'écriture (inscription, mise à jour du profil):
+  - les mots du prénom et du nom, en minuscules et sans accents
+  - les mots de la partie locale de l'email ("jean.dupont" -> jean, dupont)
+  - l'email complet en minuscules
+
+Une recherche est découpée en termes normalisés de la même façon; chaque
+terme doit être le préfixe d'un token. Les regex ancrées (`^terme`) sur un
+champ déjà normalisé parcourent un intervalle de l'index au lieu de toute la
+collection. Les candidats (au plus USER_SEARCH_CANDIDATES, mots exacts
+d'abord) sont ensuite classés par pertinence: mot exact avant préfixe, nom
+avant email. Le total est compté sur toute la collection.
+
+Usage en ligne de commande (calcul des tokens des utilisateurs existants):
+    python -m utils.user_search
+"""
+
+import re
+import unicodedata
+
+from pymongo import UpdateOne
+from config import Config
+
+# Champs jamais renvoyés par l'API
+PRIVATE_USER_FIELDS = {"password": 0, "search_tokens": 0}
+
+# Poids d'un terme selon le champ qui le contient
+NAME_WEIGHT = 2
+EMAIL_WEIGHT = 1
+
+_SEPARATORS = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text):
+    """Minuscules, sans accents, ponctuation remplacée par des espaces"""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+    return _SEPARATORS.sub(" ", folded).strip()
+
+
+def name_words(user):
+    """Mots normalisés du prénom et du nom"""
+    return normalize(f"{user.get('first_name', '')} {user.get('last_name', '')}").split()
+
+
+def email_words(email):
+    """Mots normalisés de la partie locale de l'email"""
+    return normalize((email or "").split('@')[0]).split()
+
+
+def search_tokens(user):
+    """Tokens de recherche d'un utilisateur (à enregistrer dans `search_tokens`)"""
+    tokens = set(name_words(user)) | set(email_words(user.get('email')))
+    if user.get('email'):
+        tokens.add(user['email'].strip().lower())
+    return sorted(tokens)
+
+
+def parse_search(search):
+    """
+    Termes d'une recherche
+
+    Une recherche contenant "@" est traitée comme un préfixe d'email complet.
+    """
+    search = (search or "").strip()
+    if '@' in search:
+        return [search.lower()]
+    return normalize(search).split()
+
+
+def search_query(terms):
+    """Filtre MongoDB: chaque terme est le préfixe d'un token"""
+    # Le terme le plus long (le plus sélectif) en premier
+    clauses = [
+        {"search_tokens": {"$regex": "^" + re.escape(term)}}
+        for term in sorted(set(terms), key=len, reverse=True)
+    ]
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def relevance(user, terms):
+    """Score d'un utilisateur pour les termes recherchés"""
+    names = name_words(user)
+    emails = email_words(user.get('email'))
+    email = (user.get('email') or "").lower()
+
+    score = 0
+    for term in terms:
+        best = 0
+        for words, weight in ((names, NAME_WEIGHT), (emails, EMAIL_WEIGHT)):
+            for word in words:
+                if word == term:
+                    best = max(best, weight * 2)
+                elif word.startswith(term):
+                    best = max(best, weight)
+        if email.startswith(term):
+            best = max(best, EMAIL_WEIGHT * 2)
+        score += best
+
+    # Bonus quand la recherche est le début du nom complet ("jean du" -> Jean Dupont)
+    if " ".join(names).startswith(" ".join(terms)):
+        score += 1
+    return score
+
+
+def exact_query(terms):
+    """Filtre search_query restreint aux utilisateurs dont un token est égal à l'un des termes"""
+    return {"$and": [{"search_tokens": {"$in": sorted(set(terms))}}, search_query(terms)]}
+
+
+def search_users(db, search, pagination, limit=None):
+    """
+    Recherche classée par pertinence
+
+    Les candidats ayant un mot exact sont lus en premier (égalité sur l'index),
+    puis complétés par les correspondances de préfixe: un nom exact ("martin")
+    n'est pas écarté par la limite quand le préfixe est très courant.
+
+    Args:
+        search: Texte saisi
+        pagination: Résultat de parse_pagination_args (page et per_page; pas de curseur)
+        limit: Nombre maximum de candidats classés (défaut: USER_SEARCH_CANDIDATES)
+
+    Returns:
+        tuple: (utilisateurs de la page, bloc "pagination" de la réponse;
+                `capped` indique que seuls les `limit` premiers candidats sont paginés)
+    """
+    limit = limit or Config.USER_SEARCH_CANDIDATES
+    page, per_page = pagination['page'], pagination['per_page']
+
+    terms = parse_search(search)
+    candidates = []
+    total = 0
+    if terms:
+        query = search_query(terms)
+        candidates = list(db.users.find(exact_query(terms), PRIVATE_USER_FIELDS).limit(limit))
+        if len(candidates) < limit:
+            seen = [user['_id'] for user in candidates]
+            prefix = {"$and": [query, {"_id": {"$nin": seen}}]} if seen else query
+            candidates += list(db.users.find(prefix, PRIVATE_USER_FIELDS).limit(limit - len(candidates)))
+        total = len(candidates) if len(candidates) < limit else db.users.count_documents(query)
+
+    candidates.sort(key=lambda user: (
+        -relevance(user, terms),
+        normalize(user.get('last_name')),
+        normalize(user.get('first_name')),
+        user['_id']
+    ))
+
+    start = (page - 1) * per_page
+    users = candidates[start:start + per_page]
+    return users, {
+        "page": page,
+        "per_page": per_page,
+        "has_more": start + per_page < len(candidates),
+        "next_cursor": None,
+        "total": total,
+        "pages": (len(candidates) + per_page - 1) // per_page,
+        "capped": total > len(candidates)
+    }
+
+
+def backfill_search_tokens(db, batch_size=1000):
+    """Calcule `search_tokens` pour les utilisateurs qui n'en ont pas"""
+    updated = 0
+    batch = []
+    cursor = db.users.find(
+        {"search_tokens": {"$exists": False}},
+        {"first_name": 1, "last_name": 1, "email": 1}
+    )
+    for user in cursor:
+        batch.append(UpdateOne({"_id": user['_id']}, {"$set": {"search_tokens": search_tokens(user)}}))
+        if len(batch) >= batch_size:
+            updated += db.users.bulk_write(batch, ordered=False).modified_count
+            batch = []
+    if batch:
+        updated += db.users.bulk_write(batch, ordered=False).modified_count
+    return updated
+
+
+if __name__ == '__main__':
+    import argparse
+    from pymongo import MongoClient
+
+    parser = argparse.ArgumentParser(description="Calcule les tokens de recherche des utilisateurs existants")
+    parser.add_argument('--uri', default=Config.MONGO_URI, help="URI MongoDB (défaut: Config.MONGO_URI)")
+    args = parser.parse_args()
+
+    client = MongoClient(args.uri)
+    try:
+        print(f"✓ {backfill_search_tokens(client.get_default_database())} utilisateur(s) mis à jour")
+    finally:
+        client.close()
@@ -1,10 +1,18 @@
+"""
+Validation des données des requêtes (schémas marshmallow)
+
+Chaque module instancie ses schémas une seule fois, au chargement: les
+instances sont partagées entre requêtes et threads, validate() ne modifiant
+pas le schéma.
+"""
+
 from .user_validator import validate_user_registration, validate_user_login, validate_user_update
 from .event_validator import validate_event_create, validate_event_update
 from .group_validator import validate_group_create, validate_group_update
 from .discussion_validator import validate_message_create, validate_discussion_create
 from .album_validator import validate_album_create, validate_photo_create, validate_comment_create
 from .poll_validator import validate_poll_create, validate_poll_response
-from .ticket_validator import validate_ticket_type_create, validate_ticket_purchase
+from .ticket_validator import validate_ticket_type_create, validate_ticket_purchase, validate_ticket_bulk_purchase
 from .shopping_validator import validate_shopping_item_create, validate_shopping_item_update
 from .carpooling_validator import validate_carpooling_create, validate_carpooling_update, validate_carpooling_booking
 
@@ -25,6 +33,7 @@ __all__ = [
     'validate_poll_response',
     'validate_ticket_type_create',
     'validate_ticket_purchase',
+    'validate_ticket_bulk_purchase',
     'validate_shopping_item_create',
     'validate_shopping_item_update',
     'validate_carpooling_create',
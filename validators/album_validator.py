@@ -26,26 +26,27 @@ class CommentCreateSchema(Schema):
         "required": "Le contenu du commentaire est requis"
     })
 
+album_create_schema = AlbumCreateSchema()
+photo_create_schema = PhotoCreateSchema()
+comment_create_schema = CommentCreateSchema()
+
 def validate_album_create(data):
     """Valide les données de création d'album"""
-    schema = AlbumCreateSchema()
-    errors = schema.validate(data)
+    errors = album_create_schema.validate(data)
     if errors:
         return False, errors
     return True, None
 
 def validate_photo_create(data):
     """Valide les données d'ajout de photo"""
-    schema = PhotoCreateSchema()
-    errors = schema.validate(data)
+    errors = photo_create_schema.validate(data)
     if errors:
         return False, errors
     return True, None
 
 def validate_comment_create(data):
     """Valide les données de création de commentaire"""
-    schema = CommentCreateSchema()
-    errors = schema.validate(data)
+    errors = comment_create_schema.validate(data)
     if errors:
         return False, errors
     return True, None
\ No newline at end of file
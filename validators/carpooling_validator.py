@@ -1,10 +1,12 @@
 from marshmallow import Schema, fields, validate
+from .geo_validator import GeoPointSchema
 
 class CarpoolingCreateSchema(Schema):
     """Schéma de validation pour la création d'une offre de covoiturage"""
     departure_location = fields.Str(required=True, validate=validate.Length(min=1, max=300), error_messages={
         "required": "Le lieu de départ est requis"
     })
+    departure_point = fields.Nested(GeoPointSchema, required=False, allow_none=True)
     departure_time = fields.DateTime(required=True, error_messages={
         "required": "L'heure de départ est requise"
     })
@@ -34,26 +36,27 @@ class CarpoolingBookingSchema(Schema):
         "required": "Le nombre de places demandées est requis"
     })
 
+carpooling_create_schema = CarpoolingCreateSchema()
+carpooling_update_schema = CarpoolingUpdateSchema()
+carpooling_booking_schema = CarpoolingBookingSchema()
+
 def validate_carpooling_create(data):
     """Valide les données de création d'offre de covoiturage"""
-    schema = CarpoolingCreateSchema()
-    errors = schema.validate(data)
+    errors = carpooling_create_schema.validate(data)
     if errors:
         return False, errors
     return True, None
 
 def validate_carpooling_update(data):
     """Valide les données de mise à jour d'offre"""
-    schema = CarpoolingUpdateSchema()
-    errors = schema.validate(data)
+    errors = carpooling_update_schema.validate(data)
     if errors:
         return False, errors
     return True, None
 
 def validate_carpooling_booking(data):
     """Valide les données de réservation"""
-    schema = CarpoolingBookingSchema()
-    errors = schema.validate(data)
+    errors = carpooling_booking_schema.validate(data)
     if errors:
         return False, errors
     return True, None
\ No newline at end of file
@@ -24,18 +24,19 @@ class DiscussionCreateSchema(Schema):
         if event_id and group_id:
             raise ValidationError("Une discussion ne peut pas être liée à la fois à un événement et un groupe")
 
+message_create_schema = MessageCreateSchema()
+discussion_create_schema = DiscussionCreateSchema()
+
 def validate_message_create(data):
     """Valide les données de création de message"""
-    schema = MessageCreateSchema()
-    errors = schema.validate(data)
+    errors = message_create_schema.validate(data)
     if errors:
         return False, errors
     return True, None
 
 def validate_discussion_create(data):
     """Valide les données de création de discussion"""
-    schema = DiscussionCreateSchema()
-    errors = schema.validate(data)
+    errors = discussion_create_schema.validate(data)
     if errors:
         return False, errors
     return True, None
\ No newline at end of file
@@ -1,5 +1,6 @@
 from marshmallow import Schema, fields, validate, validates_schema, ValidationError
 from datetime import datetime
+from .geo_validator import GeoPointSchema
 
 class EventCreateSchema(Schema):
     """Schéma de validation pour la création d'un événement"""
@@ -18,6 +19,7 @@ class EventCreateSchema(Schema):
     location = fields.Str(required=True, validate=validate.Length(min=1, max=300), error_messages={
         "required": "Le lieu est requis"
     })
+    location_point = fields.Nested(GeoPointSchema, required=False, allow_none=True)
     cover_photo = fields.Str(required=False)
     is_private = fields.Bool(required=False, missing=False)
     organizers = fields.List(fields.Str(), required=False)
@@ -41,6 +43,7 @@ class EventUpdateSchema(Schema):
     start_date = fields.DateTime(required=False)
     end_date = fields.DateTime(required=False)
     location = fields.Str(required=False, validate=validate.Length(min=1, max=300))
+    location_point = fields.Nested(GeoPointSchema, required=False, allow_none=True)
     cover_photo = fields.Str(required=False)
     is_private = fields.Bool(required=False)
     has_shopping_list = fields.Bool(required=False)
@@ -53,18 +56,19 @@ class EventUpdateSchema(Schema):
             if data['end_date'] <= data['start_date']:
                 raise ValidationError("La date de fin doit être après la date de début")
 
+event_create_schema = EventCreateSchema()
+event_update_schema = EventUpdateSchema()
+
 def validate_event_create(data):
     """Valide les données de création d'événement"""
-    schema = EventCreateSchema()
-    errors = schema.validate(data)
+    errors = event_create_schema.validate(data)
     if errors:
         return False, errors
     return True, None
 
 def validate_event_update(data):
     """Valide les données de mise à jour d'événement"""
-    schema = EventUpdateSchema()
-    errors = schema.validate(data)
+    errors = event_update_schema.validate(data)
     if errors:
         return False, errors
     return True, None
\ No newline at end of file
@@ -0,0 +1,19 @@
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError
+
+class GeoPointSchema(Schema):
+    """Schéma d'un point GeoJSON: {"type": "Point", "coordinates": [longitude, latitude]}"""
+    type = fields.Str(required=True, validate=validate.OneOf(["Point"]), error_messages={
+        "required": "Le type GeoJSON est requis (Point)"
+    })
+    coordinates = fields.List(fields.Float(), required=True, validate=validate.Length(equal=2), error_messages={
+        "required": "Les coordonnées [longitude, latitude] sont requises"
+    })
+
+    @validates_schema
+    def validate_coordinates(self, data, **kwargs):
+        """Vérifie que la longitude et la latitude sont dans leurs bornes"""
+        coordinates = data.get('coordinates')
+        if coordinates and len(coordinates) == 2:
+            longitude, latitude = coordinates
+            if not -180 <= longitude <= 180 or not -90 <= latitude <= 90:
+                raise ValidationError("Coordonnées hors bornes (longitude -180..180, latitude -90..90)", "coordinates")
@@ -32,18 +32,19 @@ class GroupUpdateSchema(Schema):
     allow_members_to_post = fields.Bool(required=False)
     allow_members_to_create_events = fields.Bool(required=False)
 
+group_create_schema = GroupCreateSchema()
+group_update_schema = GroupUpdateSchema()
+
 def validate_group_create(data):
     """Valide les données de création de groupe"""
-    schema = GroupCreateSchema()
-    errors = schema.validate(data)
+    errors = group_create_schema.validate(data)
     if errors:
         return False, errors
     return True, None
 
 def validate_group_update(data):
     """Valide les données de mise à jour de groupe"""
-    schema = GroupUpdateSchema()
-    errors = schema.validate(data)
+    errors = group_update_schema.validate(data)
     if errors:
         return False, errors
     return True, None
\ No newline at end of file
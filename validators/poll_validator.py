@@ -48,18 +48,19 @@ class PollResponseSchema(Schema):
     )
     # Format: [{"question_index": 0, "option_index": 1}, ...]
 
+poll_create_schema = PollCreateSchema()
+poll_response_schema = PollResponseSchema()
+
 def validate_poll_create(data):
     """Valide les données de création de sondage"""
-    schema = PollCreateSchema()
-    errors = schema.validate(data)
+    errors = poll_create_schema.validate(data)
     if errors:
         return False, errors
     return True, None
 
 def validate_poll_response(data):
     """Valide les données de réponse à un sondage"""
-    schema = PollResponseSchema()
-    errors = schema.validate(data)
+    errors = poll_response_schema.validate(data)
     if errors:
         return False, errors
     return True, None
\ No newline at end of file
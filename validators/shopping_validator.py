@@ -22,18 +22,19 @@ class ShoppingItemUpdateSchema(Schema):
     arrival_time = fields.DateTime(required=False)
     notes = fields.Str(required=False, validate=validate.Length(max=500))
 
+shopping_item_create_schema = ShoppingItemCreateSchema()
+shopping_item_update_schema = ShoppingItemUpdateSchema()
+
 def validate_shopping_item_create(data):
     """Valide les données de création d'item shopping"""
-    schema = ShoppingItemCreateSchema()
-    errors = schema.validate(data)
+    errors = shopping_item_create_schema.validate(data)
     if errors:
         return False, errors
     return True, None
 
 def validate_shopping_item_update(data):
     """Valide les données de mise à jour d'item shopping"""
-    schema = ShoppingItemUpdateSchema()
-    errors = schema.validate(data)
+    errors = shopping_item_update_schema.validate(data)
     if errors:
         return False, errors
     return True, None
\ No newline at end of file
@@ -1,4 +1,5 @@
 from marshmallow import Schema, fields, validate, validates_schema, ValidationError
+from config import Config
 
 class TicketTypeCreateSchema(Schema):
     """Schéma de validation pour la création d'un type de billet"""
@@ -32,6 +33,12 @@ class TicketPurchaseSchema(Schema):
         "required": "L'adresse de l'acheteur est requise"
     })
 
+class TicketBulkPurchaseSchema(TicketPurchaseSchema):
+    """Schéma de validation pour l'achat de plusieurs billets par un même acheteur"""
+    quantity = fields.Int(required=True, validate=validate.Range(min=1, max=Config.MAX_TICKETS_PER_PURCHASE), error_messages={
+        "required": "La quantité est requise"
+    })
+
 class BuyerAddressSchema(Schema):
     """Schéma pour l'adresse complète de l'acheteur"""
     street = fields.Str(required=True, validate=validate.Length(min=1, max=200), error_messages={
@@ -47,18 +54,27 @@ class BuyerAddressSchema(Schema):
         "required": "Le pays est requis"
     })
 
+ticket_type_create_schema = TicketTypeCreateSchema()
+ticket_purchase_schema = TicketPurchaseSchema()
+ticket_bulk_purchase_schema = TicketBulkPurchaseSchema()
+
 def validate_ticket_type_create(data):
     """Valide les données de création de type de billet"""
-    schema = TicketTypeCreateSchema()
-    errors = schema.validate(data)
+    errors = ticket_type_create_schema.validate(data)
     if errors:
         return False, errors
     return True, None
 
 def validate_ticket_purchase(data):
     """Valide les données d'achat de billet"""
-    schema = TicketPurchaseSchema()
-    errors = schema.validate(data)
+    errors = ticket_purchase_schema.validate(data)
+    if errors:
+        return False, errors
+    return True, None
+
+def validate_ticket_bulk_purchase(data):
+    """Valide les données d'achat de plusieurs billets"""
+    errors = ticket_bulk_purchase_schema.validate(data)
     if errors:
         return False, errors
     return True, None
\ No newline at end of file
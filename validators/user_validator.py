@@ -50,26 +50,27 @@ class UserUpdateSchema(Schema):
     bio = fields.Str(required=False, validate=validate.Length(max=500))
     profile_picture = fields.Str(required=False)
 
+user_registration_schema = UserRegistrationSchema()
+user_login_schema = UserLoginSchema()
+user_update_schema = UserUpdateSchema()
+
 def validate_user_registration(data):
     """Valide les données d'inscription"""
-    schema = UserRegistrationSchema()
-    errors = schema.validate(data)
+    errors = user_registration_schema.validate(data)
     if errors:
         return False, errors
     return True, None
 
 def validate_user_login(data):
     """Valide les données de connexion"""
-    schema = UserLoginSchema()
-    errors = schema.validate(data)
+    errors = user_login_schema.validate(data)
     if errors:
         return False, errors
     return True, None
 
 def validate_user_update(data):
     """Valide les données de mise à jour"""
-    schema = UserUpdateSchema()
-    errors = schema.validate(data)
+    errors = user_update_schema.validate(data)
     if errors:
         return False, errors
     return True, None
\ No newline at end of file